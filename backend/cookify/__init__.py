@@ -0,0 +1,20 @@
+"""
+Shared runtime for the Cookify Lambda handlers.
+
+Deployed as the `cookify-shared` Lambda layer by upload_lambdas.py (it lands
+in /opt/python/cookify), so every handler can `import cookify` without
+bundling it.
+"""
+from .aws import client, resource, table
+from .api import (
+    cors_response, json_response, get_claims, parse_body, is_preflight,
+    encode_key, decode_key, get_header, make_etag, etag_matches,
+)
+from .encoding import dumps, compress
+
+__all__ = [
+    "client", "resource", "table",
+    "cors_response", "json_response", "get_claims", "parse_body", "is_preflight",
+    "encode_key", "decode_key", "get_header", "make_etag", "etag_matches",
+    "dumps", "compress",
+]
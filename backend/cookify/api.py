@@ -0,0 +1,103 @@
+"""
+API Gateway request/response helpers shared by the handlers.
+
+Pass the request `event` to a response helper to have the body compressed
+when the client's Accept-Encoding allows it (see encoding.compress). Give a
+200 response a `cache_control` as well and it carries that Cache-Control plus
+an ETag, and a matching If-None-Match is answered with an empty 304.
+"""
+import json
+import base64
+import hashlib
+from .encoding import dumps, compress
+
+def get_header(event, name):
+    """Request header value, case-insensitive; None when absent."""
+    name = name.lower()
+    for k, v in ((event or {}).get("headers") or {}).items():
+        if k.lower() == name:
+            return v
+    return None
+
+def make_etag(*parts):
+    """Weak ETag over the JSON of `parts` (weak: it survives re-compression)."""
+    digest = hashlib.sha1(dumps(parts).encode()).hexdigest()[:24]
+    return f'W/"{digest}"'
+
+def etag_matches(event, etag):
+    """True when the request's If-None-Match names `etag` (or is *)."""
+    header = get_header(event, "If-None-Match")
+    if not header:
+        return False
+    tags = {t.strip() for t in header.split(",")}
+    return "*" in tags or etag in tags or etag[2:] in tags
+
+def _finish(response, event, cache_control, etag):
+    """Attach caching headers, short-circuit to 304 if unchanged, then compress."""
+    if cache_control and response["statusCode"] == 200:
+        etag = etag or make_etag(response["body"])
+        response["headers"]["Cache-Control"] = cache_control
+        response["headers"]["ETag"] = etag
+        if etag_matches(event, etag):
+            response["statusCode"] = 304
+            response["body"] = ""
+            return response
+    return compress(response, event) if event else response
+
+def cors_response(status, body, methods="GET,OPTIONS", headers=None, event=None,
+                  cache_control=None, etag=None):
+    """JSON response with the CORS headers every browser-facing route sends."""
+    response = {
+        "statusCode": status,
+        "headers": {
+            "Access-Control-Allow-Origin": "*",
+            "Access-Control-Allow-Methods": methods,
+            "Access-Control-Allow-Headers": "Content-Type,Authorization",
+            **(headers or {}),
+        },
+        "body": dumps(body),
+    }
+    return _finish(response, event, cache_control, etag)
+
+def json_response(status, body, headers=None, event=None, cache_control=None, etag=None):
+    """Plain JSON response (no CORS headers)."""
+    response = {
+        "statusCode": status,
+        "headers": {"Content-Type": "application/json", **(headers or {})},
+        "body": dumps(body),
+    }
+    return _finish(response, event, cache_control, etag)
+
+def is_preflight(event):
+    """True for a CORS pre-flight on either the v1 or v2 payload format."""
+    method = event.get("httpMethod") or (
+        event.get("requestContext", {}).get("http", {}).get("method")
+    )
+    return method == "OPTIONS"
+
+def get_claims(event):
+    """Cognito claims from a REST (claims) or HTTP API (jwt.claims) authorizer."""
+    auth = event.get("requestContext", {}).get("authorizer") or {}
+    return auth.get("claims") or auth.get("jwt", {}).get("claims") or {}
+
+def parse_body(event):
+    """Decoded JSON body; {} when empty. Raises ValueError on invalid JSON."""
+    raw = event.get("body") or ""
+    if event.get("isBase64Encoded") and raw:
+        raw = base64.b64decode(raw).decode()
+    return json.loads(raw or "{}")
+
+def encode_key(key):
+    """Base64-encode a LastEvaluatedKey so it's safe in a URL."""
+    if key is None:
+        return None
+    return base64.urlsafe_b64encode(dumps(key).encode()).decode()
+
+def decode_key(token):
+    """Decode a key sent back by the client; returns None if empty/invalid."""
+    if not token:
+        return None
+    try:
+        return json.loads(base64.urlsafe_b64decode(token.encode()).decode())
+    except Exception:
+        return None
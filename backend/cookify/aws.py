@@ -0,0 +1,110 @@
+"""
+Per-container AWS clients.
+
+Nothing is created at import time: a client (or DynamoDB resource) is built
+the first time a handler asks for it and then reused for every warm
+invocation of that container. All of them share one botocore Config with
+keep-alive, short connect timeouts and standard-mode retries.
+
+Point them at a local stand-in (e.g. DynamoDB Local) with the standard
+AWS_ENDPOINT_URL / AWS_ENDPOINT_URL_DYNAMODB environment variables.
+
+batch_get() is the one batch_get_item loop: every caller gets the same
+UnprocessedKeys retries and the same failure (RuntimeError, never a short
+result).
+"""
+import os
+import time
+import random
+import threading
+
+CONNECT_TIMEOUT = float(os.environ.get("AWS_CONNECT_TIMEOUT", "2"))
+READ_TIMEOUT    = float(os.environ.get("AWS_READ_TIMEOUT", "5"))
+MAX_ATTEMPTS    = int(os.environ.get("AWS_MAX_ATTEMPTS", "3"))
+MAX_POOL        = int(os.environ.get("AWS_MAX_POOL_CONNECTIONS", "16"))  # thread-pool fan-out
+BATCH_GET_SIZE     = 100    # batch_get_item key limit
+BATCH_GET_ATTEMPTS = 6      # per chunk, including UnprocessedKeys retries
+BATCH_GET_BACKOFF  = 0.05
+
+_session   = None
+_clients   = {}
+_resources = {}
+_tables    = {}
+_lock      = threading.Lock()
+
+def session():
+    """The boto3 Session every cached client is built from."""
+    global _session
+    if _session is None:
+        import boto3
+        _session = boto3.session.Session()
+    return _session
+
+def reset():
+    """Drop every cached client (benchmarks and local runs against a fresh stand-in)."""
+    global _session
+    with _lock:
+        _session = None
+        _clients.clear()
+        _resources.clear()
+        _tables.clear()
+
+def _config():
+    from botocore.config import Config
+    return Config(
+        connect_timeout=CONNECT_TIMEOUT,
+        read_timeout=READ_TIMEOUT,
+        retries={"max_attempts": MAX_ATTEMPTS, "mode": "standard"},
+        tcp_keepalive=True,
+        max_pool_connections=MAX_POOL,
+    )
+
+def client(service):
+    """Low-level boto3 client for `service`, created once per container."""
+    c = _clients.get(service)
+    if c is None:
+        with _lock:
+            c = _clients.get(service)
+            if c is None:
+                c = _clients[service] = session().client(service, config=_config())
+    return c
+
+def resource(service):
+    """boto3 resource for `service`, created once per container."""
+    r = _resources.get(service)
+    if r is None:
+        with _lock:
+            r = _resources.get(service)
+            if r is None:
+                r = _resources[service] = session().resource(service, config=_config())
+    return r
+
+def table(name):
+    """DynamoDB Table object, cached by name."""
+    t = _tables.get(name)
+    if t is None:
+        t = _tables[name] = resource("dynamodb").Table(name)
+    return t
+
+def batch_get(table_name, keys, **table_request):
+    """
+    Low-level items for `keys` (attribute-value dicts) from one table, one
+    batch_get_item per BATCH_GET_SIZE keys; `table_request` adds e.g.
+    ProjectionExpression. UnprocessedKeys are retried with full-jitter
+    backoff; RuntimeError if some are left after BATCH_GET_ATTEMPTS.
+    """
+    keys, found = list(keys), []
+    for i in range(0, len(keys), BATCH_GET_SIZE):
+        request = {table_name: {"Keys": keys[i:i + BATCH_GET_SIZE], **table_request}}
+        for attempt in range(BATCH_GET_ATTEMPTS):
+            resp = client("dynamodb").batch_get_item(RequestItems=request)
+            found.extend(resp["Responses"].get(table_name, []))
+            request = resp.get("UnprocessedKeys") or {}
+            if not request:
+                break
+            time.sleep(random.uniform(0, BATCH_GET_BACKOFF * 2 ** attempt))
+        if request:
+            left = len(request[table_name]["Keys"])
+            raise RuntimeError(f"{left} {table_name} keys still unprocessed "
+                               f"after {BATCH_GET_ATTEMPTS} attempts")
+    return found
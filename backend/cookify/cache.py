@@ -0,0 +1,123 @@
+"""
+Warm-container read-through cache for Recipes.
+
+Entries live at module scope, so they survive across the warm invocations of
+one container (never across containers). The cache is a bounded LRU with a
+TTL per entry. A missing recipe can be cached briefly as NOT_FOUND. Once an
+entry's TTL is up it is revalidated with a projected get_item of UpdatedAt
+instead of a full read; if the version still matches, the entry is kept.
+
+Views: "full" holds whole items (get_recipe), "card" holds the CARD_FIELDS
+projection (get_favorites?fields=card). They are cached separately so a
+projected item is never served as a full one.
+
+TTLCache itself knows nothing about recipes; the other per-container caches
+(chatbot replies, the trending board) use it as well.
+"""
+import os
+import time
+import threading
+from collections import OrderedDict
+from . import aws
+
+RECIPES_TABLE = os.environ.get("RECIPES_TABLE", "Recipes")
+CACHE_SIZE    = int(os.environ.get("RECIPE_CACHE_SIZE", "512"))
+CACHE_TTL     = float(os.environ.get("RECIPE_CACHE_TTL", "60"))
+NEGATIVE_TTL  = float(os.environ.get("RECIPE_CACHE_NEGATIVE_TTL", "10"))   # 0 disables
+VERSION_ATTR  = "UpdatedAt"
+
+NOT_FOUND = object()    # negative-cache marker
+
+class TTLCache:
+    """Thread-safe LRU of at most `maxsize` entries, each expiring after its TTL."""
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl     = ttl
+        self.hits = self.misses = 0
+        self._data = OrderedDict()         # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Fresh value for `key`, or `default`. Expired entries stay for peek()."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def peek(self, key, default=None):
+        """Value for `key` even if expired (for revalidation); does not count."""
+        with self._lock:
+            entry = self._data.get(key)
+            return default if entry is None else entry[1]
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+recipes = TTLCache(CACHE_SIZE, CACHE_TTL)
+
+def _current_version(recipe_id):
+    """UpdatedAt of the stored recipe (NOT_FOUND if it is gone); one small read."""
+    item = aws.table(RECIPES_TABLE).get_item(
+        Key={"Id": recipe_id},
+        ProjectionExpression="#v",
+        ExpressionAttributeNames={"#v": VERSION_ATTR},
+    ).get("Item")
+    return NOT_FOUND if item is None else item.get(VERSION_ATTR)
+
+def get_recipe(recipe_id):
+    """The full recipe, or None; served from the cache whenever it can be."""
+    key   = ("full", str(recipe_id))
+    value = recipes.get(key)
+    if value is NOT_FOUND:
+        return None
+    if value is not None:
+        return value
+
+    stale = recipes.peek(key)
+    if isinstance(stale, dict) and stale.get(VERSION_ATTR):
+        version = _current_version(str(recipe_id))
+        if version == stale[VERSION_ATTR]:
+            recipes.set(key, stale)
+            return stale
+
+    item = aws.table(RECIPES_TABLE).get_item(Key={"Id": str(recipe_id)}).get("Item")
+    remember(str(recipe_id), item)
+    return item
+
+def remember(recipe_id, item, view="full"):
+    """Cache a read result; None records a miss when negative caching is on."""
+    if item is not None:
+        recipes.set((view, str(recipe_id)), item)
+    elif NEGATIVE_TTL > 0:
+        recipes.set((view, str(recipe_id)), NOT_FOUND, ttl=NEGATIVE_TTL)
+
+def cached_recipes(recipe_ids, view="full"):
+    """({id: item} already cached and fresh, [ids still to read]); negatives are dropped."""
+    found, missing = {}, []
+    for rid in recipe_ids:
+        value = recipes.get((view, rid))
+        if value is None:
+            missing.append(rid)
+        elif value is not NOT_FOUND:
+            found[rid] = value
+    return found, missing
@@ -0,0 +1,87 @@
+"""
+Response encoding shared by the handlers.
+
+dumps() serializes DynamoDB items as they come back from boto3: Decimal
+becomes int (or float when it has a fraction) and sets become lists. It uses
+orjson when the layer ships it and the stdlib encoder otherwise.
+
+compress() negotiates Accept-Encoding for a finished response. Bodies of at
+least COMPRESS_MIN_BYTES are compressed with br (when brotli is importable)
+or gzip and base64-encoded, the way API Gateway expects binary bodies.
+"""
+import os
+import json
+import gzip
+import base64
+from decimal import Decimal
+
+try:
+    import orjson
+except ImportError:                      # optional; stdlib json is the fallback
+    orjson = None
+
+try:
+    import brotli
+except ImportError:                      # optional; gzip only without it
+    brotli = None
+
+COMPRESS_MIN_BYTES = int(os.environ.get("RESPONSE_COMPRESS_MIN_BYTES", "1024"))
+GZIP_LEVEL         = 5                   # most of level 9's ratio at a fraction of the CPU
+BROTLI_QUALITY     = 4
+
+def _default(obj):
+    if isinstance(obj, Decimal):
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj) if all(isinstance(v, str) for v in obj) else list(obj)
+    if isinstance(obj, (bytes, bytearray)):    # DynamoDB binary attributes
+        return base64.b64encode(obj).decode()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+if orjson is not None:
+    def dumps(obj):
+        """Compact JSON text for `obj`, Decimal/set aware."""
+        return orjson.dumps(obj, default=_default).decode()
+else:
+    _encoder = json.JSONEncoder(default=_default, separators=(",", ":"), ensure_ascii=False)
+
+    def dumps(obj):
+        """Compact JSON text for `obj`, Decimal/set aware."""
+        return _encoder.encode(obj)
+
+def accepted_encodings(event):
+    """Codings the client accepts (lower-cased, q=0 dropped), from either payload format."""
+    headers = (event or {}).get("headers") or {}
+    raw = next((v for k, v in headers.items() if k.lower() == "accept-encoding"), "") or ""
+    accepted = set()
+    for part in raw.split(","):
+        coding, _, params = part.strip().partition(";")
+        if params.replace(" ", "").lower() in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        if coding:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+def compress(response, event):
+    """Compress `response` in place when it is large enough and the client allows it."""
+    body = response.get("body")
+    if not isinstance(body, str) or response.get("isBase64Encoded"):
+        return response
+    raw = body.encode()
+    if len(raw) < COMPRESS_MIN_BYTES:
+        return response
+
+    accepted = accepted_encodings(event)
+    if brotli is not None and ("br" in accepted or "*" in accepted):
+        coding, data = "br", brotli.compress(raw, quality=BROTLI_QUALITY)
+    elif "gzip" in accepted or "*" in accepted:
+        coding, data = "gzip", gzip.compress(raw, compresslevel=GZIP_LEVEL, mtime=0)
+    else:
+        return response
+
+    headers = response.setdefault("headers", {})
+    headers["Content-Encoding"] = coding
+    headers["Vary"] = "Accept-Encoding"
+    response["body"] = base64.b64encode(data).decode()
+    response["isBase64Encoded"] = True
+    return response
@@ -0,0 +1,52 @@
+"""
+Streaming exports to S3 for the handlers that can outgrow a Lambda response
+(get_recipes, get_users): pages are written as NDJSON into a multipart
+upload as they are read, so memory stays at about one part.
+"""
+import threading
+from . import aws
+from .encoding import dumps
+
+PART_SIZE = 8 * 1024 * 1024   # S3 multipart part (min 5 MB)
+
+class S3Sink:
+    """Streams NDJSON to an S3 object with a multipart upload, one part per PART_SIZE."""
+    def __init__(self, bucket, key):
+        self.bucket, self.key = bucket, key
+        self.count  = 0
+        self._buf   = bytearray()
+        self._parts = []
+        self._lock  = threading.Lock()
+        self._upload_id = aws.client('s3').create_multipart_upload(
+            Bucket=bucket, Key=key, ContentType='application/x-ndjson'
+        )['UploadId']
+
+    def write_page(self, items):
+        chunk = ''.join(dumps(item) + '\n' for item in items).encode()
+        with self._lock:
+            self._buf.extend(chunk)
+            self.count += len(items)
+            if len(self._buf) >= PART_SIZE:
+                self._flush()
+
+    def _flush(self):
+        number = len(self._parts) + 1
+        resp = aws.client('s3').upload_part(
+            Bucket=self.bucket, Key=self.key, UploadId=self._upload_id,
+            PartNumber=number, Body=bytes(self._buf)
+        )
+        self._parts.append({'PartNumber': number, 'ETag': resp['ETag']})
+        self._buf.clear()
+
+    def close(self):
+        if self._buf or not self._parts:
+            self._flush()                 # last part may be smaller than 5 MB
+        aws.client('s3').complete_multipart_upload(
+            Bucket=self.bucket, Key=self.key, UploadId=self._upload_id,
+            MultipartUpload={'Parts': self._parts}
+        )
+
+    def abort(self):
+        aws.client('s3').abort_multipart_upload(
+            Bucket=self.bucket, Key=self.key, UploadId=self._upload_id
+        )
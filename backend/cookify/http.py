@@ -0,0 +1,274 @@
+"""
+Outbound HTTPS for third-party APIs (Gemini).
+
+An HttpClient keeps idle keep-alive connections to one host for the life of
+the container, so warm invocations skip the TCP/TLS handshake. Every call runs
+against a Deadline (usually derived from the Lambda context) that bounds the
+whole call, body included: each socket read gets only the time that is left.
+Calls retry 429/5xx and connection errors with jittered backoff while time
+remains, and go through a CircuitBreaker that fails fast once the upstream
+keeps failing; a call counts as a success only once its body has been read.
+"""
+import json
+import time
+import random
+import socket
+import threading
+import http.client
+from contextlib import contextmanager
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+READ_CHUNK     = 64 * 1024
+
+class HttpError(Exception):
+    """Base class for outbound call failures."""
+
+class UpstreamError(HttpError):
+    def __init__(self, status, body=b""):
+        super().__init__(f"upstream returned {status}")
+        self.status, self.body = status, body
+
+class DeadlineExceeded(HttpError):
+    pass
+
+class CircuitOpen(HttpError):
+    pass
+
+# ---------- deadline ---------------------------------------------------------
+class Deadline:
+    """Absolute point in (monotonic) time by which a call has to be finished."""
+    def __init__(self, seconds):
+        self._at = time.monotonic() + seconds
+
+    @classmethod
+    def from_context(cls, context, reserve_ms=500, default_seconds=20):
+        """Remaining invocation time minus a reserve for building the response."""
+        if context is None:
+            return cls(default_seconds)
+        return cls((context.get_remaining_time_in_millis() - reserve_ms) / 1000)
+
+    def remaining(self):
+        return self._at - time.monotonic()
+
+    def check(self):
+        left = self.remaining()
+        if left <= 0:
+            raise DeadlineExceeded("no time left for the upstream call")
+        return left
+
+# ---------- circuit breaker --------------------------------------------------
+class CircuitBreaker:
+    """
+    Closed until `failure_threshold` consecutive failures, then open for
+    `reset_after` seconds; after that one trial call is let through
+    (half-open) and its outcome closes or re-opens the circuit.
+    """
+    def __init__(self, failure_threshold=5, reset_after=30):
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self.failures  = 0
+        self.opened_at = None
+        self._trial    = False
+        self._lock     = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_after:
+            return "half-open"
+        return "open"
+
+    def allow(self):
+        with self._lock:
+            state = self.state
+            if state == "open" or (state == "half-open" and self._trial):
+                raise CircuitOpen("upstream circuit is open")
+            if state == "half-open":
+                self._trial = True
+
+    def record_success(self):
+        with self._lock:
+            self.failures, self.opened_at, self._trial = 0, None, False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._trial = False
+
+# ---------- client -------------------------------------------------------------
+class HttpClient:
+    def __init__(self, host, max_attempts=3, base_backoff=0.2, max_idle=4,
+                 breaker=None):
+        self.host = host
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.max_idle = max_idle
+        self.breaker  = breaker or CircuitBreaker()
+        self._idle = []
+        self._lock = threading.Lock()
+
+    # connections -------------------------------------------------------------
+    def _acquire(self, timeout):
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            conn = http.client.HTTPSConnection(self.host, timeout=timeout)
+        else:
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+        return conn
+
+    def _release(self, conn, response):
+        # only a connection whose response was read to the end can be reused
+        if conn.sock is None or response.will_close or not response.isclosed():
+            conn.close()
+            return
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    @staticmethod
+    def _arm(conn, deadline):
+        """Bound the next socket read by what is left of the whole call."""
+        left = deadline.check()
+        if conn.sock is not None:
+            conn.sock.settimeout(left)
+
+    # one attempt -------------------------------------------------------------
+    def _send(self, method, path, body, headers, deadline):
+        conn = self._acquire(deadline.check())
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+        except Exception:
+            conn.close()
+            raise
+        return conn, response
+
+    def _read_body(self, conn, response, deadline):
+        """The whole body, checking the deadline between reads."""
+        chunks = []
+        try:
+            while True:
+                self._arm(conn, deadline)
+                chunk = response.read1(READ_CHUNK)
+                if not chunk:
+                    return b"".join(chunks)
+                chunks.append(chunk)
+        except Exception:
+            conn.close()
+            raise
+
+    def _backoff(self, attempt, deadline, retry_after=None):
+        delay = random.uniform(0, self.base_backoff * (2 ** attempt))
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, int(retry_after))
+        if delay >= deadline.remaining():
+            return False
+        time.sleep(delay)
+        return True
+
+    def _attempts(self, method, path, body, headers, deadline, read_body):
+        """
+        Send with retries; returns (conn, response, payload) for a
+        non-retryable status. With read_body the body is read here too, so a
+        failure while reading it is retried and mapped like a send failure.
+        """
+        for attempt in range(self.max_attempts):
+            last = attempt == self.max_attempts - 1
+            try:
+                conn, response = self._send(method, path, body, headers, deadline)
+                payload = None
+                if read_body or response.status in RETRY_STATUSES:
+                    payload = self._read_body(conn, response, deadline)
+            except socket.timeout as e:
+                raise DeadlineExceeded(str(e)) from e
+            except (OSError, http.client.HTTPException):
+                # includes stale keep-alive sockets the server already closed
+                if last or not self._backoff(attempt, deadline):
+                    raise
+                continue
+
+            if response.status not in RETRY_STATUSES:
+                return conn, response, payload
+
+            self._release(conn, response)
+            if last or not self._backoff(attempt, deadline, response.getheader("Retry-After")):
+                raise UpstreamError(response.status, payload)
+
+    # public ----------------------------------------------------------------------
+    def request(self, method, path, deadline, body=None, headers=None):
+        """Returns (status, body bytes); raises UpstreamError for 4xx/5xx."""
+        self.breaker.allow()
+        try:
+            conn, response, payload = self._attempts(method, path, body, headers or {},
+                                                     deadline, read_body=True)
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()      # the upstream answered in full
+        self._release(conn, response)
+        if response.status >= 400:
+            raise UpstreamError(response.status, payload)
+        return response.status, payload
+
+    def post_json(self, path, payload, deadline):
+        _, body = self.request("POST", path, deadline, body=json.dumps(payload).encode("utf-8"),
+                               headers={"Content-Type": "application/json"})
+        return json.loads(body)
+
+    @contextmanager
+    def stream(self, method, path, deadline, body=None, headers=None):
+        """
+        Yields an iterator over response lines; retries only before the first
+        byte. The breaker hears the outcome once the lines run out or a read
+        fails (a read timeout raises DeadlineExceeded); a caller that stops
+        early counts as a success.
+        """
+        self.breaker.allow()
+        try:
+            conn, response, _ = self._attempts(method, path, body, headers or {},
+                                               deadline, read_body=False)
+            payload = self._read_body(conn, response, deadline) if response.status >= 400 else None
+        except socket.timeout as e:
+            self.breaker.record_failure()
+            raise DeadlineExceeded(str(e)) from e
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        if payload is not None:
+            self.breaker.record_success()
+            self._release(conn, response)
+            raise UpstreamError(response.status, payload)
+
+        outcome = {"recorded": False}
+        try:
+            yield self._lines(conn, response, deadline, outcome)
+        finally:
+            if not outcome["recorded"]:
+                self.breaker.record_success()
+            self._release(conn, response)
+
+    def _lines(self, conn, response, deadline, outcome):
+        try:
+            while True:
+                self._arm(conn, deadline)
+                line = response.readline()
+                if not line:
+                    break
+                yield line
+        except (OSError, http.client.HTTPException, DeadlineExceeded) as e:
+            outcome["recorded"] = True
+            self.breaker.record_failure()
+            conn.close()
+            if isinstance(e, socket.timeout):
+                raise DeadlineExceeded(str(e)) from e
+            raise
+        outcome["recorded"] = True
+        self.breaker.record_success()
@@ -0,0 +1,143 @@
+"""
+Recipe reads shared by the list handlers, plus the card view they serve.
+
+fetch_recipes() resolves a list of Ids through the warm-container cache
+first and batch-reads only the rest, fanning 100-key chunks out
+concurrently and retrying UnprocessedKeys with full-jitter backoff.
+"""
+import os
+import re
+import html
+from concurrent.futures import ThreadPoolExecutor
+from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.types import TypeDeserializer
+from . import aws, cache
+
+FAVORITES_TABLE  = os.environ.get("FAVORITES_TABLE", "Favorites")
+RECIPES_TABLE    = os.environ.get("RECIPES_TABLE", "Recipes")
+MY_RECIPES_INDEX = os.environ.get("MY_RECIPES_INDEX", "CreatedByUserId-CreatedAt-index")
+
+BATCH_SIZE       = aws.BATCH_GET_SIZE
+MAX_WORKERS      = 8      # concurrent batch_get_item calls
+
+# ?fields=card -> only what RecipeCard renders (no InstructionsText HTML)
+CARD_FIELDS = ("Id", "Title", "ImageUrl", "Snippet", "CategoryId", "Couisine",
+               "Vegan", "Vegetarian", "GlutenFree", "CreatedByUserId",
+               "ReadyInMinutes", "Servings")
+SNIPPET_LEN = 200   # plain-text summary the card shows instead of the HTML
+
+# Diet flags are stored as "1"/"0" by the UI and "true"/"True" by older imports.
+# Sparse copies (IsVegan = "1" only on vegan recipes) key one GSI per flag, so a
+# diet-only filter reads the matches instead of scanning the table.
+DIET_FLAGS   = ("Vegan", "Vegetarian", "GlutenFree")
+TRUE_VALUES  = ("1", "true", "True", "TRUE")
+DIET_INDEXES = {flag: f"Is{flag}-index" for flag in DIET_FLAGS}
+# what an import may spell them as; diet_flag() maps these to "1"/"0"
+INPUT_TRUE   = {"1", "true", "yes", "y", "t"}
+INPUT_FALSE  = {"0", "false", "no", "n", "f"}
+
+deserializer = TypeDeserializer()
+
+def diet_flag(value):
+    """Normalize a diet flag to the "1"/"0"/"NULL" the UI writes."""
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    text = str(value).strip().lower() if value is not None else ""
+    if text in INPUT_TRUE:
+        return "1"
+    if text in INPUT_FALSE:
+        return "0"
+    return "NULL"
+
+def make_snippet(text):
+    """Strip HTML and collapse whitespace; truncated like the card's stripHtml()."""
+    plain = html.unescape(re.sub(r"<[^>]+>", " ", text or ""))
+    plain = " ".join(plain.split())
+    return plain[:SNIPPET_LEN] + "…" if len(plain) > SNIPPET_LEN else plain
+
+def deserialize(av):
+    """Fast path for the attribute types Recipes actually uses."""
+    if "S" in av:
+        return av["S"]
+    if "BOOL" in av:
+        return av["BOOL"]
+    if "NULL" in av:
+        return None
+    return deserializer.deserialize(av)
+
+def fetch_chunk(keys, table_request):
+    """One batch_get_item chunk of recipes, deserialized (see aws.batch_get)."""
+    return [{k: deserialize(v) for k, v in item.items()}
+            for item in aws.batch_get(RECIPES_TABLE, keys, **table_request)]
+
+def _id_order(rid):
+    """Numeric Ids in numeric order (oldest recipe first), anything else after them."""
+    return (0, int(rid), "") if rid.isdigit() else (1, 0, rid)
+
+def favorite_ids(user_id):
+    """
+    The user's favorite RecipeIds, deduplicated and sorted by Id. RecipeIDs is
+    a string set, which keeps no order (boto3 hands back a Python set), so a
+    stable order has to be imposed here.
+    """
+    resp = aws.table(FAVORITES_TABLE).query(KeyConditionExpression=Key("UserID").eq(user_id))
+    recipe_ids = set()
+    for item in resp.get("Items", []):
+        ids = item.get("RecipeIDs")
+        if isinstance(ids, (list, set, tuple)):
+            recipe_ids.update(map(str, ids))
+        elif ids:
+            recipe_ids.add(str(ids))
+    return sorted(recipe_ids, key=_id_order)
+
+def fetch_recipes(recipe_ids, view="full"):
+    """Recipes for `recipe_ids` in that order ("card" view: CARD_FIELDS only); unknown Ids are skipped."""
+    # Recipes this container already holds cost no read at all
+    cached, missing = cache.cached_recipes(recipe_ids, view)
+
+    table_request = {}
+    if view == "card":
+        table_request["ProjectionExpression"]     = ", ".join(f"#{f}" for f in CARD_FIELDS)
+        table_request["ExpressionAttributeNames"] = {f"#{f}": f for f in CARD_FIELDS}
+
+    # Fan the 100-key chunks out concurrently; latency ~ slowest chunk
+    keys   = [{"Id": {"S": rid}} for rid in missing]
+    chunks = [keys[i:i + BATCH_SIZE] for i in range(0, len(keys), BATCH_SIZE)]
+    if not chunks:
+        results = []
+    elif len(chunks) == 1:
+        results = [fetch_chunk(chunks[0], table_request)]
+    else:
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(chunks))) as pool:
+            results = list(pool.map(lambda c: fetch_chunk(c, table_request), chunks))
+
+    fetched = {str(r.get("Id")): r for chunk in results for r in chunk}
+    for rid in missing:
+        cache.remember(rid, fetched.get(rid), view)   # None -> negative entry
+
+    found = {**cached, **fetched}
+    return [found[rid] for rid in recipe_ids if rid in found]
+
+def recipes_by_user(user_id, page_size=None, last_key=None, view="full"):
+    """(recipes the user created, newest first, LastEvaluatedKey); one page when page_size is set."""
+    query_kwargs = {
+        "IndexName": MY_RECIPES_INDEX,
+        "KeyConditionExpression": Key("CreatedByUserId").eq(user_id),
+        "ScanIndexForward": False,
+    }
+    if view == "card":
+        query_kwargs["ProjectionExpression"]     = ", ".join(f"#{f}" for f in CARD_FIELDS)
+        query_kwargs["ExpressionAttributeNames"] = {f"#{f}": f for f in CARD_FIELDS}
+    if page_size:
+        query_kwargs["Limit"] = page_size
+    if last_key:
+        query_kwargs["ExclusiveStartKey"] = last_key
+
+    table = aws.table(RECIPES_TABLE)
+    items = []
+    while True:
+        resp = table.query(**query_kwargs)
+        items.extend(resp.get("Items", []))
+        if page_size or "LastEvaluatedKey" not in resp:
+            return items, resp.get("LastEvaluatedKey")
+        query_kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
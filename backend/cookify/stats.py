@@ -0,0 +1,293 @@
+"""
+Per-recipe aggregates: one RecipeStats item per recipe holding
+
+    ReviewCount, FavoriteCount                    atomic counters
+    LatestReviewAt, LatestReviewUsername,
+    LatestReviewSnippet                           newest review, for cards
+
+Writers update them in the same transaction as the source row, guarded by a
+condition that holds across retries: a favorite that is already set, or a
+review guard item that already exists (one small item per recipe and user,
+keyed by reviewer_key(), in the same table), never moves a counter twice. Favorites writes also bump the user's
+Version (optimistic concurrency for batch updates). List endpoints join the
+stats in with fetch_stats(), one batch_get_item per 100 recipes.
+scripts/rebuild_recipe_stats.py recomputes everything from the source tables.
+"""
+import os
+import time
+import random
+from boto3.dynamodb.types import TypeSerializer
+from . import aws
+
+STATS_TABLE     = os.environ.get("RECIPE_STATS_TABLE", "RecipeStats")
+FAVORITES_TABLE = os.environ.get("FAVORITES_TABLE", "Favorites")
+REVIEWS_TABLE   = os.environ.get("REVIEWS_TABLE", "Reviews")
+SNIPPET_LEN     = 140
+MAX_ATTEMPTS    = 6
+MAX_TRANSACT    = 100    # transact_write_items item limit
+STATS_FIELDS    = ("RecipeId", "ReviewCount", "FavoriteCount", "LatestReviewAt",
+                   "LatestReviewUsername", "LatestReviewSnippet")
+# cancellations worth retrying: another writer held the same (hot) stats item
+RETRYABLE       = {"TransactionConflict", "ThrottlingError", "ProvisionedThroughputExceeded"}
+
+serializer = TypeSerializer()
+
+def review_snippet(text):
+    text = " ".join((text or "").split())
+    return text if len(text) <= SNIPPET_LEN else text[:SNIPPET_LEN].rstrip() + "…"
+
+def _condition_failed(err):
+    """True when a cancelled transaction failed only on a condition check."""
+    reasons = err.response.get("CancellationReasons", [])
+    return any(r.get("Code") == "ConditionalCheckFailed" for r in reasons)
+
+def _transact(items):
+    """
+    transact_write_items, retried with full-jitter backoff while it is only
+    cancelled by contention; a failed condition (or anything else) is raised.
+    """
+    client = aws.client("dynamodb")
+    for attempt in range(MAX_ATTEMPTS):
+        try:
+            return client.transact_write_items(TransactItems=items)
+        except client.exceptions.TransactionCanceledException as e:
+            codes = {r.get("Code") for r in e.response.get("CancellationReasons", [])}
+            if not codes & RETRYABLE or "ConditionalCheckFailed" in codes \
+                    or attempt == MAX_ATTEMPTS - 1:
+                raise
+        except client.exceptions.TransactionInProgressException:
+            if attempt == MAX_ATTEMPTS - 1:
+                raise
+        time.sleep(random.uniform(0, 0.05 * 2 ** attempt))
+
+def _counter_update(recipe_id, attribute, delta):
+    return {"Update": {
+        "TableName": STATS_TABLE,
+        "Key": {"RecipeId": {"S": str(recipe_id)}},
+        "UpdateExpression": "ADD #c :d SET UpdatedAt = :now",
+        "ExpressionAttributeNames": {"#c": attribute},
+        "ExpressionAttributeValues": {
+            ":d": {"N": str(delta)},
+            ":now": {"N": str(int(time.time()))},
+        },
+    }}
+
+# ---------- favorites --------------------------------------------------------
+def favorite_changed(user_id, recipe_id, added):
+    """
+    Add/remove one recipe in the user's favorites set and move FavoriteCount
+    in one transaction. Returns False (and changes nothing) when the set
+    already was in the requested state.
+    """
+    rid = str(recipe_id)
+    if added:
+        update = {
+            "UpdateExpression": "ADD RecipeIDs :r, Version :one",
+            "ConditionExpression": "attribute_not_exists(RecipeIDs) OR NOT contains(RecipeIDs, :id)",
+        }
+    else:
+        update = {
+            "UpdateExpression": "DELETE RecipeIDs :r ADD Version :one",
+            "ConditionExpression": "contains(RecipeIDs, :id)",
+        }
+    client = aws.client("dynamodb")
+    try:
+        _transact([
+            {"Update": {
+                "TableName": FAVORITES_TABLE,
+                "Key": {"UserID": {"S": user_id}},
+                "ExpressionAttributeValues": {
+                    ":r": {"SS": [rid]}, ":id": {"S": rid}, ":one": {"N": "1"},
+                },
+                **update,
+            }},
+            _counter_update(rid, "FavoriteCount", 1 if added else -1),
+        ])
+    except client.exceptions.TransactionCanceledException as e:
+        if _condition_failed(e):
+            return False
+        raise
+    return True
+
+class VersionConflict(Exception):
+    """The favorites item changed since the caller read it."""
+    def __init__(self, recipe_ids, version):
+        super().__init__(f"favorites are at version {version}")
+        self.recipe_ids, self.version = recipe_ids, version
+
+def read_favorites(user_id):
+    """(set of RecipeIDs, Version) for the user; (set(), 0) when there is none."""
+    item = aws.client("dynamodb").get_item(
+        TableName=FAVORITES_TABLE,
+        Key={"UserID": {"S": user_id}},
+        ProjectionExpression="RecipeIDs, Version",
+        ConsistentRead=True,
+    ).get("Item", {})
+    return set(item.get("RecipeIDs", {}).get("SS", [])), int(item.get("Version", {}).get("N", 0))
+
+def favorites_changed(user_id, add=(), remove=(), clear=False, expected_version=None):
+    """
+    Apply many additions and removals to the user's favorites in one
+    conditional write; returns (new set, new Version). clear empties the set
+    first, so clear plus add replaces it.
+
+    With expected_version the write only succeeds if the item is still at that
+    version, otherwise VersionConflict carries the current state. Without it
+    the read-modify-write is retried on a concurrent change. FavoriteCount
+    moves in the same transaction for up to MAX_TRANSACT - 1 changed recipes;
+    larger changes update the counters right after the favorites write
+    (scripts/rebuild_recipe_stats.py repairs any drift).
+    """
+    add, remove = {str(r) for r in add}, {str(r) for r in remove}
+    client = aws.client("dynamodb")
+    for attempt in range(MAX_ATTEMPTS):
+        current, version = read_favorites(user_id)
+        if expected_version is not None and expected_version != version:
+            raise VersionConflict(current, version)
+
+        new = ((set() if clear else current) | add) - remove
+        if new == current:
+            return current, version
+
+        values = {":v": {"N": str(version)}, ":next": {"N": str(version + 1)}}
+        if new:
+            expression = "SET RecipeIDs = :ids, Version = :next"
+            values[":ids"] = {"SS": sorted(new)}
+        else:
+            expression = "SET Version = :next REMOVE RecipeIDs"   # empty sets are not stored
+        write = {"Update": {
+            "TableName": FAVORITES_TABLE,
+            "Key": {"UserID": {"S": user_id}},
+            "UpdateExpression": expression,
+            "ConditionExpression": "Version = :v" if version else
+                                   "attribute_not_exists(Version) OR Version = :v",
+            "ExpressionAttributeValues": values,
+        }}
+        counters = ([_counter_update(rid, "FavoriteCount", 1) for rid in sorted(new - current)] +
+                    [_counter_update(rid, "FavoriteCount", -1) for rid in sorted(current - new)])
+        try:
+            if len(counters) < MAX_TRANSACT:
+                _transact([write] + counters)
+            else:
+                client.update_item(**write["Update"])
+                for counter in counters:
+                    client.update_item(**counter["Update"])
+        except (client.exceptions.TransactionCanceledException,
+                client.exceptions.ConditionalCheckFailedException) as e:
+            if isinstance(e, client.exceptions.TransactionCanceledException) and not _condition_failed(e):
+                raise
+            if expected_version is not None:
+                raise VersionConflict(*read_favorites(user_id))
+            time.sleep(random.uniform(0, 0.05 * 2 ** attempt))
+            continue
+        return new, version + 1
+    raise VersionConflict(*read_favorites(user_id))
+
+# ---------- reviews ------------------------------------------------------------
+def reviewer_key(recipe_id, user_id):
+    """RecipeId of the guard item recording that user_id reviewed recipe_id."""
+    return f"{recipe_id}#reviewer#{user_id}"
+
+def is_reviewer_key(recipe_id):
+    return "#reviewer#" in str(recipe_id)
+
+def review_guard(recipe_id, user_id, created_at):
+    return {
+        "RecipeId": {"S": reviewer_key(recipe_id, user_id)},
+        "UserId": {"S": user_id},
+        "CreatedAt": {"S": created_at},
+    }
+
+def find_review(recipe_id, user_id):
+    """The user's review of the recipe, found through its guard item; None if there is none."""
+    guard = aws.table(STATS_TABLE).get_item(
+        Key={"RecipeId": reviewer_key(recipe_id, user_id)}, ConsistentRead=True).get("Item")
+    if not guard:
+        return None
+    return aws.table(REVIEWS_TABLE).get_item(
+        Key={"RecipeId": str(recipe_id), "CreatedAt": guard["CreatedAt"]},
+        ConsistentRead=True).get("Item")
+
+def review_posted(item):
+    """
+    Put a new review, its guard item and the ReviewCount bump in one
+    transaction; returns False (and writes nothing) when this user already
+    has a review on the recipe, which is also what a retried POST sees.
+    """
+    client = aws.client("dynamodb")
+    try:
+        _transact([
+            {"Put": {
+                "TableName": REVIEWS_TABLE,
+                "Item": {k: serializer.serialize(v) for k, v in item.items()},
+                "ConditionExpression": "attribute_not_exists(CreatedAt)",
+            }},
+            {"Put": {
+                "TableName": STATS_TABLE,
+                "Item": review_guard(item["RecipeId"], item["UserId"], item["CreatedAt"]),
+                "ConditionExpression": "attribute_not_exists(RecipeId)",
+            }},
+            _counter_update(item["RecipeId"], "ReviewCount", 1),
+        ])
+    except client.exceptions.TransactionCanceledException as e:
+        if _condition_failed(e):
+            return False
+        raise
+    set_latest_review(item["RecipeId"], item["CreatedAt"], item.get("Username"),
+                      item.get("ReviewText"))
+    return True
+
+def set_latest_review(recipe_id, created_at, username, text, only_if_same=False):
+    """
+    Record the newest review on the stats item. Out-of-order writers lose the
+    condition and are ignored; with only_if_same an edit refreshes the text
+    only when it is the review currently shown.
+    """
+    condition = ("LatestReviewAt = :c" if only_if_same else
+                 "attribute_not_exists(LatestReviewAt) OR LatestReviewAt <= :c")
+    table = aws.table(STATS_TABLE)
+    try:
+        table.update_item(
+            Key={"RecipeId": str(recipe_id)},
+            UpdateExpression="SET LatestReviewAt = :c, LatestReviewUsername = :u, "
+                             "LatestReviewSnippet = :s",
+            ConditionExpression=condition,
+            ExpressionAttributeValues={
+                ":c": created_at,
+                ":u": username or "",
+                ":s": review_snippet(text),
+            },
+        )
+    except table.meta.client.exceptions.ConditionalCheckFailedException:
+        pass
+
+# ---------- read side ----------------------------------------------------------
+def _as_stats(item):
+    return {
+        "ReviewCount": int(item.get("ReviewCount", {}).get("N", 0)),
+        "FavoriteCount": max(0, int(item.get("FavoriteCount", {}).get("N", 0))),
+        "LatestReview": {
+            "CreatedAt": item["LatestReviewAt"]["S"],
+            "Username": item.get("LatestReviewUsername", {}).get("S", ""),
+            "Snippet": item.get("LatestReviewSnippet", {}).get("S", ""),
+        } if "LatestReviewAt" in item else None,
+    }
+
+def fetch_stats(recipe_ids):
+    """
+    {RecipeId: stats} for the given ids; recipes without an item get zeros.
+    Raises RuntimeError when keys stay unprocessed (aws.batch_get).
+    """
+    ids   = list(dict.fromkeys(str(r) for r in recipe_ids))
+    items = aws.batch_get(STATS_TABLE, [{"RecipeId": {"S": rid}} for rid in ids],
+                          ProjectionExpression=", ".join(STATS_FIELDS))   # not the Trend* fields
+    stats = {item["RecipeId"]["S"]: _as_stats(item) for item in items}
+    return {rid: stats.get(rid) or _as_stats({}) for rid in ids}
+
+def join_stats(recipes):
+    """Attach a "Stats" dict to every recipe (in place); returns the list."""
+    if recipes:
+        stats = fetch_stats(r["Id"] for r in recipes)
+        for r in recipes:
+            r["Stats"] = stats[str(r["Id"])]
+    return recipes
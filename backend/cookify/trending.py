@@ -0,0 +1,260 @@
+"""
+Trending recipes: time-decayed popularity scores and a published top-K.
+
+Scores decay with a half-life of TRENDING_HALF_LIFE_DAYS. Each recipe's
+RecipeStats item holds its trend as of the last event that touched it:
+
+    TrendScore        decayed score at TrendAt (epoch seconds)
+    TrendFavorites    the part of TrendScore that favorites contribute
+
+An event first decays the stored values to its own time, then adds its
+weight, so stored numbers stay as small as the weights themselves:
+
+    favorite added     +FAVORITE_WEIGHT      favorite removed   -FAVORITE_WEIGHT
+    review posted      +REVIEW_WEIGHT
+
+Favorites carry no add time, so a removal takes back a fresh favorite's
+weight but never more than TrendFavorites still holds: exact for a recipe's
+only favorite, and never below zero.
+
+The board is one item in TRENDING_TABLE (Name = "trending") with the global
+top-K and a top-K per CategoryId, every Score restated to the board's At.
+It is rewritten under a Version condition, so concurrent stream batches
+merge instead of overwriting each other.
+"""
+import os
+import time
+import random
+from collections import defaultdict
+from decimal import Decimal
+from boto3.dynamodb.types import TypeDeserializer
+from . import aws
+from .stats import STATS_TABLE, FAVORITES_TABLE, REVIEWS_TABLE
+
+TRENDING_TABLE  = os.environ.get("TRENDING_TABLE", "Trending")
+RECIPES_TABLE   = os.environ.get("RECIPES_TABLE", "Recipes")
+BOARD_NAME      = "trending"
+TOP_K           = int(os.environ.get("TRENDING_TOP_K", "50"))
+KEEP            = TOP_K * 2      # slack so a recipe falling out can be replaced
+HALF_LIFE_DAYS  = float(os.environ.get("TRENDING_HALF_LIFE_DAYS", "7"))
+HALF_LIFE_SEC   = HALF_LIFE_DAYS * 86400
+FAVORITE_WEIGHT = 3
+REVIEW_WEIGHT   = 2
+MAX_ATTEMPTS    = 6
+BOARD_FIELDS    = ("Id", "Title", "ImageUrl", "CategoryId")
+TREND_FIELDS    = ("TrendScore", "TrendFavorites", "TrendAt")
+
+deserializer = TypeDeserializer()
+
+def decayed(value, seconds):
+    """`value` after `seconds` of decay."""
+    return value * 2 ** (-seconds / HALF_LIFE_SEC)
+
+def fold(trend, events):
+    """
+    Apply (ts, weight, is_favorite) events to a (score, favorites, at) trend;
+    returns the new trend. A late event (ts before at) is weighed as of at.
+    """
+    score, favorites, at = trend
+    for ts, weight, favorite in events:
+        if ts > at:
+            score, favorites, at = decayed(score, ts - at), decayed(favorites, ts - at), ts
+        else:
+            weight = decayed(weight, at - ts)
+        if favorite:
+            weight = max(weight, -favorites)     # no more than favorites hold
+            favorites += weight
+        score += weight
+    return max(score, 0.0), max(favorites, 0.0), at
+
+def read_trend(item):
+    """(score, favorites, at) from a RecipeStats item; zeros when it has none."""
+    if "TrendAt" not in item:
+        return 0.0, 0.0, 0.0
+    return (float(item.get("TrendScore", 0)), float(item.get("TrendFavorites", 0)),
+            float(item["TrendAt"]))
+
+# ---------- stream records -> events ------------------------------------------
+def _table_of(record):
+    arn = record.get("eventSourceARN", "")
+    return arn.split(":table/", 1)[-1].split("/", 1)[0]
+
+def _ids(image):
+    return set((image or {}).get("RecipeIDs", {}).get("SS", []))
+
+def events_from_records(records):
+    """{RecipeId: [(ts, weight, is_favorite), ...]} for a batch of DynamoDB stream records."""
+    events = defaultdict(list)
+    for record in records:
+        ddb   = record.get("dynamodb", {})
+        ts    = float(ddb.get("ApproximateCreationDateTime", time.time()))
+        table = _table_of(record)
+        if table == FAVORITES_TABLE:
+            old, new = _ids(ddb.get("OldImage")), _ids(ddb.get("NewImage"))
+            for rid in sorted(new - old):
+                events[rid].append((ts, FAVORITE_WEIGHT, True))
+            for rid in sorted(old - new):
+                events[rid].append((ts, -FAVORITE_WEIGHT, True))
+        elif table == REVIEWS_TABLE and record.get("eventName") == "INSERT":
+            rid = ddb.get("NewImage", {}).get("RecipeId", {}).get("S")
+            if rid:
+                events[rid].append((ts, REVIEW_WEIGHT, False))
+    return dict(events)
+
+def to_number(value):
+    """Float -> DynamoDB-safe Decimal (trend values stay near the weights)."""
+    return Decimal(repr(round(value, 6)))
+
+def apply_events(events):
+    """
+    Fold each recipe's events into its stored trend; returns {RecipeId: (score, at)}.
+    The write is conditional on the trend read, so the Favorites and Reviews
+    consumers can touch the same recipe concurrently.
+    """
+    table  = aws.table(STATS_TABLE)
+    trends = {}
+    for rid, recipe_events in events.items():
+        for attempt in range(MAX_ATTEMPTS):
+            item = table.get_item(
+                Key={"RecipeId": rid},
+                ProjectionExpression=", ".join(TREND_FIELDS),
+                ConsistentRead=True,
+            ).get("Item", {})
+            score, favorites, at = fold(read_trend(item), recipe_events)
+            values = {":s": to_number(score), ":f": to_number(favorites), ":at": to_number(at)}
+            if "TrendAt" in item:
+                condition = "TrendAt = :at0 AND TrendScore = :s0"
+                values.update({":at0": item["TrendAt"], ":s0": item["TrendScore"]})
+            else:
+                condition = "attribute_not_exists(TrendAt)"
+            try:
+                table.update_item(
+                    Key={"RecipeId": rid},
+                    UpdateExpression="SET TrendScore = :s, TrendFavorites = :f, TrendAt = :at",
+                    ConditionExpression=condition,
+                    ExpressionAttributeValues=values,
+                )
+            except table.meta.client.exceptions.ConditionalCheckFailedException:
+                time.sleep(random.uniform(0, 0.05 * 2 ** attempt))
+                continue
+            trends[rid] = (score, at)
+            break
+        else:
+            raise RuntimeError(f"trend of recipe {rid} still contended after {MAX_ATTEMPTS} attempts")
+    return trends
+
+# ---------- board -------------------------------------------------------------
+def recipe_meta(recipe_ids):
+    """{Id: {Title, ImageUrl, CategoryId}} for the board entries; raises like aws.batch_get."""
+    items = aws.batch_get(
+        RECIPES_TABLE, [{"Id": {"S": rid}} for rid in dict.fromkeys(recipe_ids)],
+        ProjectionExpression=", ".join(f"#{f}" for f in BOARD_FIELDS),
+        ExpressionAttributeNames={f"#{f}": f for f in BOARD_FIELDS},
+    )
+    return {item["Id"]["S"]: {k: deserializer.deserialize(v) for k, v in item.items()}
+            for item in items}
+
+def _top(entries):
+    entries = [e for e in entries if e["Score"] > 0]
+    entries.sort(key=lambda e: (-e["Score"], e["Id"]))
+    return entries[:KEEP]
+
+def merge_board(board, trends, meta, now):
+    """
+    New board at `now` with `trends` ({RecipeId: (score, at)}) folded in; every
+    Score is restated to `now` and entries keep their recipe metadata.
+    """
+    age   = now - board.get("At", now)
+    known = {e["Id"]: {**e, "Score": decayed(e["Score"], age)} for e in board.get("Global", [])}
+    for entries in board.get("ByCategory", {}).values():
+        known.update({e["Id"]: {**e, "Score": decayed(e["Score"], age)} for e in entries})
+
+    for rid, (score, at) in trends.items():
+        entry = dict(known.get(rid) or {"Id": rid})
+        if rid in meta:
+            entry.update({f: meta[rid][f] for f in BOARD_FIELDS if f in meta[rid]})
+        entry["Score"] = decayed(score, now - at)
+        known[rid] = entry
+
+    global_ids = {e["Id"] for e in board.get("Global", [])} | set(trends)
+    by_category = {}
+    for cat, entries in board.get("ByCategory", {}).items():
+        by_category[cat] = {e["Id"] for e in entries}
+    for rid in trends:
+        cat = known[rid].get("CategoryId")
+        if cat:
+            by_category.setdefault(cat, set()).add(rid)
+
+    return {
+        "At": now,
+        "Global": _top(known[rid] for rid in global_ids),
+        "ByCategory": {cat: top for cat, ids in by_category.items()
+                       if (top := _top(known[rid] for rid in ids))},
+    }
+
+def _to_item(board):
+    def entry(e):
+        return {**e, "Score": to_number(e["Score"])}
+    return {
+        "At": to_number(board["At"]),
+        "Global": [entry(e) for e in board["Global"]],
+        "ByCategory": {c: [entry(e) for e in es] for c, es in board["ByCategory"].items()},
+    }
+
+def _from_item(item):
+    def entry(e):
+        return {**e, "Score": float(e["Score"])}
+    return {
+        "At": float(item.get("At", 0)),
+        "Global": [entry(e) for e in item.get("Global", [])],
+        "ByCategory": {c: [entry(e) for e in es] for c, es in item.get("ByCategory", {}).items()},
+    }
+
+def read_board(consistent=True):
+    """(board, Version) as stored; an empty board at version 0 if none."""
+    item = aws.table(TRENDING_TABLE).get_item(
+        Key={"Name": BOARD_NAME}, ConsistentRead=consistent
+    ).get("Item")
+    if not item:
+        return {"At": 0.0, "Global": [], "ByCategory": {}}, 0
+    return _from_item(item), int(item.get("Version", 0))
+
+def write_board(board, version):
+    """Store `board` if the item is still at `version`; False on a lost race."""
+    table = aws.table(TRENDING_TABLE)
+    try:
+        table.put_item(
+            Item={"Name": BOARD_NAME, "Version": version + 1,
+                  "UpdatedAt": int(time.time()), **_to_item(board)},
+            ConditionExpression="attribute_not_exists(#n) OR Version = :v",
+            ExpressionAttributeNames={"#n": "Name"},
+            ExpressionAttributeValues={":v": version},
+        )
+    except table.meta.client.exceptions.ConditionalCheckFailedException:
+        return False
+    return True
+
+def publish(trends):
+    """Fold new trends into the board, retrying on concurrent publishers."""
+    if not trends:
+        return
+    meta = recipe_meta(trends)
+    for attempt in range(MAX_ATTEMPTS):
+        board, version = read_board()
+        now = max([board["At"]] + [at for _, at in trends.values()])   # newest event seen
+        if write_board(merge_board(board, trends, meta, now), version):
+            return
+        time.sleep(random.uniform(0, 0.05 * 2 ** attempt))
+    raise RuntimeError(f"trending board still contended after {MAX_ATTEMPTS} attempts")
+
+def process_records(records):
+    """Stream batch -> trend updates -> board; returns the recipes touched."""
+    trends = apply_events(events_from_records(records))
+    publish(trends)
+    return trends
+
+# ---------- read side ----------------------------------------------------------
+def ranked(entries, limit, at, now=None):
+    """The top `limit` entries of a board stored at `at`, Score restated to now."""
+    age = max(0.0, (now or time.time()) - at)
+    return [{**e, "Score": round(decayed(e["Score"], age), 3)} for e in entries[:limit]]
@@ -0,0 +1,66 @@
+from botocore.exceptions import ClientError
+from cookify import cors_response, get_claims, is_preflight, parse_body, stats
+
+MAX_CHANGES = 1000   # ids per request (add + remove)
+
+def lambda_handler(event, context):
+    """
+    POST /Users/Favorites/batch
+        {"add": [...], "remove": [...], "clear": false, "Version": 7}
+    -> 200 {"RecipeIDs": [...], "Version": 8}
+    -> 409 {"error": ..., "RecipeIDs": [...], "Version": n} when Version is stale
+
+    clear empties the favorites before add and remove are applied.
+    """
+    if is_preflight(event):
+        return _cors(200, "OK")
+
+    claims = get_claims(event)
+    if not claims or "sub" not in claims:
+        return _cors(401, {"error": "No auth claims"})
+
+    user_id = claims["sub"]
+
+    try:
+        body = parse_body(event)
+    except ValueError:
+        return _cors(400, {"error": "Invalid JSON"})
+
+    add    = body.get("add") or []
+    remove = body.get("remove") or []
+    clear  = bool(body.get("clear"))
+    if not isinstance(add, list) or not isinstance(remove, list):
+        return _cors(400, {"error": "add and remove must be lists of RecipeIds"})
+    if len(add) + len(remove) > MAX_CHANGES:
+        return _cors(400, {"error": f"At most {MAX_CHANGES} changes per request"})
+    if not (add or remove or clear):
+        return _cors(400, {"error": "Nothing to change"})
+
+    version = body.get("Version")
+    if version is not None:
+        try:
+            version = int(version)
+        except (TypeError, ValueError):
+            return _cors(400, {"error": "Version must be an integer"})
+
+    try:
+        ids, new_version = stats.favorites_changed(
+            user_id, add=add, remove=remove, clear=clear, expected_version=version
+        )
+    except stats.VersionConflict as e:
+        return _cors(409, {
+            "error": "Favorites changed since Version was read",
+            "RecipeIDs": sorted(e.recipe_ids),
+            "Version": e.version,
+        })
+    except ClientError as e:
+        print("Batch favorites error:", e)
+        return _cors(503, {"error": "Could not update favorites; please retry"})
+    except Exception as e:
+        print("Batch favorites error:", e)
+        return _cors(500, {"error": "Internal error"})
+
+    return _cors(200, {"RecipeIDs": sorted(ids), "Version": new_version})
+
+def _cors(status, body):
+    return cors_response(status, body, methods="OPTIONS,POST")
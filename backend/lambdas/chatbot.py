@@ -1,67 +1,238 @@
 import json
 import os
-import urllib.request
-import urllib.error
+import re
+import time
+import hashlib
+from cookify import aws, cors_response, parse_body
+from cookify.cache import TTLCache
+from cookify.http import (
+    HttpClient, CircuitBreaker, Deadline, UpstreamError, CircuitOpen, DeadlineExceeded,
+)
 
 # Read your API key from Lambda environment variables
 GEMINI_API_KEY = os.environ["GEMINI_API_KEY"]
+MODEL = "gemini-1.5-flash"
+GENERATION_CONFIG = {
+    "maxOutputTokens": 300      # limit length so Lambda stays fast
+}
+# API Gateway still buffers the SSE body, so a streamed reply arrives all at
+# once: keep the same cap until it is served through a function URL with
+# InvokeMode RESPONSE_STREAM (then CHAT_STREAM_MAX_TOKENS can be raised)
+STREAM_GENERATION_CONFIG = {
+    "maxOutputTokens": int(os.environ.get("CHAT_STREAM_MAX_TOKENS",
+                                          GENERATION_CONFIG["maxOutputTokens"]))
+}
+GEMINI_HOST = "generativelanguage.googleapis.com"
+GEMINI_PATH = "/v1beta/models/"
 
+# one keep-alive client per container; fails fast after repeated upstream errors
+gemini = HttpClient(
+    GEMINI_HOST,
+    max_attempts=int(os.environ.get("GEMINI_MAX_ATTEMPTS", "3")),
+    breaker=CircuitBreaker(
+        failure_threshold=int(os.environ.get("GEMINI_BREAKER_FAILURES", "5")),
+        reset_after=int(os.environ.get("GEMINI_BREAKER_RESET_SECONDS", "30")),
+    ),
+)
+
+# Two-tier reply cache: per-container LRU, then a shared DynamoDB table whose
+# ExpiresAt attribute is the table's TTL attribute.
+CACHE_TABLE       = os.environ.get("CHAT_CACHE_TABLE")            # unset -> local tier only
+CACHE_TTL_SECONDS = int(os.environ.get("CHAT_CACHE_TTL_SECONDS", "86400"))
+LOCAL_CACHE_SIZE  = int(os.environ.get("CHAT_LOCAL_CACHE_SIZE", "256"))
+LOCAL_TTL_SECONDS = int(os.environ.get("CHAT_LOCAL_TTL_SECONDS", "900"))
+
+# ---------- cache ------------------------------------------------------------
+local_cache = TTLCache(LOCAL_CACHE_SIZE, LOCAL_TTL_SECONDS)   # lives as long as the container
+cache_stats = {"local_hits": 0, "shared_hits": 0, "misses": 0}
+
+def normalize(message):
+    """Case, spacing and trailing punctuation don't change the question."""
+    return re.sub(r"\s+", " ", message).strip().lower().rstrip("?!. ")
+
+def cache_key(message, config=GENERATION_CONFIG):
+    """Hash of the normalized message plus everything that shapes the answer."""
+    material = json.dumps([MODEL, config, normalize(message)], sort_keys=True)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+def shared_get(key):
+    if not CACHE_TABLE:
+        return None
+    try:
+        item = aws.table(CACHE_TABLE).get_item(Key={"Key": key}).get("Item")
+    except Exception as e:
+        print("Chat cache read failed:", e)
+        return None
+    # TTL deletion is lazy, so expired items can still be returned for a while
+    if not item or int(item.get("ExpiresAt", 0)) < time.time():
+        return None
+    return item["Reply"]
+
+def shared_put(key, reply):
+    if not CACHE_TABLE:
+        return
+    try:
+        aws.table(CACHE_TABLE).put_item(Item={
+            "Key": key,
+            "Reply": reply,
+            "Model": MODEL,
+            "ExpiresAt": int(time.time()) + CACHE_TTL_SECONDS,
+        })
+    except Exception as e:
+        print("Chat cache write failed:", e)
+
+def cached_reply(key):
+    """Returns (reply, tier) or (None, None)."""
+    reply = local_cache.get(key)
+    if reply is not None:
+        cache_stats["local_hits"] += 1
+        return reply, "local"
+    reply = shared_get(key)
+    if reply is not None:
+        cache_stats["shared_hits"] += 1
+        local_cache.set(key, reply)
+        return reply, "shared"
+    cache_stats["misses"] += 1
+    return None, None
+
+# ---------- streaming ---------------------------------------------------------
+def wants_stream(event):
+    """?stream=1 or an EventSource-style Accept header."""
+    qs      = event.get("queryStringParameters") or {}
+    headers = {k.lower(): v for k, v in (event.get("headers") or {}).items()}
+    return qs.get("stream") == "1" or "text/event-stream" in headers.get("accept", "")
+
+def gemini_path(method):
+    return f"{GEMINI_PATH}{MODEL}:{method}key={GEMINI_API_KEY}"
+
+def gemini_payload(message, config):
+    return {
+        "contents": [
+            {"parts": [{"text": message}]}
+        ],
+        "generationConfig": config
+    }
+
+def upstream_failure(e):
+    """(status, message) for a failed Gemini call."""
+    if isinstance(e, CircuitOpen):
+        return 503, "ChefBot is busy, please try again shortly"
+    if isinstance(e, DeadlineExceeded):
+        return 504, "Gemini timed out"
+    if isinstance(e, UpstreamError):
+        return e.status, f"Gemini error {e.status}"
+    return 500, "Internal error"
+
+def stream_gemini(message, deadline):
+    """Yield text fragments from streamGenerateContent as the SSE lines arrive."""
+    body = json.dumps(gemini_payload(message, STREAM_GENERATION_CONFIG)).encode("utf-8")
+    with gemini.stream("POST", gemini_path("streamGenerateContent?alt=sse&"), deadline,
+                       body=body, headers={"Content-Type": "application/json"}) as lines:
+        for raw in lines:
+            line = raw.decode("utf-8").strip()
+            if not line.startswith("data:"):
+                continue
+            chunk = json.loads(line[len("data:"):])
+            for part in (chunk.get("candidates", [{}])[0]
+                         .get("content", {}).get("parts", [])):
+                if part.get("text"):
+                    yield part["text"]
+
+def sse_event(data, event=None):
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+def stream_reply(message, deadline):
+    """
+    SSE body: one `data: {"delta": ...}` event per fragment, then
+    `event: done` with the full reply. The managed Python runtime hands the
+    body to API Gateway in one piece; the framing is what lets the client
+    render fragments as soon as a streaming transport delivers them.
+    """
+    key = cache_key(message, STREAM_GENERATION_CONFIG)
+    reply, tier = cached_reply(key)
+    events = []
+    if reply is None:
+        tier, fragments, failed = "miss", [], True
+        try:
+            for fragment in stream_gemini(message, deadline):
+                fragments.append(fragment)
+                events.append(sse_event({"delta": fragment}))
+            failed = False
+        except Exception as e:
+            print("Gemini stream failed:", repr(e))
+            events.append(sse_event({"error": upstream_failure(e)[1]}, event="error"))
+        reply = "".join(fragments).strip()
+        if reply and not failed:
+            local_cache.set(key, reply)
+            shared_put(key, reply)
+    else:
+        events.append(sse_event({"delta": reply}))
+    events.append(sse_event({"reply": reply}, event="done"))
+
+    return {
+        "statusCode": 200,
+        "headers": {
+            "Access-Control-Allow-Origin": "*",
+            "Access-Control-Allow-Methods": "POST,OPTIONS",
+            "Access-Control-Allow-Headers": "Content-Type,Authorization",
+            "Content-Type": "text/event-stream",
+            "Cache-Control": "no-cache",
+            "X-Cache": tier,
+        },
+        "body": "".join(events),
+    }
+
+# ---------- Lambda handler ---------------------------------------------------
 def lambda_handler(event, context):
     """POST body: { "message": "your text" }  →  { "reply": "Gemini answer" }"""
-    
-    body = json.loads(event.get("body") or "{}")
+
+    body = parse_body(event)
     message = body.get("message", "").strip()
 
     if not message:
         return _response(400, {"reply": "Empty message"})
 
-    # Build Gemini request
-    req = urllib.request.Request(
-        f"https://generativelanguage.googleapis.com/v1beta/models/"
-        f"gemini-1.5-flash:generateContent?key={GEMINI_API_KEY}",
-        method="POST",
-        headers={"Content-Type": "application/json"},
-        data=json.dumps({
-            "contents": [
-                {"parts": [{"text": message}]}
-            ],
-            "generationConfig": {
-                "maxOutputTokens": 300      # limit length so Lambda stays fast
-            }
-        }).encode("utf-8"),
-    )
+    if wants_stream(event):
+        return stream_reply(message, Deadline.from_context(context))
+
+    key = cache_key(message)
+    reply, tier = cached_reply(key)
+    print("Chat cache:", json.dumps({"tier": tier or "miss", **cache_stats}))
+    if reply is not None:
+        return _response(200, {"reply": reply}, cache=tier)
 
+    # Gemini call, bounded by what is left of this invocation
     try:
-        with urllib.request.urlopen(req, timeout=20) as res:
-            response_data = json.load(res)
-            print("Gemini response:", json.dumps(response_data))   # debug log
-    except urllib.error.HTTPError as e:
-        print("Gemini request failed:", e)
-        return _response(e.code, {"reply": f"Gemini error {e.code}"})
+        response_data = gemini.post_json(
+            gemini_path("generateContent?"),
+            gemini_payload(message, GENERATION_CONFIG),
+            Deadline.from_context(context),
+        )
     except Exception as e:
-        print("Unexpected error:", e)
-        return _response(500, {"reply": "Internal error"})
+        print("Gemini request failed:", repr(e), "breaker:", gemini.breaker.state)
+        status, text = upstream_failure(e)
+        return _response(status, {"reply": text})
+    print("Gemini usage:", json.dumps(response_data.get("usageMetadata", {})))
 
     # Extract text
-    reply = (
+    text = (
         response_data.get("candidates", [{}])[0]
         .get("content", {})
         .get("parts", [{}])[0]
-        .get("text", "Sorry, something went wrong.")
-        .strip()
+        .get("text")
     )
+    if not text or not text.strip():
+        return _response(200, {"reply": "Sorry, something went wrong."})
 
-    return _response(200, {"reply": reply})
+    # only real answers are cached
+    reply = text.strip()
+    local_cache.set(key, reply)
+    shared_put(key, reply)
+    return _response(200, {"reply": reply}, cache="miss")
 
 
-def _response(status_code, body_dict):
+def _response(status_code, body_dict, cache=None):
     """Helper to add CORS headers."""
-    return {
-        "statusCode": status_code,
-        "headers": {
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Headers": "Content-Type",
-            "Access-Control-Allow-Methods": "POST,OPTIONS",
-        },
-        "body": json.dumps(body_dict),
-    }
+    headers = {"X-Cache": cache} if cache else None
+    return cors_response(status_code, body_dict, methods="POST,OPTIONS", headers=headers)
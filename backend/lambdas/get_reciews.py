@@ -1,29 +1,62 @@
-import json, os, boto3
 from boto3.dynamodb.conditions import Key
+from cookify import aws, cors_response, is_preflight, encode_key, decode_key, stats
 
-TABLE = boto3.resource("dynamodb").Table("Reviews")
+REVIEWS_TABLE = "Reviews"
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE     = 100   # protection vs. hot partitions
+# Reviews move faster than recipes: short freshness, then ETag revalidation
+CACHE_CONTROL     = "public, max-age=10, stale-while-revalidate=60"
 
 def lambda_handler(event, _):
-    if event.get("httpMethod") == "OPTIONS":
+    """
+    GET /Recipes/{recipeId}/Review
+        (no params)                -> newest 100 reviews as a plain list
+        ?pageSize=N&lastKey=...    -> {"items": [...], "lastKey": cursor | null}
+        ?since=<CreatedAt>         -> same shape, only reviews newer than `since`
+        ?userId=<sub>              -> same shape, just that user's review (if any),
+                                      however old; not cached
+    """
+    if is_preflight(event):
         return _cors(200, "OK")
 
     recipe_id = event["pathParameters"]["recipeId"]
+    qs        = event.get("queryStringParameters") or {}
 
-    resp = TABLE.query(
-        KeyConditionExpression=Key("RecipeId").eq(recipe_id),
-        ScanIndexForward=False,   # newest first
-        Limit=100                 # protection vs. hot partitions
-    )
-
-    return _cors(200, resp.get("Items", []))
-
-def _cors(code, body):
-    return {
-        "statusCode": code,
-        "headers": {
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Headers": "Content-Type,Authorization",
-            "Access-Control-Allow-Methods": "GET,POST,OPTIONS",
-        },
-        "body": json.dumps(body),
+    if qs.get("userId"):
+        review = stats.find_review(recipe_id, qs["userId"])
+        return _cors(200, {"items": [review] if review else [], "lastKey": None})
+
+    key_condition = Key("RecipeId").eq(recipe_id)
+    if qs.get("since"):
+        # CreatedAt is the sort key, so this reads only the new reviews
+        key_condition = key_condition & Key("CreatedAt").gt(qs["since"])
+
+    query_kwargs = {
+        "KeyConditionExpression": key_condition,
+        "ScanIndexForward": False,   # newest first
     }
+
+    # legacy shape: one capped list
+    if not any(qs.get(p) for p in ("pageSize", "lastKey", "since")):
+        query_kwargs["Limit"] = MAX_PAGE_SIZE
+        resp = aws.table(REVIEWS_TABLE).query(**query_kwargs)
+        return _cors(200, resp.get("Items", []), event)
+
+    try:
+        query_kwargs["Limit"] = max(1, min(int(qs.get("pageSize") or DEFAULT_PAGE_SIZE),
+                                           MAX_PAGE_SIZE))
+    except ValueError:
+        return _cors(400, {"error": "pageSize must be an integer"})
+    last_key_in = decode_key(qs.get("lastKey"))
+    if last_key_in:
+        query_kwargs["ExclusiveStartKey"] = last_key_in
+
+    resp = aws.table(REVIEWS_TABLE).query(**query_kwargs)
+    return _cors(200, {
+        "items": resp.get("Items", []),
+        "lastKey": encode_key(resp.get("LastEvaluatedKey")),
+    }, event)
+
+def _cors(code, body, event=None):
+    return cors_response(code, body, methods="GET,POST,OPTIONS", event=event,
+                         cache_control=CACHE_CONTROL if event else None)
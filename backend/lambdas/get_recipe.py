@@ -0,0 +1,24 @@
+import os
+from cookify import cors_response, is_preflight, make_etag, cache
+
+# Recipes change rarely; let browsers and CloudFront keep them a while
+CACHE_CONTROL = os.environ.get("RECIPE_CACHE_CONTROL",
+                               "public, max-age=300, stale-while-revalidate=3600")
+
+def lambda_handler(event, context):
+    """GET /Recipes/{recipeId} -> one recipe, via the container's read-through cache"""
+    if is_preflight(event):
+        return cors_response(200, "")
+
+    recipe_id = ((event.get("pathParameters") or {}).get("recipeId") or "").strip()
+    if not recipe_id:
+        return cors_response(400, {"error": "Missing recipeId"})
+
+    recipe = cache.get_recipe(recipe_id)
+    if recipe is None:
+        return cors_response(404, {"error": "Recipe not found"})
+
+    # Versioned recipes get an ETag from Id/UpdatedAt, others one from the content
+    version = recipe.get(cache.VERSION_ATTR)
+    etag    = make_etag(recipe["Id"], version) if version else None
+    return cors_response(200, recipe, event=event, cache_control=CACHE_CONTROL, etag=etag)
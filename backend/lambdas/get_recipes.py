@@ -1,14 +1,96 @@
-import json
-import boto3
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from boto3.dynamodb.types import TypeDeserializer
+from cookify import aws, json_response, dumps, compress, encode_key, decode_key
+from cookify.exports import S3Sink
+from cookify.recipes import CARD_FIELDS   # ?fields=card
 
-def lambda_handler(event, context):
-    dynamodb = boto3.resource('dynamodb')
-    table = dynamodb.Table('Recipes')
+TABLE_NAME        = os.environ.get('RECIPES_TABLE', 'Recipes')
+EXPORT_BUCKET     = os.environ.get('EXPORT_BUCKET')              # needed for ?export=s3
+TOTAL_SEGMENTS    = int(os.environ.get('SCAN_SEGMENTS', '8'))    # parallel scan workers
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE     = 1000
 
-    response = table.scan()
-    items = response.get('Items', [])
+deserializer = TypeDeserializer()
 
-    return {
-        'statusCode': 200,
-        'body': json.dumps(items)
+# ---------- parallel scan ------------------------------------------------------
+def scan_segment(segment, sink, fields=None):
+    """Follow LastEvaluatedKey through one segment, handing every page to the sink."""
+    scan_kwargs = {
+        'TableName': TABLE_NAME,
+        'Segment': segment,
+        'TotalSegments': TOTAL_SEGMENTS,
     }
+    if fields:
+        scan_kwargs['ProjectionExpression']     = ', '.join(f'#{f}' for f in fields)
+        scan_kwargs['ExpressionAttributeNames'] = {f'#{f}': f for f in fields}
+    while True:
+        resp = aws.client('dynamodb').scan(**scan_kwargs)
+        sink.write_page([
+            {k: deserializer.deserialize(v) for k, v in item.items()}
+            for item in resp.get('Items', [])
+        ])
+        if 'LastEvaluatedKey' not in resp:
+            return
+        scan_kwargs['ExclusiveStartKey'] = resp['LastEvaluatedKey']
+
+def parallel_scan(sink, fields=None):
+    """Scan all segments concurrently; re-raises the first segment failure."""
+    with ThreadPoolExecutor(max_workers=TOTAL_SEGMENTS) as pool:
+        futures = [pool.submit(scan_segment, seg, sink, fields)
+                   for seg in range(TOTAL_SEGMENTS)]
+        for f in futures:
+            f.result()
+
+# ---------- one page ------------------------------------------------------------
+def scan_page(page_size, last_key, fields=None):
+    """(items, LastEvaluatedKey) for one bounded scan page."""
+    scan_kwargs = {'Limit': page_size}
+    if last_key:
+        scan_kwargs['ExclusiveStartKey'] = last_key
+    if fields:
+        scan_kwargs['ProjectionExpression']     = ', '.join(f'#{f}' for f in fields)
+        scan_kwargs['ExpressionAttributeNames'] = {f'#{f}': f for f in fields}
+    resp = aws.table(TABLE_NAME).scan(**scan_kwargs)
+    return resp.get('Items', []), resp.get('LastEvaluatedKey')
+
+# ---------- Lambda handler ---------------------------------------------------
+def lambda_handler(event, context):
+    qs     = (event or {}).get('queryStringParameters') or {}
+    fields = CARD_FIELDS if qs.get('fields') == 'card' else None
+
+    # ?export=s3 -> write the whole catalog to S3 and return its location; the
+    # full catalog only ever leaves through here (a response body caps at 6 MB)
+    if qs.get('export') == 's3':
+        if not EXPORT_BUCKET:
+            return json_response(500, {'message': 'EXPORT_BUCKET is not configured'})
+        key  = f"exports/recipes-{time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())}.ndjson"
+        sink = S3Sink(EXPORT_BUCKET, key)
+        try:
+            parallel_scan(sink, fields)
+            sink.close()
+        except Exception:
+            sink.abort()
+            raise
+        return json_response(200, {'bucket': EXPORT_BUCKET, 'key': key, 'count': sink.count})
+
+    # otherwise one page per call: ?pageSize=N&lastKey=<cursor>
+    try:
+        page_size = max(1, min(int(qs.get('pageSize') or DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE))
+    except ValueError:
+        return json_response(400, {'message': 'pageSize must be an integer'})
+    items, last_key = scan_page(page_size, decode_key(qs.get('lastKey')), fields)
+
+    # ?format=ndjson -> one recipe per line, the cursor in a header
+    if qs.get('format') == 'ndjson':
+        headers = {'Content-Type': 'application/x-ndjson'}
+        if last_key:
+            headers['X-Last-Key'] = encode_key(last_key)
+        return compress({
+            'statusCode': 200,
+            'headers': headers,
+            'body': ''.join(dumps(item) + '\n' for item in items)
+        }, event)
+
+    return json_response(200, {'items': items, 'lastKey': encode_key(last_key)}, event=event)
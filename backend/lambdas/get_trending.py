@@ -0,0 +1,35 @@
+import os
+from cookify import cors_response, is_preflight, trending
+from cookify.cache import TTLCache
+
+MAX_LIMIT     = 50
+BOARD_TTL_SEC = float(os.environ.get("TRENDING_BOARD_TTL", "30"))   # per warm container
+CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=300"
+
+_board = TTLCache(1, BOARD_TTL_SEC)
+
+def load_board():
+    """The published board; one get_item per container every BOARD_TTL_SEC."""
+    board = _board.get("board")
+    if board is None:
+        board, _ = trending.read_board(consistent=False)
+        _board.set("board", board)
+    return board
+
+def lambda_handler(event, context):
+    """GET /Recipes/trending?category=<CategoryId>&limit=20 -> {"items": [...]}"""
+    if is_preflight(event):
+        return cors_response(200, "")
+
+    qs = event.get("queryStringParameters") or {}
+    try:
+        limit = max(1, min(int(qs.get("limit", 20)), MAX_LIMIT))
+    except ValueError:
+        return cors_response(400, {"error": "limit must be an integer"})
+
+    board    = load_board()
+    category = qs.get("category")
+    entries  = board["ByCategory"].get(category, []) if category else board["Global"]
+
+    return cors_response(200, {"items": trending.ranked(entries, limit, board["At"])},
+                         event=event, cache_control=CACHE_CONTROL)
@@ -1,25 +1,82 @@
 import os
 import json
+import time
 import logging
-import boto3
 from botocore.exceptions import ClientError
 from boto3.dynamodb.conditions import Attr
+from cookify import aws, get_claims, encode_key, decode_key, dumps, compress
+from cookify.exports import S3Sink
 
-# ——— Setup clients & logging ———
+# ——— Setup logging ———
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-dynamodb    = boto3.resource('dynamodb')
-USERS_TABLE = os.environ.get('USERS_TABLE', 'Users')
-table       = dynamodb.Table(USERS_TABLE)
+USERS_TABLE   = os.environ.get('USERS_TABLE', 'Users')
+EXPORT_BUCKET = os.environ.get('EXPORT_BUCKET')     # needed for ?export=s3
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+SEARCH_READ_AHEAD = 200   # items evaluated per round trip when ?q= is set
+
+# What the admin page renders; ?fields=all returns whole items
+USER_FIELDS = ('UserID', 'email', 'user_name')
+
+def build_scan(qs):
+    """Scan kwargs for the requested projection and ?q= prefix search."""
+    kwargs = {}
+    if qs.get('fields') != 'all':
+        kwargs['ProjectionExpression']     = ', '.join(f'#{f}' for f in USER_FIELDS)
+        kwargs['ExpressionAttributeNames'] = {f'#{f}': f for f in USER_FIELDS}
+    prefix = (qs.get('q') or '').strip()
+    if prefix:
+        # DynamoDB comparisons are case-sensitive: match as typed and lower-cased
+        cond = None
+        for p in dict.fromkeys((prefix, prefix.lower())):
+            c = Attr('user_name').begins_with(p) | Attr('email').begins_with(p)
+            cond = c if cond is None else cond | c
+        kwargs['FilterExpression'] = cond
+    return kwargs
+
+def scan_pages(kwargs):
+    """Yield each scanned page's items, following LastEvaluatedKey."""
+    table = aws.table(USERS_TABLE)
+    while True:
+        resp = table.scan(**kwargs)
+        yield resp.get('Items', [])
+        if 'LastEvaluatedKey' not in resp:
+            return
+        kwargs['ExclusiveStartKey'] = resp['LastEvaluatedKey']
+
+def fetch_page(kwargs, page_size, last_key_in):
+    """
+    Collect up to page_size matching users starting after last_key_in; when a
+    read overshoots, the cursor is rebuilt from the last user returned.
+    """
+    if last_key_in:
+        kwargs['ExclusiveStartKey'] = last_key_in
+    kwargs['Limit'] = page_size
+    if 'FilterExpression' in kwargs:
+        kwargs['Limit'] = max(page_size, SEARCH_READ_AHEAD)
+
+    table = aws.table(USERS_TABLE)
+    items = []
+    while True:
+        resp     = table.scan(**kwargs)
+        batch    = resp.get('Items', [])
+        last_key = resp.get('LastEvaluatedKey')
+
+        room = page_size - len(items)
+        if len(batch) > room:
+            items.extend(batch[:room])
+            return items, {'UserID': items[-1]['UserID']}
+        items.extend(batch)
+        if not last_key or len(items) == page_size:
+            return items, last_key
+        kwargs['ExclusiveStartKey'] = last_key
 
 def lambda_handler(event, context):
     # 1) Extract authorizer payload (v2 jwt.claims or v1 claims)
-    auth = event.get('requestContext', {}).get('authorizer', {}) or {}
-    claims = auth.get('jwt', {}).get('claims') \
-             or auth.get('claims') \
-             or {}
-    logger.info("JWT claims received: %s", claims)
+    claims = get_claims(event)
+    logger.info("Admin user listing requested by %s", claims.get('sub'))
 
     # 2) Normalize cognito:groups into a Python list
     raw = claims.get('cognito:groups', [])
@@ -45,8 +102,6 @@ def lambda_handler(event, context):
             # comma‑separated fallback
             groups = [g.strip() for g in raw_str.split(',') if g.strip()]
 
-    logger.info("Normalized groups list: %s", groups)
-
     # 3) Case‑insensitive admin check
     if not any(g.lower() == 'admin' for g in groups):
         return {
@@ -55,20 +110,45 @@ def lambda_handler(event, context):
         }
 
     # 4) Scan DynamoDB Users table
+    qs     = event.get('queryStringParameters') or {}
+    kwargs = build_scan(qs)
     try:
-        resp  = table.scan()
-        users = resp.get('Items', [])
-        # handle pagination
-        while 'LastEvaluatedKey' in resp:
-            resp  = table.scan(ExclusiveStartKey=resp['LastEvaluatedKey'])
-            users.extend(resp.get('Items', []))
-
-        # 5) Return the full list
-        return {
+        # ?export=s3 -> stream every page to S3 and return its location
+        if qs.get('export') == 's3':
+            if not EXPORT_BUCKET:
+                return {
+                    'statusCode': 500,
+                    'body': json.dumps({'message': 'EXPORT_BUCKET is not configured'})
+                }
+            key  = f"exports/users-{time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())}.ndjson"
+            sink = S3Sink(EXPORT_BUCKET, key)
+            try:
+                for page in scan_pages(kwargs):
+                    sink.write_page(page)
+                sink.close()
+            except Exception:
+                sink.abort()
+                raise
+            return {
+                'statusCode': 200,
+                'headers': {'Content-Type': 'application/json'},
+                'body': json.dumps({'bucket': EXPORT_BUCKET, 'key': key, 'count': sink.count})
+            }
+
+        # ?pageSize=N[&lastKey=...] -> one page plus a cursor; every user only via ?export=s3
+        try:
+            page_size = max(1, min(int(qs.get('pageSize') or DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE))
+        except ValueError:
+            return {
+                'statusCode': 400,
+                'body': json.dumps({'message': 'pageSize must be an integer'})
+            }
+        items, last_key = fetch_page(kwargs, page_size, decode_key(qs.get('lastKey')))
+        return compress({
             'statusCode': 200,
             'headers': {'Content-Type': 'application/json'},
-            'body': json.dumps(users)
-        }
+            'body': dumps({'items': items, 'lastKey': encode_key(last_key)})
+        }, event)
 
     except ClientError as e:
         logger.error("DynamoDB scan failed", exc_info=True)
@@ -1,50 +1,42 @@
-import os
-import json
-import boto3
-from boto3.dynamodb.conditions import Key, Attr
+from cookify import json_response, encode_key, decode_key, recipes, stats
 
-dynamodb = boto3.resource('dynamodb')
-TABLE_NAME = os.environ.get('RECIPES_TABLE', 'Recipes')
-table      = dynamodb.Table(TABLE_NAME)
+MAX_PAGE_SIZE = 100
 
 def lambda_handler(event, context):
     # 1) Extract userId from either pathParameters or queryString
-    user_id = None
-    if event.get('pathParameters', {}).get('user-id'):
-        user_id = event['pathParameters']['user-id']
-    elif event.get('queryStringParameters', {}).get('user-id'):
-        user_id = event['queryStringParameters']['user-id']
+    path_params = event.get('pathParameters') or {}
+    qs          = event.get('queryStringParameters') or {}
+    user_id = path_params.get('user-id') or qs.get('user-id')
 
     if not user_id:
-        return {
-            'statusCode': 400,
-            'body': json.dumps({'message': 'Missing userId'})
-        }
+        return json_response(400, {'message': 'Missing userId'})
 
+    # 2) Query the CreatedByUserId/CreatedAt index, newest first
+    with_stats = qs.get('stats') == '1'    # review/favorite counts per card
     try:
-        # 2) If you have a GSI on CreatedByUserId:
-        # resp = table.query(
-        #     IndexName='CreatedByUserId-index',
-        #     KeyConditionExpression=Key('CreatedByUserId').eq(user_id)
-        # )
-
-        # Otherwise fall back to a scan + filter (OK for small tables):
-        resp = table.scan(
-            FilterExpression=Attr('CreatedByUserId').eq(user_id)
-        )
+        # ?pageSize=N[&lastKey=...] -> one page plus a cursor
+        if qs.get('pageSize'):
+            try:
+                page_size = max(1, min(int(qs['pageSize']), MAX_PAGE_SIZE))
+            except ValueError:
+                return json_response(400, {'message': 'pageSize must be an integer'})
+            items, last_key = recipes.recipes_by_user(
+                user_id, page_size=page_size, last_key=decode_key(qs.get('lastKey')))
+            if with_stats:
+                stats.join_stats(items)
+            return json_response(200, {
+                'items': items,
+                'lastKey': encode_key(last_key),
+            })
 
-        items = resp.get('Items', [])
+        # otherwise every recipe of this user (reads only the user's partition)
+        items, _ = recipes.recipes_by_user(user_id)
+        if with_stats:
+            stats.join_stats(items)
     except Exception as e:
-        return {
-            'statusCode': 500,
-            'body': json.dumps({
-                'message': 'Error fetching user recipes',
-                'error': str(e)
-            })
-        }
+        return json_response(500, {
+            'message': 'Error fetching user recipes',
+            'error': str(e)
+        })
 
-    return {
-        'statusCode': 200,
-        'headers': {'Content-Type': 'application/json'},
-        'body': json.dumps(items)
-    }
+    return json_response(200, items)
@@ -1,49 +1,38 @@
 import json
-import boto3
-
-dynamodb = boto3.resource('dynamodb')
-fav_tbl = dynamodb.Table('Favorites')
+from botocore.exceptions import ClientError
+from cookify import cors_response, get_claims, is_preflight, parse_body, stats
 
 def lambda_handler(event, context):
     print("RAW EVENT:", json.dumps(event))
 
-    if event.get("httpMethod") == "OPTIONS":
-        return cors_response(200, "OK")
+    if is_preflight(event):
+        return _cors(200, "OK")
 
-    authorizer = event.get("requestContext", {}).get("authorizer", {})
-    claims = authorizer.get("claims") or authorizer.get("jwt", {}).get("claims")
+    claims = get_claims(event)
     if not claims or "sub" not in claims:
-        return cors_response(401, {"error": "No auth claims"})
+        return _cors(401, {"error": "No auth claims"})
 
     user_id = claims["sub"]
 
     try:
-        body = json.loads(event.get("body", "{}"))
+        body = parse_body(event)
         recipe_id = body.get("RecipeId")
 
         if not recipe_id:
-            return cors_response(400, {"error": "Missing RecipeId"})
+            return _cors(400, {"error": "Missing RecipeId"})
 
-        # Store as a string set
-        fav_tbl.update_item(
-            Key={"UserID": user_id},
-            UpdateExpression="ADD RecipeIDs :r",
-            ExpressionAttributeValues={":r": {str(recipe_id)}}
-        )
+        # Set change + FavoriteCount move in one transaction; a no-op leaves both alone
+        stats.favorite_changed(user_id, recipe_id, added=True)
 
-        return cors_response(200, {"message": f"Recipe {recipe_id} added to favorites."})
+        return _cors(200, {"message": f"Recipe {recipe_id} added to favorites."})
 
+    except ClientError as e:
+        # the transaction stayed contended (or throttled) through its retries
+        print("Add error:", e)
+        return _cors(503, {"error": "Could not update favorites; please retry"})
     except Exception as e:
         print("Add error:", e)
-        return cors_response(500, {"error": "Internal error"})
-
-def cors_response(status, body):
-    return {
-        "statusCode": status,
-        "headers": {
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Methods": "OPTIONS,GET,POST,DELETE",
-            "Access-Control-Allow-Headers": "Content-Type,Authorization"
-        },
-        "body": json.dumps(body)
-    }
+        return _cors(500, {"error": "Internal error"})
+
+def _cors(status, body):
+    return cors_response(status, body, methods="OPTIONS,GET,POST,DELETE")
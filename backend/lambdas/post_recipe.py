@@ -1,69 +1,122 @@
 import os
 import json
 import time
-import boto3
+import threading
 from botocore.exceptions import ClientError
+from cookify import aws, json_response, parse_body, recipes
 
-dynamodb = boto3.resource('dynamodb')
 TABLE_NAME = os.environ.get('RECIPES_TABLE','Recipes')
-table      = dynamodb.Table(TABLE_NAME)
+
+# Atomic Id counter: one item {'Name': 'RecipeId', 'Value': <last issued id>}
+COUNTERS_TABLE = os.environ.get('COUNTERS_TABLE', 'Counters')
+COUNTER_NAME   = 'RecipeId'
+ID_BLOCK_SIZE  = int(os.environ.get('ID_BLOCK_SIZE', '1'))   # >1 leases a range per container
+
+# New recipes are dropped here for search_recipes until the next index build
+SEARCH_BUCKET       = os.environ.get('SEARCH_BUCKET')
+SEARCH_DELTA_PREFIX = os.environ.get('SEARCH_DELTA_PREFIX', 'search/delta/')
 
 MAX_RETRIES = 5
 
+# Ids leased by this container but not handed out yet (survives warm starts)
+_id_block = {'next': 1, 'end': 0}
+_id_lock  = threading.Lock()
+
+def reserve_ids(count):
+    """Atomically bump the counter by `count`; returns the (first, last) Ids reserved."""
+    resp = aws.table(COUNTERS_TABLE).update_item(
+        Key={'Name': COUNTER_NAME},
+        UpdateExpression='ADD #v :n',
+        ExpressionAttributeNames={'#v': 'Value'},
+        ExpressionAttributeValues={':n': count},
+        ReturnValues='UPDATED_NEW'
+    )
+    last = int(resp['Attributes']['Value'])
+    return last - count + 1, last
+
+def next_recipe_id():
+    """Return the next free Id as a numeric string, leasing a new block when needed."""
+    with _id_lock:
+        if _id_block['next'] > _id_block['end']:
+            _id_block['next'], _id_block['end'] = reserve_ids(ID_BLOCK_SIZE)
+        new_id = _id_block['next']
+        _id_block['next'] += 1
+    return str(new_id)
+
+def queue_for_search(item):
+    """Best effort: a failed delta only delays the recipe until the next full build."""
+    if not SEARCH_BUCKET:
+        return
+    try:
+        aws.client('s3').put_object(
+            Bucket=SEARCH_BUCKET,
+            Key=f"{SEARCH_DELTA_PREFIX}{item['Id']}.json",
+            Body=json.dumps({k: item[k] for k in ('Id', 'Title', 'Summery', 'InstructionsText')}),
+            ContentType='application/json'
+        )
+    except ClientError as e:
+        print("Search delta write failed:", e)
+
+def build_item(data, new_id, created_at):
+    """Recipes item for a validated request body (also used by scripts/import_recipes.py)."""
+    item = {
+        'Id': new_id,
+        'CategoryId': data.get('CategoryId',''),
+        'Couisine': data.get('Couisine',''),
+        'CreatedByUserId': data['CreatedByUserId'],
+        'GlutenFree': data.get('GlutenFree','NULL'),
+        'ImageUrl': data.get('ImageUrl',''),
+        'InstructionsText': data['InstructionsText'],
+        'Publisher': data.get('Publisher',''),
+        'SourceUrl': data.get('SourceUrl',''),
+        'Summery': data.get('Summery',''),
+        'Snippet': recipes.make_snippet(data.get('Summery') or data['InstructionsText']),
+        'Title': data['Title'],
+        'Vegan': data.get('Vegan','NULL'),
+        'Vegetarian': data.get('Vegetarian','NULL'),
+        'CreatedAt': created_at,
+        'UpdatedAt': created_at,   # version checked by cookify.cache
+    }
+    # GSI key attributes cannot be empty strings; leave them out instead
+    for index_key in ('CategoryId', 'Couisine'):
+        if not item[index_key]:
+            del item[index_key]
+    # sparse copies that key recipe_paginate's diet indexes
+    for flag in recipes.DIET_FLAGS:
+        if item[flag] in recipes.TRUE_VALUES:
+            item[f'Is{flag}'] = '1'
+    return item
+
 def lambda_handler(event, context):
     # parse request
-    data = json.loads(event.get('body') or '{}')
+    data = parse_body(event)
     for f in ('Title','InstructionsText','CreatedByUserId'):
         if not data.get(f):
-            return {'statusCode':400,'body':json.dumps({'message':f'Missing {f}'})}
+            return json_response(400, {'message': f'Missing {f}'})
 
     for attempt in range(MAX_RETRIES):
-        # 1) find current max id
-        scan = table.scan(ProjectionExpression='Id')
-        ids = [int(item['Id']) for item in scan.get('Items',[]) if item['Id'].isdigit()]
-        max_id = max(ids) if ids else 0
-        new_id = str(max_id + 1)
+        # 1) take the next id from the atomic counter (O(1), no table scan)
+        new_id = next_recipe_id()
 
         # 2) build recipe
-        item = {
-            'Id': new_id,
-            'CategoryId': data.get('CategoryId',''),
-            'Couisine': data.get('Couisine',''),
-            'CreatedByUserId': data['CreatedByUserId'],
-            'GlutenFree': data.get('GlutenFree','NULL'),
-            'ImageUrl': data.get('ImageUrl',''),
-            'InstructionsText': data['InstructionsText'],
-            'Publisher': data.get('Publisher',''),
-            'SourceUrl': data.get('SourceUrl',''),
-            'Summery': data.get('Summery',''),
-            'Title': data['Title'],
-            'Vegan': data.get('Vegan','NULL'),
-            'Vegetarian': data.get('Vegetarian','NULL'),
-            'CreatedAt': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
-        }
+        item = build_item(data, new_id, time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()))
 
         # 3) attempt conditional write
         try:
-            table.put_item(
+            aws.table(TABLE_NAME).put_item(
                 Item=item,
                 ConditionExpression='attribute_not_exists(Id)'
             )
             # success!
-            return {
-                'statusCode': 201,
-                'headers': {'Content-Type':'application/json'},
-                'body': json.dumps(item)
-            }
+            queue_for_search(item)
+            return json_response(201, item)
         except ClientError as e:
             if e.response['Error']['Code']=='ConditionalCheckFailedException':
-                # someone else took that Id—retry
+                # Id already used (counter not seeded past it)—take the next one
                 continue
             else:
                 # other error
                 raise
 
     # if we get here, too many retries
-    return {
-      'statusCode': 500,
-      'body': json.dumps({'message':'Could not allocate new Id; please retry'})  
-    }
+    return json_response(500, {'message': 'Could not allocate new Id; please retry'})
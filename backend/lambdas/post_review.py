@@ -1,24 +1,38 @@
-import json, os, boto3, datetime
+import os, datetime
 from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
+from cookify import aws, cors_response, get_claims, is_preflight, parse_body, stats
 
-TABLE = boto3.resource("dynamodb").Table("Reviews")
+REVIEWS_TABLE = "Reviews"
+# RecipeId/UserId GSI (KEYS_ONLY): finds the review a repeated POST collided with
+USER_INDEX = os.environ.get("REVIEW_USER_INDEX", "RecipeId-UserId-index")
+
+def existing_review(recipe_id, user_id):
+    """The user's review of the recipe, or None."""
+    table = aws.table(REVIEWS_TABLE)
+    keys = table.query(
+        IndexName=USER_INDEX,
+        KeyConditionExpression=Key("RecipeId").eq(recipe_id) & Key("UserId").eq(user_id),
+        Limit=1,
+    ).get("Items")
+    if not keys:
+        return None
+    return table.get_item(Key={"RecipeId": recipe_id, "CreatedAt": keys[0]["CreatedAt"]}).get("Item")
 
 def lambda_handler(event, _):
     # ---------- CORS pre-flight ----------
-    if event.get("httpMethod") == "OPTIONS":
+    if is_preflight(event):
         return _cors(200, "OK")
 
     # ---------- auth ----------
-    claims = (event.get("requestContext", {})
-                    .get("authorizer", {})
-                    .get("claims", {}))      # HTTP API
+    claims = get_claims(event)
     if not claims or "sub" not in claims:
         return _cors(401, {"error": "Unauthenticated"})
 
     user_id   = claims["sub"]
     username  = claims.get("cognito:username") or claims.get("username")
     recipe_id = event["pathParameters"]["recipeId"]
-    body      = json.loads(event["body"] or "{}")
+    body      = parse_body(event)
     text      = body.get("ReviewText")
 
     if not text:
@@ -33,18 +47,21 @@ def lambda_handler(event, _):
         "Username": username,
         "ReviewText": text,
     }
-    TABLE.put_item(Item=item)
+    # Put + ReviewCount bump in one transaction, guarded on (recipe, user):
+    # a second POST by the same user moves nothing
+    try:
+        if stats.review_posted(item):
+            return _cors(201, item)
+        previous = existing_review(recipe_id, user_id)
+    except ClientError as e:
+        print("Review write failed:", e)
+        return _cors(503, {"error": "Could not save the review; please retry"})
 
-    return _cors(201, item)
+    # a retried request (same text) gets the review it already created
+    if previous and previous.get("ReviewText") == text:
+        return _cors(200, previous)
+    return _cors(409, {"error": "Review already exists; edit it instead"})
 
 # ----------------------------------------
 def _cors(code, body):
-    return {
-        "statusCode": code,
-        "headers": {
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Headers": "Content-Type,Authorization",
-            "Access-Control-Allow-Methods": "GET,POST,OPTIONS",
-        },
-        "body": json.dumps(body),
-    }
+    return cors_response(code, body, methods="GET,POST,OPTIONS")
@@ -1,42 +1,28 @@
-import boto3
 import json
+from cookify import aws, cors_response, get_claims, is_preflight
 
-dynamodb = boto3.resource('dynamodb')
-table = dynamodb.Table('Users')  # Make sure this is your table name
+USERS_TABLE = 'Users'  # Make sure this is your table name
 
 def lambda_handler(event, context):
     print("Received event:", event)
 
     # Handle CORS preflight request
-    if event.get("httpMethod") == "OPTIONS":
-        return {
-            "statusCode": 200,
-            "headers": {
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Methods": "OPTIONS,POST",
-                "Access-Control-Allow-Headers": "Content-Type,Authorization"
-            },
-            "body": json.dumps("CORS preflight OK")
-        }
+    if is_preflight(event):
+        return _cors(200, "CORS preflight OK")
 
     try:
-        claims = event["requestContext"]["authorizer"]["claims"]
+        claims = get_claims(event)
         user_id = claims["sub"]
         email = claims.get("email", "")
         user_name = claims.get("cognito:username", "")
 
+        table = aws.table(USERS_TABLE)
         print(f"Checking for user ID: {user_id}")
         response = table.get_item(Key={"UserID": user_id})
         print("DynamoDB get_item response:", response)
 
         if response.get("Item"):
-            return {
-                "statusCode": 200,
-                "headers": {
-                    "Access-Control-Allow-Origin": "*"
-                },
-                "body": json.dumps(f"User {user_id} already exists.")
-            }
+            return _cors(200, f"User {user_id} already exists.")
 
         table.put_item(Item={
             "UserID": user_id,
@@ -45,20 +31,11 @@ def lambda_handler(event, context):
         })
 
         print(f"User {user_id} added to Users table.")
-        return {
-            "statusCode": 201,
-            "headers": {
-                "Access-Control-Allow-Origin": "*"
-            },
-            "body": json.dumps(f"User {user_id} created successfully.")
-        }
+        return _cors(201, f"User {user_id} created successfully.")
 
     except Exception as e:
         print("Error occurred:", str(e))
-        return {
-            "statusCode": 500,
-            "headers": {
-                "Access-Control-Allow-Origin": "*"
-            },
-            "body": json.dumps("Internal server error")
-        }
+        return _cors(500, "Internal server error")
+
+def _cors(status, body):
+    return cors_response(status, body, methods="OPTIONS,POST")
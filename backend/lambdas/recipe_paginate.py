@@ -1,63 +1,132 @@
 import os
-import json
-import base64
-import boto3
-from boto3.dynamodb.conditions import Key  # not used now, but handy for queries
+from boto3.dynamodb.conditions import Key, Attr
+from cookify import aws, cors_response, is_preflight, encode_key, decode_key, stats
+from cookify.recipes import CARD_FIELDS, DIET_FLAGS, DIET_INDEXES, TRUE_VALUES
 
-dynamodb = boto3.resource("dynamodb")
-table     = dynamodb.Table("Recipes")
+RECIPES_TABLE = os.environ.get("RECIPES_TABLE", "Recipes")
+
+# GSIs used for filtered browsing (hash key only, projection ALL); created by
+# scripts/add_browse_indexes.py
+CATEGORY_INDEX = os.environ.get("CATEGORY_INDEX", "CategoryId-index")
+CUISINE_INDEX  = os.environ.get("CUISINE_INDEX", "Couisine-index")
+FILTER_READ_AHEAD = 100   # items evaluated per round trip when a filter is set
+MAX_READ_ROUNDS   = 5     # then return a short page and its cursor
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE     = 100
+
+# Public catalog pages: shared caches may serve them briefly, then revalidate by ETag
+CACHE_CONTROL = os.environ.get("RECIPES_CACHE_CONTROL",
+                               "public, max-age=60, stale-while-revalidate=300")
 
 # ---------- helpers ----------------------------------------------------------
-def cors_response(code: int, body):
-    """Return a response with CORS headers."""
-    return {
-        "statusCode": code,
-        "headers": {
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Methods": "GET,OPTIONS",
-            "Access-Control-Allow-Headers": "Content-Type,Authorization",
-        },
-        "body": json.dumps(body),
-    }
+def build_request(qs: dict):
+    """Pick the cheapest access path for the filters; returns (method, kwargs, key attrs)."""
+    table    = aws.table(RECIPES_TABLE)
+    category = qs.get("category")
+    cuisine  = qs.get("cuisine")
+    diets    = [f for f in DIET_FLAGS if qs.get(f.lower()) in ("1", "true")]
+    filters  = []
 
-def encode_key(key: dict | None) -> str | None:
-    """Base64-encode the LastEvaluatedKey so it’s safe in a URL."""
-    if key is None:
-        return None
-    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+    if category:
+        method = table.query
+        kwargs = {
+            "IndexName": CATEGORY_INDEX,
+            "KeyConditionExpression": Key("CategoryId").eq(category),
+        }
+        key_attrs = ("Id", "CategoryId")
+        if cuisine:
+            filters.append(Attr("Couisine").eq(cuisine))
+    elif cuisine:
+        method = table.query
+        kwargs = {
+            "IndexName": CUISINE_INDEX,
+            "KeyConditionExpression": Key("Couisine").eq(cuisine),
+        }
+        key_attrs = ("Id", "Couisine")
+    elif diets:
+        flag   = diets.pop(0)
+        method = table.query
+        kwargs = {
+            "IndexName": DIET_INDEXES[flag],
+            "KeyConditionExpression": Key(f"Is{flag}").eq("1"),
+        }
+        key_attrs = ("Id", f"Is{flag}")
+    else:
+        method    = table.scan
+        kwargs    = {}
+        key_attrs = ("Id",)
 
-def decode_key(token: str | None) -> dict | None:
-    """Decode the key sent back by the client; returns None if empty/invalid."""
-    if not token:
-        return None
-    try:
-        raw = base64.urlsafe_b64decode(token.encode()).decode()
-        return json.loads(raw)
-    except Exception:
-        # Don’t break the function if the token is malformed
-        return None
+    for flag in diets:
+        filters.append(Attr(flag).is_in(list(TRUE_VALUES)))
+
+    if filters:
+        expr = filters[0]
+        for f in filters[1:]:
+            expr = expr & f
+        kwargs["FilterExpression"] = expr
+
+    if qs.get("fields") == "card":
+        # the index key too: a short page's cursor is rebuilt from its last item
+        fields = list(dict.fromkeys(CARD_FIELDS + key_attrs))
+        kwargs["ProjectionExpression"]     = ", ".join(f"#{f}" for f in fields)
+        kwargs["ExpressionAttributeNames"] = {f"#{f}": f for f in fields}
+
+    return method, kwargs, key_attrs
+
+def fetch_page(qs: dict, page_size: int, last_key_in: dict | None):
+    """
+    Keep reading until page_size matches are collected, the data runs out or
+    MAX_READ_ROUNDS reads were spent (a short page with a cursor: sparse
+    filters cost at most that many reads per request).
+    If the last read returned more matches than fit, the cursor is rebuilt from
+    the last item returned, so the next page starts exactly after it.
+    """
+    method, kwargs, key_attrs = build_request(qs)
+    if last_key_in:
+        kwargs["ExclusiveStartKey"] = last_key_in
+
+    kwargs["Limit"] = page_size
+    if "FilterExpression" in kwargs:
+        kwargs["Limit"] = max(page_size, FILTER_READ_AHEAD)
+
+    items = []
+    for _ in range(MAX_READ_ROUNDS):
+        response = method(**kwargs)
+        batch    = response.get("Items", [])
+        last_key = response.get("LastEvaluatedKey")
+
+        room = page_size - len(items)
+        if len(batch) > room:
+            items.extend(batch[:room])
+            return items, {a: items[-1][a] for a in key_attrs}
+        items.extend(batch)
+        if not last_key or len(items) == page_size:
+            return items, last_key
+        kwargs["ExclusiveStartKey"] = last_key
+    return items, last_key
 
 # ---------- Lambda handler ---------------------------------------------------
 def lambda_handler(event, context):
     # 1) Handle pre-flight CORS
-    if event.get("httpMethod") == "OPTIONS":
+    if is_preflight(event):
         return cors_response(200, "")
 
     # 2) Parse query parameters
     qs          = event.get("queryStringParameters") or {}
     last_key_in = decode_key(qs.get("lastKey"))
-    page_size   = int(qs.get("pageSize", 10))           # default 20 items/page
+    try:
+        page_size = max(1, min(int(qs.get("pageSize") or DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE))
+    except ValueError:
+        return cors_response(400, {"error": "pageSize must be an integer"})
 
-    # 3) Scan (or Query) with pagination
-    scan_kwargs = {
-        "Limit": page_size,
-    }
-    if last_key_in:
-        scan_kwargs["ExclusiveStartKey"] = last_key_in
+    # 3) Scan, or Query an index when filtering by category / cuisine / a diet
+    #    flag; further ?vegan=1&vegetarian=1&glutenfree=1 narrow the result
+    items, last_key = fetch_page(qs, page_size, last_key_in)
+    last_key_out    = encode_key(last_key)
 
-    response     = table.scan(**scan_kwargs)            # use .query() if PK/LSI
-    items        = response.get("Items", [])
-    last_key_out = encode_key(response.get("LastEvaluatedKey"))
+    # ?stats=1 -> review/favorite counts per card, one batch read per 100
+    if qs.get("stats") == "1":
+        stats.join_stats(items)
 
     # 4) Build payload expected by the front end
     payload = {
@@ -65,4 +134,4 @@ def lambda_handler(event, context):
         "lastKey": last_key_out,    # null when no more pages
     }
 
-    return cors_response(200, payload)
+    return cors_response(200, payload, event=event, cache_control=CACHE_CONTROL)
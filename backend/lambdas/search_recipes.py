@@ -0,0 +1,296 @@
+import os
+import re
+import json
+import math
+import mmap
+import time
+import html
+import heapq
+import struct
+from array import array
+from collections import Counter, defaultdict
+from cookify import aws, cors_response, is_preflight
+
+# Full-text recipe search over a prebuilt inverted index (BM25).
+#
+# Index file layout (built by scripts/build_search_index.py):
+#   b"RIDX" | uint32 header length | header JSON | postings
+# header  = {"docs": [[Id, Title], ...], "doclen": [...], "avgdl": float,
+#            "terms": {term: [offset, df]}}
+# postings = flat native uint32 pairs (doc index, term frequency); a term's postings
+#            start at pair `offset` and hold `df` pairs.
+#
+# Recipes posted after the last build are picked up from small JSON "delta"
+# objects that post_recipe drops under SEARCH_DELTA_PREFIX. An incremental
+# build merges them into a new index and then deletes them, so each delta
+# refresh also checks the index object's ETag and reloads it when it changed.
+
+SEARCH_BUCKET       = os.environ.get("SEARCH_BUCKET")
+SEARCH_INDEX_KEY    = os.environ.get("SEARCH_INDEX_KEY", "search/recipes.idx")
+SEARCH_DELTA_PREFIX = os.environ.get("SEARCH_DELTA_PREFIX", "search/delta/")
+LOCAL_INDEX_PATH    = os.environ.get("SEARCH_INDEX_PATH", "/tmp/recipes.idx")
+DELTA_REFRESH_SECONDS = int(os.environ.get("DELTA_REFRESH_SECONDS", "60"))
+
+MAGIC        = b"RIDX"
+TITLE_WEIGHT = 3          # title tokens count this many times (cheap BM25F)
+K1, B        = 1.2, 0.75
+MAX_LIMIT    = 50
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from in into is it of on or that the then this
+to with your you add cup cups tbsp tsp minutes minute until
+""".split())
+
+# ---------- text -------------------------------------------------------------
+def tokenize(text):
+    """HTML-stripped, lower-cased alphanumeric tokens with a light plural strip."""
+    plain = html.unescape(re.sub(r"<[^>]+>", " ", text or "")).lower()
+    tokens = []
+    for tok in re.findall(r"[a-z0-9]+", plain):
+        if len(tok) < 2 or tok in STOPWORDS:
+            continue
+        if len(tok) > 3 and tok.endswith("s") and not tok.endswith("ss"):
+            tok = tok[:-1]
+        tokens.append(tok)
+    return tokens
+
+def document_terms(recipe):
+    """Term frequencies for one recipe item (Title, Summery, InstructionsText)."""
+    tf = Counter(tokenize(recipe.get("Title")) * TITLE_WEIGHT)
+    tf.update(tokenize(recipe.get("Summery")))
+    tf.update(tokenize(recipe.get("InstructionsText")))
+    return tf
+
+# ---------- index file -------------------------------------------------------
+def write_index(docs, path):
+    """
+    docs: iterable of (Id, Title, term-frequency Counter).
+    Writes the binary index to `path`; returns the number of documents.
+    """
+    doc_meta, doclen = [], []
+    postings = defaultdict(list)
+    for doc_idx, (rid, title, tf) in enumerate(docs):
+        doc_meta.append([rid, title])
+        doclen.append(sum(tf.values()))
+        for term, count in tf.items():
+            postings[term].append((doc_idx, count))
+
+    terms, flat, offset = {}, array("I"), 0
+    for term in sorted(postings):
+        plist = postings[term]
+        terms[term] = [offset, len(plist)]
+        for doc_idx, count in plist:
+            flat.append(doc_idx)
+            flat.append(count)
+        offset += len(plist)
+
+    header = json.dumps({
+        "docs": doc_meta,
+        "doclen": doclen,
+        "avgdl": (sum(doclen) / len(doclen)) if doclen else 0.0,
+        "terms": terms,
+    }, separators=(",", ":")).encode()
+
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        f.write(flat.tobytes())
+    return len(doc_meta)
+
+
+class SearchIndex:
+    """Read-only view over an index file; postings stay in the page cache via mmap."""
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._mm   = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:4] != MAGIC:
+            raise ValueError(f"{path} is not a recipe search index")
+        (header_len,) = struct.unpack_from("<I", self._mm, 4)
+        header = json.loads(self._mm[8:8 + header_len])
+        self.docs   = header["docs"]
+        self.doclen = header["doclen"]
+        self.avgdl  = header["avgdl"]
+        self.terms  = header["terms"]
+        self.total_len = sum(self.doclen)
+        self._postings = memoryview(self._mm)[8 + header_len:].cast("I")
+
+    def __len__(self):
+        return len(self.docs)
+
+    def close(self):
+        self._postings.release()
+        self._mm.close()
+        self._file.close()
+
+    def df(self, term):
+        entry = self.terms.get(term)
+        return entry[1] if entry else 0
+
+    def postings(self, term):
+        """Yield (doc index, tf) for a term."""
+        entry = self.terms.get(term)
+        if not entry:
+            return
+        offset, count = entry
+        view = self._postings[offset * 2:(offset + count) * 2]
+        for i in range(0, len(view), 2):
+            yield view[i], view[i + 1]
+
+
+class DeltaIndex:
+    """Small in-memory index for recipes posted since the last build."""
+    def __init__(self, recipes=()):
+        self.docs, self.doclen, self._tf = [], [], []
+        self.total_len = 0
+        self._df = Counter()
+        for recipe in recipes:
+            self.add(recipe)
+
+    def __len__(self):
+        return len(self.docs)
+
+    def add(self, recipe):
+        tf = document_terms(recipe)
+        self.docs.append([str(recipe["Id"]), recipe.get("Title", "")])
+        self.doclen.append(sum(tf.values()))
+        self.total_len += self.doclen[-1]
+        self._tf.append(tf)
+        self._df.update(tf.keys())
+
+    def df(self, term):
+        return self._df.get(term, 0)
+
+    def postings(self, term):
+        for doc_idx, tf in enumerate(self._tf):
+            if term in tf:
+                yield doc_idx, tf[term]
+
+# ---------- lazy, per-container state ----------------------------------------
+_state = {
+    "base": None,
+    "base_ids": set(),
+    "base_etag": None,           # of the S3 object the open index came from
+    "delta": DeltaIndex(),
+    "delta_docs": {},            # S3 key -> recipe, so refreshes only fetch new objects
+    "delta_loaded_at": None,
+}
+
+def fetch_base_index():
+    """Download the index object to LOCAL_INDEX_PATH and open it in place of the old one."""
+    resp = aws.client("s3").get_object(Bucket=SEARCH_BUCKET, Key=SEARCH_INDEX_KEY)
+    part = LOCAL_INDEX_PATH + ".part"
+    with open(part, "wb") as f:
+        for chunk in resp["Body"].iter_chunks(1 << 20):
+            f.write(chunk)
+    os.replace(part, LOCAL_INDEX_PATH)    # the old mapping stays valid until closed
+
+    old = _state["base"]
+    _state["base"] = SearchIndex(LOCAL_INDEX_PATH)
+    _state["base_ids"] = {doc[0] for doc in _state["base"].docs}
+    _state["base_etag"] = resp["ETag"]
+    if old is not None:
+        old.close()
+    return _state["base"]
+
+def load_base_index():
+    """Open the index once per container (from S3, or a local file when no bucket is set)."""
+    if _state["base"] is None:
+        if SEARCH_BUCKET:
+            return fetch_base_index()
+        _state["base"] = SearchIndex(LOCAL_INDEX_PATH)
+        _state["base_ids"] = {doc[0] for doc in _state["base"].docs}
+    return _state["base"]
+
+def load_delta_index():
+    """
+    Re-read pending delta objects at most every DELTA_REFRESH_SECONDS; a
+    rebuilt base index is swapped in first, so deltas merged into it (and
+    deleted) are not lost.
+    """
+    base = load_base_index()
+    now = time.monotonic()
+    loaded_at = _state["delta_loaded_at"]
+    if not SEARCH_BUCKET or (loaded_at is not None and now - loaded_at < DELTA_REFRESH_SECONDS):
+        return _state["delta"]
+
+    s3 = aws.client("s3")
+    etag = s3.head_object(Bucket=SEARCH_BUCKET, Key=SEARCH_INDEX_KEY)["ETag"]
+    if etag != _state["base_etag"]:
+        base = fetch_base_index()
+        print(f"Search index reloaded: {len(base)} recipes")
+
+    cached, pending = _state["delta_docs"], {}
+    kwargs = {"Bucket": SEARCH_BUCKET, "Prefix": SEARCH_DELTA_PREFIX}
+    while True:
+        resp = s3.list_objects_v2(**kwargs)
+        for obj in resp.get("Contents", []):
+            key = obj["Key"]
+            if key not in cached:
+                body = s3.get_object(Bucket=SEARCH_BUCKET, Key=key)["Body"].read()
+                cached[key] = json.loads(body)
+            pending[key] = cached[key]
+        if not resp.get("IsTruncated"):
+            break
+        kwargs["ContinuationToken"] = resp["NextContinuationToken"]
+
+    # objects merged into the base by the indexer disappear from the listing
+    _state["delta_docs"] = pending
+    _state["delta"] = DeltaIndex(
+        r for r in pending.values() if str(r["Id"]) not in _state["base_ids"]
+    )
+    _state["delta_loaded_at"] = now
+    return _state["delta"]
+
+# ---------- ranking ------------------------------------------------------------
+def search(indexes, query, limit):
+    """BM25 over one or more indexes sharing corpus statistics; best first."""
+    terms = set(tokenize(query))
+    n_docs = sum(len(ix) for ix in indexes)
+    if not terms or not n_docs:
+        return []
+    avgdl = sum(ix.total_len for ix in indexes) / n_docs or 1.0
+
+    scores = {}
+    for term in terms:
+        df = sum(ix.df(term) for ix in indexes)
+        if not df:
+            continue
+        idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+        for ix_no, ix in enumerate(indexes):
+            for doc_idx, tf in ix.postings(term):
+                norm = K1 * (1 - B + B * ix.doclen[doc_idx] / avgdl)
+                key  = (ix_no, doc_idx)
+                scores[key] = scores.get(key, 0.0) + idf * tf * (K1 + 1) / (tf + norm)
+
+    best = heapq.nlargest(limit, scores.items(), key=lambda kv: kv[1])
+    return [
+        {"Id": indexes[ix_no].docs[doc_idx][0],
+         "Title": indexes[ix_no].docs[doc_idx][1],
+         "score": round(score, 4)}
+        for (ix_no, doc_idx), score in best
+    ]
+
+# ---------- Lambda handler ---------------------------------------------------
+def lambda_handler(event, context):
+    """GET /Recipes/search?q=garlic+butter&limit=20  ->  {"items": [...]}"""
+    if is_preflight(event):
+        return cors_response(200, "")
+
+    qs    = event.get("queryStringParameters") or {}
+    query = (qs.get("q") or "").strip()
+    if not query:
+        return cors_response(400, {"error": "Missing q"})
+    try:
+        limit = max(1, min(int(qs.get("limit") or 20), MAX_LIMIT))
+    except ValueError:
+        return cors_response(400, {"error": "limit must be an integer"})
+
+    try:
+        delta = load_delta_index()      # swaps in a rebuilt base first
+        base  = load_base_index()
+    except Exception as e:
+        print("Search index load failed:", e)
+        return cors_response(503, {"error": "Search index unavailable"})
+
+    return cors_response(200, {"items": search([base, delta], query, limit)})
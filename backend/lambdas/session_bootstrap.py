@@ -0,0 +1,92 @@
+import os
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from botocore.exceptions import ClientError
+from boto3.dynamodb.types import TypeDeserializer
+from cookify import aws, cors_response, get_claims, is_preflight, encode_key, recipes
+
+USERS_TABLE       = os.environ.get("USERS_TABLE", "Users")
+deserializer      = TypeDeserializer()
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE     = 100
+
+def upsert_user(claims):
+    """Create the Users row on first login; one conditional put, no prior read."""
+    item = {
+        "UserID": claims["sub"],
+        "email": claims.get("email", ""),
+        "user_name": claims.get("cognito:username") or claims.get("username", ""),
+    }
+    try:
+        aws.table(USERS_TABLE).put_item(
+            Item=item,
+            ConditionExpression="attribute_not_exists(UserID)",
+            ReturnValuesOnConditionCheckFailure="ALL_OLD",
+        )
+        return item, True
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+            raise
+        # the existing row comes back with the failed condition
+        old = e.response.get("Item")
+        if old:
+            item = {k: deserializer.deserialize(v) for k, v in old.items()}
+        return item, False
+
+def favorites(user_id, view):
+    ids = recipes.favorite_ids(user_id)
+    return {"ids": ids, "items": recipes.fetch_recipes(ids, view)}
+
+def my_recipes(user_id, page_size, view):
+    items, last_key = recipes.recipes_by_user(user_id, page_size=page_size, view=view)
+    return {"items": items, "lastKey": encode_key(last_key)}
+
+def lambda_handler(event, context):
+    """
+    POST /Session -> everything the app needs after login, in one round trip:
+        {"user": {...}, "created": bool,
+         "favorites": {"ids": [...], "items": [...]},
+         "myRecipes": {"items": [...], "lastKey": cursor | null}}
+    ?fields=all returns whole recipes instead of cards; ?pageSize= sizes myRecipes.
+    """
+    if is_preflight(event):
+        return _cors(200, "OK")
+
+    claims = get_claims(event)
+    if not claims or "sub" not in claims:
+        return _cors(401, {"error": "Unauthenticated"})
+
+    user_id   = claims["sub"]
+    qs        = event.get("queryStringParameters") or {}
+    view      = "full" if qs.get("fields") == "all" else "card"
+    try:
+        page_size = max(1, min(int(qs.get("pageSize") or DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE))
+    except ValueError:
+        return _cors(400, {"error": "pageSize must be an integer"})
+
+    # The three reads/writes are independent: run them side by side
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        user_f = pool.submit(upsert_user, claims)
+        favs_f = pool.submit(favorites, user_id, view)
+        mine_f = pool.submit(my_recipes, user_id, page_size, view)
+
+    try:
+        user, created = user_f.result()
+    except Exception:
+        traceback.print_exc()
+        return _cors(500, {"error": "Could not register user"})
+
+    payload = {"user": user, "created": created}
+    for name, future in (("favorites", favs_f), ("myRecipes", mine_f)):
+        try:
+            payload[name] = future.result()
+        except Exception:
+            # a failed section is null; the client falls back to its own endpoint
+            traceback.print_exc()
+            payload[name] = None
+
+    return _cors(200, payload, event)
+
+def _cors(status, body, event=None):
+    return cors_response(status, body, methods="OPTIONS,POST", event=event,
+                         headers={"Cache-Control": "no-store"})
@@ -0,0 +1,12 @@
+from cookify import trending
+
+def lambda_handler(event, context):
+    """
+    DynamoDB Streams consumer for Favorites (NEW_AND_OLD_IMAGES) and Reviews
+    (NEW_IMAGE): folds each batch into the recipes' decayed trends and
+    republishes the trending board. A failure fails the whole batch so the stream retries it.
+    """
+    records = event.get("Records", [])
+    trends  = trending.process_records(records)
+    print(f"Trending: {len(records)} records -> {len(trends)} recipes updated")
+    return {"updated": len(trends)}
@@ -1,9 +1,13 @@
 # file: update_review.py
-import json, os, boto3, datetime
+import os, datetime
 from boto3.dynamodb.conditions import Key, Attr
 from botocore.exceptions import ClientError
+from cookify import aws, cors_response, get_claims, parse_body, stats
 
-TABLE = boto3.resource("dynamodb").Table("Reviews")
+REVIEWS_TABLE = "Reviews"
+# RecipeId/UserId GSI (KEYS_ONLY) -> the review's CreatedAt sort key in one read;
+# created by scripts/add_review_user_index.py
+USER_INDEX = os.environ.get("REVIEW_USER_INDEX", "RecipeId-UserId-index")
 
 def lambda_handler(event, _):
     """Handle PUT /Recipes/{recipeId}/Review"""
@@ -14,11 +18,7 @@ def lambda_handler(event, _):
         return _cors(405, {"error": "Method not allowed"})
 
     # ---- Auth ----
-    claims = (
-        event.get("requestContext", {})
-             .get("authorizer", {})
-             .get("claims", {})
-    )
+    claims = get_claims(event)
     if not claims or "sub" not in claims:
         return _cors(401, {"error": "Unauthenticated"})
 
@@ -27,7 +27,7 @@ def lambda_handler(event, _):
 
     # ---- Path & body ----
     recipe_id = event["pathParameters"].get("recipeId")
-    body      = json.loads(event.get("body") or "{}")
+    body      = parse_body(event)
     new_text  = body.get("ReviewText", "").strip()
 
     if not new_text:
@@ -35,9 +35,9 @@ def lambda_handler(event, _):
 
     # ---- Locate existing review (one per user per recipe) ----
     try:
-        query = TABLE.query(
-            KeyConditionExpression=Key("RecipeId").eq(recipe_id),
-            FilterExpression=Attr("UserId").eq(user_id),
+        query = aws.table(REVIEWS_TABLE).query(
+            IndexName=USER_INDEX,
+            KeyConditionExpression=Key("RecipeId").eq(recipe_id) & Key("UserId").eq(user_id),
             Limit=1,                      # there should be at most one
         )
     except ClientError as err:
@@ -56,7 +56,7 @@ def lambda_handler(event, _):
                                 .isoformat(timespec="milliseconds") + "Z"
 
     try:
-        TABLE.update_item(
+        aws.table(REVIEWS_TABLE).update_item(
             Key={"RecipeId": recipe_id, "CreatedAt": created_at},
             UpdateExpression="SET ReviewText = :t, UpdatedAt = :u",
             ConditionExpression=Attr("UserId").eq(user_id),
@@ -73,6 +73,9 @@ def lambda_handler(event, _):
         print("Update failed:", err)
         return _cors(500, {"error": "Internal error"})
 
+    # Refresh the card snippet if this is the recipe's latest review
+    stats.set_latest_review(recipe_id, created_at, username, new_text, only_if_same=True)
+
     response_payload = {
         "RecipeId": recipe_id,
         "UserId":   user_id,
@@ -87,12 +90,4 @@ def lambda_handler(event, _):
 # ---------------------------------------------------------------------------
 def _cors(status: int, body):
     """Uniform response with CORS headers"""
-    return {
-        "statusCode": status,
-        "headers": {
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Headers": "Content-Type,Authorization",
-            "Access-Control-Allow-Methods": "GET,POST,PUT,OPTIONS",
-        },
-        "body": json.dumps(body),
-    }
+    return cors_response(status, body, methods="GET,POST,PUT,OPTIONS")
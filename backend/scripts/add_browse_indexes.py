@@ -0,0 +1,109 @@
+import os
+import sys
+import time
+import boto3
+
+# Migration for recipe_paginate's filtered browsing:
+#   1) drop empty-string CategoryId/Couisine (invalid as GSI keys) and give
+#      every recipe the sparse diet keys post_recipe writes (IsVegan = "1"
+#      only on vegan recipes, likewise IsVegetarian / IsGlutenFree)
+#   2) create the CategoryId, Couisine and Is<flag> GSIs that are missing,
+#      one at a time (DynamoDB builds one new index per update)
+# Safe to re-run.
+
+REGION        = os.environ.get("AWS_REGION", "us-east-1")
+RECIPES_TABLE = os.environ.get("RECIPES_TABLE", "Recipes")
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path[:0] = [BACKEND_DIR]
+from cookify.recipes import DIET_FLAGS, DIET_INDEXES, TRUE_VALUES  # noqa: E402
+
+INDEXES = {
+    os.environ.get("CATEGORY_INDEX", "CategoryId-index"): "CategoryId",
+    os.environ.get("CUISINE_INDEX", "Couisine-index"): "Couisine",
+    **{index: f"Is{flag}" for flag, index in DIET_INDEXES.items()},
+}
+
+client = boto3.client("dynamodb", region_name=REGION)
+table  = boto3.resource("dynamodb", region_name=REGION).Table(RECIPES_TABLE)
+
+def backfill_keys():
+    """Scan every page and bring each recipe's index keys in line with build_item."""
+    fields = ("Id", "CategoryId", "Couisine") + DIET_FLAGS + tuple(f"Is{f}" for f in DIET_FLAGS)
+    scan_kwargs = {
+        "ProjectionExpression": ", ".join(f"#{f}" for f in fields),
+        "ExpressionAttributeNames": {f"#{f}": f for f in fields},
+    }
+    updated = 0
+    while True:
+        resp = table.scan(**scan_kwargs)
+        for item in resp.get("Items", []):
+            sets, removes = [], []
+            for key in ("CategoryId", "Couisine"):
+                if key in item and item[key] == "":
+                    removes.append(key)
+            for flag in DIET_FLAGS:
+                want = item.get(flag) in TRUE_VALUES
+                has  = item.get(f"Is{flag}") == "1"
+                if want and not has:
+                    sets.append(f"Is{flag}")
+                elif has and not want:
+                    removes.append(f"Is{flag}")
+            if not sets and not removes:
+                continue
+            expr = []
+            if sets:
+                expr.append("SET " + ", ".join(f"#{a} = :one" for a in sets))
+            if removes:
+                expr.append("REMOVE " + ", ".join(f"#{a}" for a in removes))
+            kwargs = {
+                "Key": {"Id": item["Id"]},
+                "UpdateExpression": " ".join(expr),
+                "ExpressionAttributeNames": {f"#{a}": a for a in sets + removes},
+            }
+            if sets:
+                kwargs["ExpressionAttributeValues"] = {":one": "1"}
+            table.update_item(**kwargs)
+            updated += 1
+        if "LastEvaluatedKey" not in resp:
+            break
+        scan_kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+    print(f"✅ Updated index keys on {updated} recipes")
+
+def wait_active(index_name):
+    while True:
+        desc = client.describe_table(TableName=RECIPES_TABLE)["Table"]
+        status = next(i["IndexStatus"] for i in desc.get("GlobalSecondaryIndexes", [])
+                      if i["IndexName"] == index_name)
+        if status == "ACTIVE":
+            return
+        print(f"⏳ {index_name}: {status}")
+        time.sleep(15)
+
+def ensure_indexes():
+    for index_name, key in INDEXES.items():
+        desc = client.describe_table(TableName=RECIPES_TABLE)["Table"]
+        if any(i["IndexName"] == index_name for i in desc.get("GlobalSecondaryIndexes", [])):
+            print(f"ℹ️ Index {index_name} already exists")
+        else:
+            index = {
+                "IndexName": index_name,
+                "KeySchema": [{"AttributeName": key, "KeyType": "HASH"}],
+                "Projection": {"ProjectionType": "ALL"},
+            }
+            if desc.get("BillingModeSummary", {}).get("BillingMode") != "PAY_PER_REQUEST":
+                index["ProvisionedThroughput"] = {"ReadCapacityUnits": 5, "WriteCapacityUnits": 5}
+            client.update_table(
+                TableName=RECIPES_TABLE,
+                AttributeDefinitions=[{"AttributeName": key, "AttributeType": "S"}],
+                GlobalSecondaryIndexUpdates=[{"Create": index}],
+            )
+            print(f"🚀 Creating index {index_name}")
+        wait_active(index_name)
+
+def main():
+    backfill_keys()
+    ensure_indexes()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import os
+import time
+import boto3
+
+# Migration for update_review: add a RecipeId/UserId GSI to Reviews so a
+# user's review is found with one keyed query instead of filtering the whole
+# recipe partition. DynamoDB backfills the index from the existing rows; this
+# waits for that and reports reviews without a UserId (they are not indexed).
+# Safe to re-run.
+
+REGION        = os.environ.get("AWS_REGION", "us-east-1")
+REVIEWS_TABLE = os.environ.get("REVIEWS_TABLE", "Reviews")
+INDEX_NAME    = os.environ.get("REVIEW_USER_INDEX", "RecipeId-UserId-index")
+
+client = boto3.client("dynamodb", region_name=REGION)
+table  = boto3.resource("dynamodb", region_name=REGION).Table(REVIEWS_TABLE)
+
+def ensure_index():
+    desc = client.describe_table(TableName=REVIEWS_TABLE)["Table"]
+    if any(i["IndexName"] == INDEX_NAME for i in desc.get("GlobalSecondaryIndexes", [])):
+        print(f"ℹ️ Index {INDEX_NAME} already exists")
+    else:
+        index = {
+            "IndexName": INDEX_NAME,
+            "KeySchema": [
+                {"AttributeName": "RecipeId", "KeyType": "HASH"},
+                {"AttributeName": "UserId", "KeyType": "RANGE"},
+            ],
+            # the table key (RecipeId, CreatedAt) is all update_review needs
+            "Projection": {"ProjectionType": "KEYS_ONLY"},
+        }
+        if desc.get("BillingModeSummary", {}).get("BillingMode") != "PAY_PER_REQUEST":
+            index["ProvisionedThroughput"] = {"ReadCapacityUnits": 5, "WriteCapacityUnits": 5}
+        client.update_table(
+            TableName=REVIEWS_TABLE,
+            AttributeDefinitions=[
+                {"AttributeName": "RecipeId", "AttributeType": "S"},
+                {"AttributeName": "UserId", "AttributeType": "S"},
+            ],
+            GlobalSecondaryIndexUpdates=[{"Create": index}],
+        )
+        print(f"🚀 Creating index {INDEX_NAME}")
+
+    # wait until the index has finished backfilling
+    while True:
+        desc = client.describe_table(TableName=REVIEWS_TABLE)["Table"]
+        status = next(i["IndexStatus"] for i in desc.get("GlobalSecondaryIndexes", [])
+                      if i["IndexName"] == INDEX_NAME)
+        if status == "ACTIVE":
+            return
+        print(f"⏳ Index status: {status}")
+        time.sleep(15)
+
+def report_unindexed():
+    """Scan every page for reviews that cannot be found through the index."""
+    scan_kwargs = {"ProjectionExpression": "RecipeId, CreatedAt, UserId"}
+    missing = 0
+    while True:
+        resp = table.scan(**scan_kwargs)
+        for item in resp.get("Items", []):
+            if not item.get("UserId"):
+                missing += 1
+                print(f"⚠️ No UserId: RecipeId={item['RecipeId']} CreatedAt={item['CreatedAt']}")
+        if "LastEvaluatedKey" not in resp:
+            break
+        scan_kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+    print(f"✅ Index ready ({missing} reviews without UserId)")
+
+def main():
+    ensure_index()
+    report_unindexed()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import os
+import time
+import boto3
+
+# Migration for gey_my_recipes:
+#   1) add the CreatedByUserId/CreatedAt GSI to Recipes if it is missing
+#   2) give every authored recipe without CreatedAt a sortable placeholder,
+#      so it shows up in the (sparse) index
+# Safe to re-run.
+
+REGION        = os.environ.get("AWS_REGION", "us-east-1")
+RECIPES_TABLE = os.environ.get("RECIPES_TABLE", "Recipes")
+INDEX_NAME    = os.environ.get("MY_RECIPES_INDEX", "CreatedByUserId-CreatedAt-index")
+PLACEHOLDER_CREATED_AT = "1970-01-01T00:00:00Z"
+
+client = boto3.client("dynamodb", region_name=REGION)
+table  = boto3.resource("dynamodb", region_name=REGION).Table(RECIPES_TABLE)
+
+def ensure_index():
+    desc = client.describe_table(TableName=RECIPES_TABLE)["Table"]
+    if any(i["IndexName"] == INDEX_NAME for i in desc.get("GlobalSecondaryIndexes", [])):
+        print(f"ℹ️ Index {INDEX_NAME} already exists")
+    else:
+        index = {
+            "IndexName": INDEX_NAME,
+            "KeySchema": [
+                {"AttributeName": "CreatedByUserId", "KeyType": "HASH"},
+                {"AttributeName": "CreatedAt", "KeyType": "RANGE"},
+            ],
+            "Projection": {"ProjectionType": "ALL"},
+        }
+        if desc.get("BillingModeSummary", {}).get("BillingMode") != "PAY_PER_REQUEST":
+            index["ProvisionedThroughput"] = {"ReadCapacityUnits": 5, "WriteCapacityUnits": 5}
+        client.update_table(
+            TableName=RECIPES_TABLE,
+            AttributeDefinitions=[
+                {"AttributeName": "CreatedByUserId", "AttributeType": "S"},
+                {"AttributeName": "CreatedAt", "AttributeType": "S"},
+            ],
+            GlobalSecondaryIndexUpdates=[{"Create": index}],
+        )
+        print(f"🚀 Creating index {INDEX_NAME}")
+
+    # wait until the index has finished backfilling
+    while True:
+        desc = client.describe_table(TableName=RECIPES_TABLE)["Table"]
+        status = next(i["IndexStatus"] for i in desc.get("GlobalSecondaryIndexes", [])
+                      if i["IndexName"] == INDEX_NAME)
+        if status == "ACTIVE":
+            return
+        print(f"⏳ Index status: {status}")
+        time.sleep(15)
+
+def backfill_created_at():
+    """Scan every page and stamp recipes that have an author but no CreatedAt."""
+    scan_kwargs = {"ProjectionExpression": "Id, CreatedByUserId, CreatedAt"}
+    updated = 0
+    while True:
+        resp = table.scan(**scan_kwargs)
+        for item in resp.get("Items", []):
+            if item.get("CreatedByUserId") and not item.get("CreatedAt"):
+                try:
+                    table.update_item(
+                        Key={"Id": item["Id"]},
+                        UpdateExpression="SET CreatedAt = :c",
+                        ConditionExpression="attribute_not_exists(CreatedAt)",
+                        ExpressionAttributeValues={":c": PLACEHOLDER_CREATED_AT},
+                    )
+                    updated += 1
+                except client.exceptions.ConditionalCheckFailedException:
+                    pass    # written concurrently by post_recipe
+        if "LastEvaluatedKey" not in resp:
+            break
+        scan_kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+    print(f"✅ Backfilled CreatedAt on {updated} recipes")
+
+def main():
+    ensure_index()
+    backfill_created_at()
+
+if __name__ == "__main__":
+    main()
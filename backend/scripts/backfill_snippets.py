@@ -0,0 +1,39 @@
+import os
+import sys
+import boto3
+
+# One-off: add the plain-text Snippet (served by ?fields=card) to recipes
+# created before post_recipe started writing it. Safe to re-run.
+
+REGION        = os.environ.get("AWS_REGION", "us-east-1")
+RECIPES_TABLE = os.environ.get("RECIPES_TABLE", "Recipes")
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path[:0] = [BACKEND_DIR]
+from cookify.recipes import make_snippet  # noqa: E402   (what post_recipe writes)
+
+table = boto3.resource("dynamodb", region_name=REGION).Table(RECIPES_TABLE)
+
+def main():
+    scan_kwargs = {"ProjectionExpression": "Id, Summery, InstructionsText, Snippet"}
+    updated = 0
+    while True:
+        resp = table.scan(**scan_kwargs)
+        for item in resp.get("Items", []):
+            if "Snippet" in item:
+                continue
+            table.update_item(
+                Key={"Id": item["Id"]},
+                UpdateExpression="SET Snippet = :s",
+                ExpressionAttributeValues={
+                    ":s": make_snippet(item.get("Summery") or item.get("InstructionsText"))
+                },
+            )
+            updated += 1
+        if "LastEvaluatedKey" not in resp:
+            break
+        scan_kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+    print(f"✅ Added Snippet to {updated} recipes")
+
+if __name__ == "__main__":
+    main()
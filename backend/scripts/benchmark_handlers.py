@@ -0,0 +1,329 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import itertools
+import importlib
+import statistics
+import subprocess
+import tempfile
+import contextlib
+
+# Local latency benchmark for the handlers in lambdas/.
+#
+# Every handler is imported and invoked in-process with synthetic API Gateway
+# events against a DynamoDB stand-in seeded at several sizes:
+#
+#   python scripts/benchmark_handlers.py                       # moto, 100/1000/5000 recipes
+#   python scripts/benchmark_handlers.py --sizes 200 --requests 50 --only recipe_paginate
+#   AWS_ENDPOINT_URL=http://localhost:8000 python scripts/benchmark_handlers.py --backend local
+#
+# Reported per handler and size: cold import time (fresh interpreter), warm
+# p50/p95/p99, DynamoDB calls and items read per request, response bytes.
+# A handler whose items-read-per-request grows with the table is flagged "⚠",
+# which is how a scan-per-request regression shows up.
+#
+# moto is a dev-only dependency: pip install -r requirements-dev.txt
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+LAMBDA_DIR  = os.path.join(BACKEND_DIR, "lambdas")
+sys.path[:0] = [BACKEND_DIR, LAMBDA_DIR]
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "bench")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "bench")
+os.environ.setdefault("GEMINI_API_KEY", "bench")
+
+from cookify import aws, cache  # noqa: E402
+
+USER_ID   = "bench-user"
+ADMIN     = {"sub": USER_ID, "cognito:username": "bench", "email": "bench@example.com",
+             "cognito:groups": "admin"}
+HOT_RECIPE = "1"
+REVIEWERS  = itertools.count()
+CATEGORIES = ["c1", "c2", "c3", "c4", "c5"]
+CUISINES   = ["Italian", "Thai", "Mexican", "Indian"]
+
+# ---------- tables & data ----------------------------------------------------
+def _attr(name):
+    return {"AttributeName": name, "AttributeType": "S"}
+
+def _keys(hash_key, range_key=None):
+    keys = [{"AttributeName": hash_key, "KeyType": "HASH"}]
+    if range_key:
+        keys.append({"AttributeName": range_key, "KeyType": "RANGE"})
+    return keys
+
+def _gsi(name, hash_key, range_key=None):
+    return {"IndexName": name, "KeySchema": _keys(hash_key, range_key),
+            "Projection": {"ProjectionType": "ALL"}}
+
+TABLES = {
+    "Recipes": dict(
+        KeySchema=_keys("Id"),
+        AttributeDefinitions=[_attr(a) for a in ("Id", "CreatedByUserId", "CreatedAt",
+                                                 "CategoryId", "Couisine", "IsVegan",
+                                                 "IsVegetarian", "IsGlutenFree")],
+        GlobalSecondaryIndexes=[
+            _gsi("CreatedByUserId-CreatedAt-index", "CreatedByUserId", "CreatedAt"),
+            _gsi("CategoryId-index", "CategoryId"),
+            _gsi("Couisine-index", "Couisine"),
+            *(_gsi(f"Is{flag}-index", f"Is{flag}") for flag in ("Vegan", "Vegetarian", "GlutenFree")),
+        ],
+    ),
+    "Favorites": dict(KeySchema=_keys("UserID"), AttributeDefinitions=[_attr("UserID")]),
+    "Reviews":   dict(KeySchema=_keys("RecipeId", "CreatedAt"),
+                      AttributeDefinitions=[_attr("RecipeId"), _attr("CreatedAt"), _attr("UserId")],
+                      GlobalSecondaryIndexes=[
+                          {**_gsi("RecipeId-UserId-index", "RecipeId", "UserId"),
+                           "Projection": {"ProjectionType": "KEYS_ONLY"}},
+                      ]),
+    "Users":     dict(KeySchema=_keys("UserID"), AttributeDefinitions=[_attr("UserID")]),
+    "Counters":  dict(KeySchema=_keys("Name"), AttributeDefinitions=[_attr("Name")]),
+    "RecipeStats": dict(KeySchema=_keys("RecipeId"), AttributeDefinitions=[_attr("RecipeId")]),
+    "Trending":  dict(KeySchema=_keys("Name"), AttributeDefinitions=[_attr("Name")]),
+}
+
+def create_tables():
+    client = aws.client("dynamodb")
+    existing = set(client.list_tables()["TableNames"])
+    for name, spec in TABLES.items():
+        if name in existing:
+            client.delete_table(TableName=name)
+            client.get_waiter("table_not_exists").wait(TableName=name)
+        client.create_table(TableName=name, BillingMode="PAY_PER_REQUEST", **spec)
+        client.get_waiter("table_exists").wait(TableName=name)
+
+def make_recipe(i, rng):
+    words = " ".join(rng.choice(["garlic", "butter", "tomato", "basil", "rice", "chicken",
+                                 "lemon", "onion", "pepper", "cream"]) for _ in range(60))
+    recipe = {
+        "Id": str(i),
+        "Title": f"Recipe {i} {words[:30]}",
+        "Summery": f"<p>{words[:180]}</p>",
+        "Snippet": words[:200],
+        "InstructionsText": f"<ol><li>{words}</li></ol>" * 8,
+        "CategoryId": rng.choice(CATEGORIES),
+        "Couisine": rng.choice(CUISINES),
+        "CreatedByUserId": USER_ID if i <= 10 else f"user-{i % 97}",
+        "CreatedAt": f"2025-01-01T00:{i // 60 % 60:02d}:{i % 60:02d}Z",
+        "Vegan": rng.choice(["1", "0"]),
+        "Vegetarian": rng.choice(["1", "0"]),
+        "GlutenFree": rng.choice(["1", "0", "NULL"]),
+        "ImageUrl": f"https://example.com/{i}.jpg",
+    }
+    for flag in ("Vegan", "Vegetarian", "GlutenFree"):
+        if recipe[flag] == "1":
+            recipe[f"Is{flag}"] = "1"    # sparse diet key, as post_recipe writes it
+    return recipe
+
+def seed(size, rng):
+    """Recipes=size; favorites, reviews and users scale with it."""
+    create_tables()
+    cache.recipes.clear()           # warm-container entries from the previous size
+    recipes = [make_recipe(i, rng) for i in range(1, size + 1)]
+    with aws.table("Recipes").batch_writer() as batch:
+        for r in recipes:
+            batch.put_item(Item=r)
+    aws.table("Counters").put_item(Item={"Name": "RecipeId", "Value": size})
+    aws.table("Favorites").put_item(Item={
+        "UserID": USER_ID,
+        "RecipeIDs": {str(i) for i in rng.sample(range(1, size + 1), min(50, size))},
+    })
+    with aws.table("Reviews").batch_writer() as batch:
+        for i in range(max(5, size // 10)):
+            batch.put_item(Item={
+                "RecipeId": HOT_RECIPE,
+                "CreatedAt": f"2025-02-01T00:00:00.{i:06d}Z",
+                "UserId": USER_ID if i == 0 else f"user-{i}",
+                "Username": f"user{i}",
+                "ReviewText": "Tasty! " * 20,
+            })
+    with aws.table("Users").batch_writer() as batch:
+        for i in range(max(5, size // 10)):
+            batch.put_item(Item={"UserID": f"user-{i}", "email": f"u{i}@example.com",
+                                 "user_name": f"user{i}"})
+    return recipes
+
+def build_search_index(recipes, path):
+    search_recipes = importlib.import_module("search_recipes")
+    search_recipes.write_index(
+        ((r["Id"], r["Title"], search_recipes.document_terms(r)) for r in recipes), path
+    )
+
+# ---------- synthetic API Gateway events -------------------------------------
+def api_event(method, path_params=None, qs=None, body=None, claims=None):
+    event = {
+        "version": "2.0",
+        "httpMethod": method,
+        "requestContext": {"http": {"method": method}},
+        "pathParameters": path_params,
+        "queryStringParameters": qs,
+        "body": json.dumps(body) if body is not None else None,
+        "isBase64Encoded": False,
+    }
+    if claims:
+        event["requestContext"]["authorizer"] = {"jwt": {"claims": claims}}
+    return event
+
+# name -> (handler module, event factory); chatbot needs the network and is skipped
+SCENARIOS = {
+    "recipe_paginate":          ("recipe_paginate", lambda: api_event("GET", qs={"pageSize": "20"})),
+    "recipe_paginate:category": ("recipe_paginate", lambda: api_event("GET", qs={"pageSize": "20", "category": "c2"})),
+    "recipe_paginate:vegan":    ("recipe_paginate", lambda: api_event("GET", qs={"pageSize": "20", "vegan": "1"})),
+    "recipe_paginate:card":     ("recipe_paginate", lambda: api_event("GET", qs={"pageSize": "20", "fields": "card"})),
+    "recipe_paginate:stats":    ("recipe_paginate", lambda: api_event("GET", qs={"pageSize": "20", "fields": "card",
+                                                                                  "stats": "1"})),
+    "get_recipe":               ("get_recipe",      lambda: api_event("GET", path_params={"recipeId": HOT_RECIPE})),
+    "get_trending":             ("get_trending",    lambda: api_event("GET", qs={"limit": "20"})),
+    "get_recipes:card":         ("get_recipes",     lambda: api_event("GET", qs={"fields": "card"})),
+    "gey_my_recipes":           ("gey_my_recipes",  lambda: api_event("GET", path_params={"user-id": USER_ID})),
+    "get_favorites":            ("get_favorites",   lambda: api_event("GET", claims=ADMIN)),
+    "get_reciews":              ("get_reciews",     lambda: api_event("GET", path_params={"recipeId": HOT_RECIPE})),
+    "get_users":                ("get_users",       lambda: api_event("GET", claims=ADMIN)),
+    "search_recipes":           ("search_recipes",  lambda: api_event("GET", qs={"q": "garlic butter"})),
+    "post_recipe":              ("post_recipe",     lambda: api_event("POST", body={
+        "Title": "Bench soup", "InstructionsText": "<p>Boil.</p>", "CreatedByUserId": USER_ID})),
+    # a new reviewer per request: one review per user per recipe, repeats are replays
+    "post_review":              ("post_review",     lambda: api_event("POST", path_params={"recipeId": "2"},
+                                                                      body={"ReviewText": "Nice"},
+                                                                      claims={**ADMIN, "sub": f"reviewer-{next(REVIEWERS)}"})),
+    "update_review":            ("update_review",   lambda: api_event("PUT", path_params={"recipeId": HOT_RECIPE},
+                                                                      body={"ReviewText": "Edited"}, claims=ADMIN)),
+    "post_favorites":           ("post_favorites",  lambda: api_event("POST", body={"RecipeId": "3"}, claims=ADMIN)),
+    "remove_favorite":          ("remove_favorite", lambda: api_event("DELETE", body={"RecipeId": "3"}, claims=ADMIN)),
+    "batch_favorites":          ("batch_favorites", lambda: api_event("POST", body={"add": ["3", "4"], "remove": ["5"]},
+                                                                      claims=ADMIN)),
+    "session_bootstrap":        ("session_bootstrap", lambda: api_event("POST", claims=ADMIN)),
+    "post_user":                ("post_user",       lambda: api_event("POST", claims=ADMIN)),
+}
+
+# ---------- measurement ------------------------------------------------------
+class CallCounter:
+    """Counts DynamoDB API calls and items read via botocore event hooks."""
+    def __init__(self):
+        self.calls = 0
+        self.items = 0
+
+    def before_call(self, **kwargs):
+        self.calls += 1
+
+    def after_call(self, parsed=None, **kwargs):
+        parsed = parsed or {}
+        if "ScannedCount" in parsed:
+            self.items += parsed["ScannedCount"]
+        elif "Responses" in parsed:
+            self.items += sum(len(v) for v in parsed["Responses"].values())
+        elif "Item" in parsed:
+            self.items += 1
+
+def cold_import_ms(module, runs=3):
+    """Median import time of a handler in a fresh interpreter."""
+    code = ("import sys, time; sys.path[:0] = %r; t = time.perf_counter(); "
+            "import %s; print(time.perf_counter() - t)" % ([BACKEND_DIR, LAMBDA_DIR], module))
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                             env=os.environ.copy())
+        if out.returncode:
+            return None
+        samples.append(float(out.stdout) * 1000)
+    return statistics.median(samples)
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def run_scenario(module_name, make_event, requests, counter):
+    module = importlib.reload(importlib.import_module(module_name))
+    latencies, sizes = [], []
+    with open(os.devnull, "w") as quiet, contextlib.redirect_stdout(quiet):   # handler debug prints
+        module.lambda_handler(make_event(), None)     # first call builds clients/caches
+        counter.calls = counter.items = 0
+        for _ in range(requests):
+            start = time.perf_counter()
+            resp  = module.lambda_handler(make_event(), None)
+            latencies.append((time.perf_counter() - start) * 1000)
+            sizes.append(len((resp or {}).get("body") or ""))
+    return {
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "calls": counter.calls / requests,
+        "items": counter.items / requests,
+        "bytes": statistics.median(sizes),
+    }
+
+def benchmark(sizes, requests, names):
+    rng     = random.Random(42)
+    results = {name: {"cold_ms": cold_import_ms(SCENARIOS[name][0]), "sizes": {}} for name in names}
+    index_path = os.path.join(tempfile.mkdtemp(), "recipes.idx")
+    os.environ["SEARCH_INDEX_PATH"] = index_path
+
+    for size in sizes:
+        aws.reset()
+        counter = CallCounter()
+        aws.session().events.register("before-call.dynamodb", counter.before_call)
+        aws.session().events.register("after-call.dynamodb", counter.after_call)
+
+        print(f"🌱 Seeding {size} recipes…", file=sys.stderr)
+        recipes = seed(size, rng)
+        if "search_recipes" in names:
+            build_search_index(recipes, index_path)
+
+        for name in names:
+            module_name, make_event = SCENARIOS[name]
+            results[name]["sizes"][size] = run_scenario(module_name, make_event, requests, counter)
+    return results
+
+def report(results, sizes):
+    print(f"{'handler':26s} {'size':>6s} {'cold ms':>8s} {'p50':>7s} {'p95':>7s} {'p99':>7s} "
+          f"{'ddb/req':>8s} {'items/req':>10s} {'bytes':>9s}")
+    for name, res in results.items():
+        first, last = res["sizes"][sizes[0]], res["sizes"][sizes[-1]]
+        grows = (len(sizes) > 1 and first["items"] > 0
+                 and last["items"] / first["items"] >= 0.5 * sizes[-1] / sizes[0])
+        for size in sizes:
+            r    = res["sizes"][size]
+            cold = f"{res['cold_ms']:.1f}" if res["cold_ms"] is not None else "n/a"
+            flag = " ⚠" if grows and size == sizes[-1] else ""
+            print(f"{name:26s} {size:6d} {cold:>8s} {r['p50']:7.2f} {r['p95']:7.2f} {r['p99']:7.2f} "
+                  f"{r['calls']:8.1f} {r['items']:10.1f} {r['bytes']:9.0f}{flag}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark lambdas/ handlers locally")
+    parser.add_argument("--sizes", default="100,1000,5000", help="comma-separated recipe counts")
+    parser.add_argument("--requests", type=int, default=100, help="warm invocations per handler")
+    parser.add_argument("--only", help="comma-separated scenario names (default: all)")
+    parser.add_argument("--backend", choices=["moto", "local"], default="moto",
+                        help="moto in-process, or an endpoint from AWS_ENDPOINT_URL")
+    parser.add_argument("--json", help="also write raw results to this file")
+    args = parser.parse_args()
+
+    sizes = sorted(int(s) for s in args.sizes.split(","))
+    names = args.only.split(",") if args.only else list(SCENARIOS)
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        sys.exit(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    if args.backend == "moto":
+        try:
+            from moto import mock_aws
+        except ImportError:
+            sys.exit("moto is not installed: pip install -r requirements-dev.txt")
+        with mock_aws():
+            results = benchmark(sizes, args.requests, names)
+    else:
+        if not (os.environ.get("AWS_ENDPOINT_URL") or os.environ.get("AWS_ENDPOINT_URL_DYNAMODB")):
+            sys.exit("Set AWS_ENDPOINT_URL(_DYNAMODB) to the DynamoDB Local endpoint")
+        results = benchmark(sizes, args.requests, names)
+
+    report(results, sizes)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import os
+import sys
+import json
+import argparse
+import boto3
+
+# Builds the inverted index served by lambdas/search_recipes.py.
+#
+#   python scripts/build_search_index.py                 # full rebuild from Recipes
+#   python scripts/build_search_index.py --incremental   # merge post_recipe deltas
+#   python scripts/build_search_index.py --local-only    # write the file, skip S3
+#
+# The incremental path reads the current index plus the delta objects, writes
+# a new index, uploads it and only then deletes the merged deltas.
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path[:0] = [BACKEND_DIR, os.path.join(BACKEND_DIR, "lambdas")]   # cookify + handlers
+from search_recipes import (  # noqa: E402
+    SearchIndex, document_terms, write_index,
+    SEARCH_BUCKET, SEARCH_INDEX_KEY, SEARCH_DELTA_PREFIX,
+)
+
+REGION        = os.environ.get("AWS_REGION", "us-east-1")
+RECIPES_TABLE = os.environ.get("RECIPES_TABLE", "Recipes")
+
+dynamodb = boto3.resource("dynamodb", region_name=REGION)
+s3       = boto3.client("s3", region_name=REGION)
+
+def scan_recipes():
+    """Yield every recipe (only the indexed attributes), page by page."""
+    table = dynamodb.Table(RECIPES_TABLE)
+    scan_kwargs = {"ProjectionExpression": "Id, Title, Summery, InstructionsText"}
+    while True:
+        resp = table.scan(**scan_kwargs)
+        yield from resp.get("Items", [])
+        if "LastEvaluatedKey" not in resp:
+            return
+        scan_kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+
+def full_docs():
+    for recipe in scan_recipes():
+        yield str(recipe["Id"]), recipe.get("Title", ""), document_terms(recipe)
+
+def existing_docs(path):
+    """Turn an index file back into (Id, Title, tf) tuples."""
+    index = SearchIndex(path)
+    tfs = [dict() for _ in index.docs]
+    for term in index.terms:
+        for doc_idx, tf in index.postings(term):
+            tfs[doc_idx][term] = tf
+    for (rid, title), tf in zip(index.docs, tfs):
+        yield rid, title, tf
+
+def pending_deltas():
+    """Return {S3 key: recipe} for every delta object waiting to be merged."""
+    deltas, kwargs = {}, {"Bucket": SEARCH_BUCKET, "Prefix": SEARCH_DELTA_PREFIX}
+    while True:
+        resp = s3.list_objects_v2(**kwargs)
+        for obj in resp.get("Contents", []):
+            body = s3.get_object(Bucket=SEARCH_BUCKET, Key=obj["Key"])["Body"].read()
+            deltas[obj["Key"]] = json.loads(body)
+        if not resp.get("IsTruncated"):
+            return deltas
+        kwargs["ContinuationToken"] = resp["NextContinuationToken"]
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the recipe search index")
+    parser.add_argument("--incremental", action="store_true",
+                        help="merge pending deltas into the current index instead of rescanning")
+    parser.add_argument("--local-only", action="store_true", help="do not upload to S3")
+    parser.add_argument("--out", default="recipes.idx", help="local output path")
+    args = parser.parse_args()
+
+    if not args.local_only and not SEARCH_BUCKET:
+        sys.exit("SEARCH_BUCKET is not set (use --local-only to just write the file)")
+
+    # listed up front: only deltas that exist before the build may be deleted after it
+    deltas = pending_deltas() if SEARCH_BUCKET else {}
+    if args.incremental:
+        current = args.out + ".current"
+        s3.download_file(SEARCH_BUCKET, SEARCH_INDEX_KEY, current)
+        base    = list(existing_docs(current))
+        known   = {rid for rid, _, _ in base}
+        added   = [(str(r["Id"]), r.get("Title", ""), document_terms(r))
+                   for r in deltas.values() if str(r["Id"]) not in known]
+        count   = write_index(base + added, args.out)
+        os.remove(current)
+        print(f"🔁 Merged {len(added)} new recipes ({count} total)")
+    else:
+        count = write_index(full_docs(), args.out)
+        print(f"📦 Indexed {count} recipes")
+
+    if args.local_only:
+        print(f"✅ Wrote {args.out}")
+        return
+
+    s3.upload_file(args.out, SEARCH_BUCKET, SEARCH_INDEX_KEY)
+    print(f"✅ Uploaded s3://{SEARCH_BUCKET}/{SEARCH_INDEX_KEY}")
+
+    # deltas are now part of the base index (a full rebuild covers them too)
+    for key in deltas:
+        s3.delete_object(Bucket=SEARCH_BUCKET, Key=key)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import os
+import boto3
+
+# One-off: create the shared reply cache used by the chatbot Lambda
+# (CHAT_CACHE_TABLE) and turn on TTL expiry for its ExpiresAt attribute.
+# Safe to re-run.
+
+REGION      = os.environ.get("AWS_REGION", "us-east-1")
+CACHE_TABLE = os.environ.get("CHAT_CACHE_TABLE", "ChatCache")
+TTL_ATTRIBUTE = "ExpiresAt"
+
+client = boto3.client("dynamodb", region_name=REGION)
+
+def ensure_table():
+    try:
+        client.create_table(
+            TableName=CACHE_TABLE,
+            AttributeDefinitions=[{"AttributeName": "Key", "AttributeType": "S"}],
+            KeySchema=[{"AttributeName": "Key", "KeyType": "HASH"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        print(f"🚀 Creating table {CACHE_TABLE}")
+    except client.exceptions.ResourceInUseException:
+        print(f"ℹ️ Table {CACHE_TABLE} already exists")
+    client.get_waiter("table_exists").wait(TableName=CACHE_TABLE)
+
+def ensure_ttl():
+    desc = client.describe_time_to_live(TableName=CACHE_TABLE)["TimeToLiveDescription"]
+    if desc.get("TimeToLiveStatus") in ("ENABLED", "ENABLING"):
+        print(f"ℹ️ TTL already on {desc.get('AttributeName')}")
+        return
+    client.update_time_to_live(
+        TableName=CACHE_TABLE,
+        TimeToLiveSpecification={"Enabled": True, "AttributeName": TTL_ATTRIBUTE},
+    )
+    print(f"✅ TTL enabled on {TTL_ATTRIBUTE}")
+
+def main():
+    ensure_table()
+    ensure_ttl()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+# Bulk recipe import.
+#
+#   python scripts/import_recipes.py recipes.ndjson
+#   python scripts/import_recipes.py export.csv --owner <cognito-sub> --workers 16
+#   python scripts/import_recipes.py big.json --checkpoint big.ckpt   # re-run to resume
+#   AWS_ENDPOINT_URL=http://localhost:8000 python scripts/import_recipes.py seed.ndjson
+#
+# Input is read as a stream (NDJSON and CSV line by line; a .json array is
+# loaded whole). Every record is validated and normalized to the post_recipe
+# item schema, then written in chunks of --chunk-size: each chunk reserves its
+# Ids from the Counters table in one update, and a pool of workers writes the
+# chunks through batch_writer (which resends UnprocessedItems).
+#
+# The checkpoint records each chunk's first Id before it is written and marks
+# it done afterwards. A resumed run skips done chunks and rewrites unfinished
+# ones with the same Ids, so nothing is imported twice. Rejected records go to
+# <input>.rejects.ndjson with the reason. Delete the checkpoint to import the
+# same file again as new recipes.
+#
+# New recipes reach search after the next scripts/build_search_index.py run.
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path[:0] = [BACKEND_DIR, os.path.join(BACKEND_DIR, "lambdas")]   # cookify + handlers
+from cookify import aws  # noqa: E402
+from cookify.recipes import DIET_FLAGS, diet_flag  # noqa: E402
+from post_recipe import TABLE_NAME, build_item, reserve_ids  # noqa: E402
+
+REQUIRED = ("Title", "InstructionsText", "CreatedByUserId")
+
+# ---------- input ------------------------------------------------------------
+def read_records(path, fmt):
+    """Yield one dict per input record."""
+    if fmt == "ndjson":
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    elif fmt == "csv":
+        with open(path, encoding="utf-8", newline="") as f:
+            yield from csv.DictReader(f)
+    else:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        yield from (data if isinstance(data, list) else data.get("items", []))
+
+def detect_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    return {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}.get(ext, "json")
+
+# ---------- validation -------------------------------------------------------
+def normalize(record, owner):
+    """post_recipe request body for `record`; raises ValueError when it is unusable."""
+    data = {k: (v.strip() if isinstance(v, str) else v) for k, v in record.items() if k}
+    if owner and not data.get("CreatedByUserId"):
+        data["CreatedByUserId"] = owner
+    for field in REQUIRED:
+        if not data.get(field):
+            raise ValueError(f"missing {field}")
+    for flag in DIET_FLAGS:
+        data[flag] = diet_flag(data.get(flag))
+    for field in ("CategoryId", "Couisine", "ImageUrl", "Publisher", "SourceUrl", "Summery"):
+        if data.get(field) is not None and not isinstance(data[field], str):
+            data[field] = str(data[field])
+    return data
+
+# ---------- checkpoint -------------------------------------------------------
+class Checkpoint:
+    """{chunk index: {"first": first Id, "done": bool}}, rewritten atomically."""
+    def __init__(self, path):
+        self.path   = path
+        self.chunks = {}
+        self._lock  = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self.chunks = {int(k): v for k, v in json.load(f)["chunks"].items()}
+
+    def done(self, index):
+        return self.chunks.get(index, {}).get("done", False)
+
+    def first_id(self, index):
+        return self.chunks.get(index, {}).get("first")
+
+    def update(self, index, **fields):
+        with self._lock:
+            self.chunks.setdefault(index, {}).update(fields)
+            if self.path:
+                tmp = self.path + ".tmp"
+                with open(tmp, "w") as f:
+                    json.dump({"chunks": self.chunks}, f)
+                os.replace(tmp, self.path)
+
+# ---------- writing ----------------------------------------------------------
+def write_chunk(index, records, checkpoint, created_at):
+    """Give the chunk its Ids (reusing a checkpointed range) and batch-write it."""
+    first = checkpoint.first_id(index)
+    if first is None:
+        first, _ = reserve_ids(len(records))
+        checkpoint.update(index, first=first, done=False)
+
+    with aws.table(TABLE_NAME).batch_writer() as batch:
+        for offset, data in enumerate(records):
+            batch.put_item(Item=build_item(data, str(first + offset), created_at))
+    checkpoint.update(index, done=True)
+    return len(records)
+
+def chunked(records, size):
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def run(args):
+    checkpoint = Checkpoint(args.checkpoint)
+    created_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    rejects_path = args.input + ".rejects.ndjson"
+    rejected = 0
+
+    def valid_records(rejects):
+        nonlocal rejected
+        fmt = args.format or detect_format(args.input)
+        for n, record in enumerate(read_records(args.input, fmt), 1):
+            try:
+                yield normalize(record, args.owner)
+            except (ValueError, AttributeError) as e:
+                rejected += 1
+                rejects.write(json.dumps({"record": n, "error": str(e), "data": record}) + "\n")
+
+    written, skipped = 0, 0
+    start = time.perf_counter()
+    with open(rejects_path, "w", encoding="utf-8") as rejects, \
+            ThreadPoolExecutor(max_workers=args.workers) as pool:
+        pending = set()
+        for index, chunk in enumerate(chunked(valid_records(rejects), args.chunk_size)):
+            if checkpoint.done(index):
+                skipped += len(chunk)
+                continue
+            pending.add(pool.submit(write_chunk, index, chunk, checkpoint, created_at))
+            # bound memory: at most two chunks queued per worker
+            if len(pending) >= args.workers * 2:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                written += sum(f.result() for f in finished)
+        written += sum(f.result() for f in pending)
+
+    elapsed = time.perf_counter() - start
+    print(f"✅ Imported {written} recipes in {elapsed:.1f}s "
+          f"({written / elapsed if elapsed else 0:.0f}/s); "
+          f"{skipped} already done, {rejected} rejected")
+    if rejected:
+        print(f"⚠️ Rejected records: {rejects_path}")
+    else:
+        os.remove(rejects_path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-import recipes into the Recipes table")
+    parser.add_argument("input", help="NDJSON, CSV or JSON array file")
+    parser.add_argument("--format", choices=("ndjson", "csv", "json"),
+                        help="default: from the file extension")
+    parser.add_argument("--owner", help="CreatedByUserId for records that have none")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--chunk-size", type=int, default=500,
+                        help="records per Id reservation / checkpoint step")
+    parser.add_argument("--checkpoint", help="resume file (default: <input>.ckpt)")
+    args = parser.parse_args()
+    args.checkpoint = args.checkpoint or args.input + ".ckpt"
+    aws.MAX_POOL = max(aws.MAX_POOL, args.workers * 2)   # before the first client is built
+    run(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import os
+import sys
+import time
+import boto3
+from collections import Counter
+
+# Create the RecipeStats table (if needed) and recompute every item from the
+# source tables: ReviewCount, the review guard items and the latest review from Reviews,
+# FavoriteCount from Favorites. Use it for the initial backfill and to repair drift; it
+# overwrites what the handlers maintain, so run it when writes are quiet.
+# Safe to re-run.
+
+REGION          = os.environ.get("AWS_REGION", "us-east-1")
+STATS_TABLE     = os.environ.get("RECIPE_STATS_TABLE", "RecipeStats")
+REVIEWS_TABLE   = os.environ.get("REVIEWS_TABLE", "Reviews")
+FAVORITES_TABLE = os.environ.get("FAVORITES_TABLE", "Favorites")
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path[:0] = [BACKEND_DIR]
+# what post_review writes
+from cookify.stats import review_snippet, is_reviewer_key, reviewer_key  # noqa: E402
+from cookify.trending import TREND_FIELDS  # noqa: E402
+
+client   = boto3.client("dynamodb", region_name=REGION)
+dynamodb = boto3.resource("dynamodb", region_name=REGION)
+
+def ensure_table():
+    try:
+        client.create_table(
+            TableName=STATS_TABLE,
+            AttributeDefinitions=[{"AttributeName": "RecipeId", "AttributeType": "S"}],
+            KeySchema=[{"AttributeName": "RecipeId", "KeyType": "HASH"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        print(f"🚀 Creating table {STATS_TABLE}")
+    except client.exceptions.ResourceInUseException:
+        print(f"ℹ️ Table {STATS_TABLE} already exists")
+    client.get_waiter("table_exists").wait(TableName=STATS_TABLE)
+
+def scan_all(table_name, projection):
+    table = dynamodb.Table(table_name)
+    scan_kwargs = {"ProjectionExpression": projection}
+    while True:
+        resp = table.scan(**scan_kwargs)
+        yield from resp.get("Items", [])
+        if "LastEvaluatedKey" not in resp:
+            return
+        scan_kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+
+def main():
+    ensure_table()
+
+    review_counts = Counter()
+    guards = {}
+    latest = {}
+    for review in scan_all(REVIEWS_TABLE, "RecipeId, CreatedAt, UserId, Username, ReviewText"):
+        rid = str(review["RecipeId"])
+        review_counts[rid] += 1
+        if review.get("UserId"):
+            key = reviewer_key(rid, review["UserId"])
+            guards[key] = {"RecipeId": key, "UserId": review["UserId"],
+                           "CreatedAt": review["CreatedAt"]}
+        if rid not in latest or review["CreatedAt"] > latest[rid]["CreatedAt"]:
+            latest[rid] = review
+
+    favorite_counts = Counter()
+    for fav in scan_all(FAVORITES_TABLE, "UserID, RecipeIDs"):
+        for rid in fav.get("RecipeIDs") or ():
+            favorite_counts[str(rid)] += 1
+
+    now = int(time.time())
+    # existing items are rewritten too, so recipes that lost everything drop to 0;
+    # the Trend* fields are owned by the trending consumer and carried over as is
+    existing   = {item["RecipeId"]: {f: item[f] for f in TREND_FIELDS if f in item}
+                  for item in scan_all(STATS_TABLE, ", ".join(("RecipeId",) + TREND_FIELDS))
+                  if not is_reviewer_key(item["RecipeId"])}
+    recipe_ids = set(review_counts) | set(favorite_counts) | set(existing)
+    with dynamodb.Table(STATS_TABLE).batch_writer() as batch:
+        for rid in recipe_ids:
+            item = {
+                "RecipeId": rid,
+                "ReviewCount": review_counts[rid],
+                "FavoriteCount": favorite_counts[rid],
+                "UpdatedAt": now,
+            }
+            item.update(existing.get(rid, {}))
+            if rid in latest:
+                item["LatestReviewAt"]       = latest[rid]["CreatedAt"]
+                item["LatestReviewUsername"] = latest[rid].get("Username") or ""
+                item["LatestReviewSnippet"]  = review_snippet(latest[rid].get("ReviewText"))
+            batch.put_item(Item=item)
+        for guard in guards.values():                   # post_review's one-per-user guard
+            batch.put_item(Item=guard)
+
+    print(f"✅ Rebuilt stats for {len(recipe_ids)} recipes "
+          f"({sum(review_counts.values())} reviews, {sum(favorite_counts.values())} favorites)")
+
+if __name__ == "__main__":
+    main()
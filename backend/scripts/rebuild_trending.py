@@ -0,0 +1,131 @@
+import os
+import sys
+import argparse
+from collections import Counter
+from datetime import datetime, timezone
+
+# Set up and backfill the trending leaderboard (cookify/trending.py).
+#
+#   python scripts/rebuild_trending.py --enable-streams   # first time
+#   python scripts/rebuild_trending.py                    # recompute from the source tables
+#
+# Creates the Trending table, optionally turns on the streams that the
+# trending_stream Lambda consumes, recomputes every recipe's trend from Reviews
+# (at their CreatedAt) and Favorites, and publishes a fresh board. Favorites
+# have no timestamps: their share is the consumer's TrendFavorites decayed to
+# now, capped by the recipe's current favorites, so a first rebuild scores
+# reviews only. Run it with the consumer paused, or expect a few stream
+# batches to be counted twice until the next rebuild.
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path[:0] = [BACKEND_DIR]
+from cookify import aws, trending  # noqa: E402
+
+def ensure_table():
+    client = aws.client("dynamodb")
+    try:
+        client.create_table(
+            TableName=trending.TRENDING_TABLE,
+            AttributeDefinitions=[{"AttributeName": "Name", "AttributeType": "S"}],
+            KeySchema=[{"AttributeName": "Name", "KeyType": "HASH"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        print(f"🚀 Creating table {trending.TRENDING_TABLE}")
+    except client.exceptions.ResourceInUseException:
+        print(f"ℹ️ Table {trending.TRENDING_TABLE} already exists")
+    client.get_waiter("table_exists").wait(TableName=trending.TRENDING_TABLE)
+
+def enable_streams():
+    client = aws.client("dynamodb")
+    for table, view in ((trending.FAVORITES_TABLE, "NEW_AND_OLD_IMAGES"),
+                        (trending.REVIEWS_TABLE, "NEW_IMAGE")):
+        spec = client.describe_table(TableName=table)["Table"].get("StreamSpecification") or {}
+        if spec.get("StreamEnabled"):
+            print(f"ℹ️ {table} stream already on ({spec.get('StreamViewType')})")
+            continue
+        client.update_table(TableName=table, StreamSpecification={
+            "StreamEnabled": True, "StreamViewType": view,
+        })
+        print(f"✅ {table} stream enabled ({view}); point trending_stream at it")
+
+def scan_all(table_name, projection):
+    table = aws.table(table_name)
+    scan_kwargs = {"ProjectionExpression": projection}
+    while True:
+        resp = table.scan(**scan_kwargs)
+        yield from resp.get("Items", [])
+        if "LastEvaluatedKey" not in resp:
+            return
+        scan_kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+
+def parse_time(created_at):
+    return datetime.fromisoformat(created_at.replace("Z", "+00:00")).replace(
+        tzinfo=timezone.utc).timestamp()
+
+def compute_trends(now):
+    """{RecipeId: (score, favorites)} as of `now`."""
+    reviews = Counter()
+    for review in scan_all(trending.REVIEWS_TABLE, "RecipeId, CreatedAt"):
+        try:
+            at = min(parse_time(review["CreatedAt"]), now)
+        except (KeyError, ValueError):
+            at = now
+        reviews[str(review["RecipeId"])] += trending.decayed(trending.REVIEW_WEIGHT, now - at)
+
+    favorite_counts = Counter()
+    for fav in scan_all(trending.FAVORITES_TABLE, "UserID, RecipeIDs"):
+        for rid in fav.get("RecipeIDs") or ():
+            favorite_counts[str(rid)] += 1
+    favorites = {}
+    for item in scan_all(trending.STATS_TABLE, ", ".join(("RecipeId",) + trending.TREND_FIELDS)):
+        _, held, at = trending.read_trend(item)
+        rid = item["RecipeId"]
+        favorites[rid] = min(trending.decayed(held, max(0.0, now - at)),
+                             trending.FAVORITE_WEIGHT * favorite_counts[rid])
+
+    trends = {}
+    for rid in set(reviews) | set(favorites):
+        share = favorites.get(rid, 0.0)
+        if reviews[rid] + share > 0:
+            trends[rid] = (reviews[rid] + share, share)
+    return trends
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild trending scores and board")
+    parser.add_argument("--enable-streams", action="store_true",
+                        help="turn on the Favorites/Reviews streams the consumer reads")
+    args = parser.parse_args()
+
+    ensure_table()
+    if args.enable_streams:
+        enable_streams()
+
+    now    = datetime.now(timezone.utc).timestamp()
+    trends = compute_trends(now)
+    stats  = aws.table(trending.STATS_TABLE)
+    stale  = {item["RecipeId"] for item in scan_all(trending.STATS_TABLE, "RecipeId, TrendScore, TrendAt")
+              if "TrendScore" in item or "TrendAt" in item} - set(trends)
+    for rid, (score, favorites) in trends.items():
+        stats.update_item(
+            Key={"RecipeId": rid},
+            UpdateExpression="SET TrendScore = :s, TrendFavorites = :f, TrendAt = :at",
+            ExpressionAttributeValues={":s": trending.to_number(score),
+                                       ":f": trending.to_number(favorites),
+                                       ":at": trending.to_number(now)},
+        )
+    for rid in stale:
+        stats.update_item(Key={"RecipeId": rid},
+                          UpdateExpression="REMOVE " + ", ".join(trending.TREND_FIELDS))
+
+    meta  = {r["Id"]: r for r in scan_all(trending.RECIPES_TABLE, "Id, Title, ImageUrl, CategoryId")}
+    board = trending.merge_board({"At": now, "Global": [], "ByCategory": {}},
+                                 {rid: (score, now) for rid, (score, _) in trends.items()
+                                  if rid in meta}, meta, now)
+    _, version = trending.read_board()
+    if not trending.write_board(board, version):
+        sys.exit("❌ The board changed while rebuilding; run again")
+    print(f"✅ Scored {len(trends)} recipes; board has {len(board['Global'])} global entries "
+          f"and {len(board['ByCategory'])} categories")
+
+if __name__ == "__main__":
+    main()
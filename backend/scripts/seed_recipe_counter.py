@@ -0,0 +1,46 @@
+import os
+import boto3
+
+# One-off: move the RecipeId counter used by post_recipe past every existing Id.
+# Safe to re-run; the counter is only ever raised, never lowered.
+
+REGION         = os.environ.get("AWS_REGION", "us-east-1")
+RECIPES_TABLE  = os.environ.get("RECIPES_TABLE", "Recipes")
+COUNTERS_TABLE = os.environ.get("COUNTERS_TABLE", "Counters")
+COUNTER_NAME   = "RecipeId"
+
+dynamodb = boto3.resource("dynamodb", region_name=REGION)
+
+def max_recipe_id():
+    """Scan every page of Recipes (Id only) and return the largest numeric Id."""
+    table = dynamodb.Table(RECIPES_TABLE)
+    scan_kwargs = {"ProjectionExpression": "Id"}
+    max_id = 0
+    while True:
+        resp = table.scan(**scan_kwargs)
+        for item in resp.get("Items", []):
+            if item["Id"].isdigit():
+                max_id = max(max_id, int(item["Id"]))
+        if "LastEvaluatedKey" not in resp:
+            return max_id
+        scan_kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+
+def seed_counter(max_id):
+    counters = dynamodb.Table(COUNTERS_TABLE)
+    try:
+        counters.update_item(
+            Key={"Name": COUNTER_NAME},
+            UpdateExpression="SET #v = :m",
+            ConditionExpression="attribute_not_exists(#v) OR #v < :m",
+            ExpressionAttributeNames={"#v": "Value"},
+            ExpressionAttributeValues={":m": max_id},
+        )
+        print(f"✅ Counter {COUNTER_NAME} set to {max_id}")
+    except counters.meta.client.exceptions.ConditionalCheckFailedException:
+        print(f"ℹ️ Counter {COUNTER_NAME} already at or above {max_id}")
+
+def main():
+    seed_counter(max_recipe_id())
+
+if __name__ == "__main__":
+    main()
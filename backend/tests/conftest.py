@@ -0,0 +1,70 @@
+import os
+import sys
+import threading
+import functools
+import pytest
+
+# Handlers and cookify run in-process against moto (pip install -r requirements-dev.txt):
+#
+#   cd backend && python -m pytest -q
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path[:0] = [BACKEND_DIR, os.path.join(BACKEND_DIR, "lambdas")]
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "test")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "test")
+os.environ.setdefault("GEMINI_API_KEY", "test")
+
+from cookify import aws, cache  # noqa: E402
+
+# DynamoDB applies every write atomically; moto's backend does not when several
+# threads hit it at once, so concurrency tests would see races the service never has.
+ATOMIC_WRITES = ("put_item", "update_item", "delete_item", "transact_write_items")
+
+def _serialize_writes(monkeypatch):
+    from moto.dynamodb.models import DynamoDBBackend
+    lock = threading.RLock()
+    for name in ATOMIC_WRITES:
+        original = getattr(DynamoDBBackend, name)
+        @functools.wraps(original)
+        def atomic(self, *args, _original=original, **kwargs):
+            with lock:
+                return _original(self, *args, **kwargs)
+        monkeypatch.setattr(DynamoDBBackend, name, atomic)
+
+@pytest.fixture
+def stand_in(monkeypatch):
+    """Empty moto account; cached clients and recipes are dropped on both sides."""
+    moto = pytest.importorskip("moto")
+    _serialize_writes(monkeypatch)
+    with moto.mock_aws():
+        aws.reset()
+        cache.recipes.clear()
+        yield
+    aws.reset()
+    cache.recipes.clear()
+
+@pytest.fixture
+def create_table(stand_in):
+    """create_table(name, hash_key, range_key=None, indexes={IndexName: (hash, range)})"""
+    def create(name, hash_key, range_key=None, indexes=None):
+        def keys(h, r):
+            schema = [{"AttributeName": h, "KeyType": "HASH"}]
+            if r:
+                schema.append({"AttributeName": r, "KeyType": "RANGE"})
+            return schema
+        attrs = {hash_key, range_key}
+        spec = {"KeySchema": keys(hash_key, range_key)}
+        if indexes:
+            spec["GlobalSecondaryIndexes"] = [
+                {"IndexName": n, "KeySchema": keys(h, r), "Projection": {"ProjectionType": "ALL"}}
+                for n, (h, r) in indexes.items()
+            ]
+            for h, r in indexes.values():
+                attrs |= {h, r}
+        spec["AttributeDefinitions"] = [{"AttributeName": a, "AttributeType": "S"}
+                                        for a in sorted(a for a in attrs if a)]
+        aws.client("dynamodb").create_table(TableName=name, BillingMode="PAY_PER_REQUEST", **spec)
+        return aws.table(name)
+    return create
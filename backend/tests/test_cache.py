@@ -0,0 +1,68 @@
+import pytest
+from cookify import aws, cache
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, "monotonic", clock)
+    return clock
+
+def test_entries_expire_after_their_ttl(clock):
+    c = cache.TTLCache(4, ttl=10)
+    c.set("a", 1)
+    c.set("b", 2, ttl=1)
+    clock.now += 5
+    assert c.get("a") == 1 and c.get("b") is None
+    assert c.peek("b") == 2                   # kept for revalidation
+    clock.now += 5
+    assert c.get("a", "gone") == "gone"
+    assert (c.hits, c.misses) == (1, 2)
+
+def test_least_recently_used_is_evicted(clock):
+    c = cache.TTLCache(2, ttl=10)
+    c.set("a", 1)
+    c.set("b", 2)
+    c.get("a")                                # a is now the most recent
+    c.set("c", 3)
+    assert c.peek("b") is None and c.get("a") == 1 and c.get("c") == 3
+    assert len(c) == 2
+
+@pytest.fixture
+def recipes(create_table, clock, monkeypatch):
+    table = create_table("Recipes", "Id")
+    table.put_item(Item={"Id": "1", "Title": "Soup", "UpdatedAt": "v1"})
+    reads = []
+    client = table.meta.client
+    real = client.get_item
+    monkeypatch.setattr(client, "get_item", lambda **kw: reads.append(kw) or real(**kw))
+    return table, reads
+
+def test_expired_entry_is_revalidated_on_updated_at(recipes, clock):
+    table, reads = recipes
+    assert cache.get_recipe("1")["Title"] == "Soup"
+    assert cache.get_recipe("1")["Title"] == "Soup"
+    assert len(reads) == 1                    # second read came from the cache
+
+    clock.now += cache.CACHE_TTL + 1
+    assert cache.get_recipe("1")["Title"] == "Soup"
+    assert len(reads) == 2 and reads[1]["ProjectionExpression"] == "#v"
+
+    table.put_item(Item={"Id": "1", "Title": "Stew", "UpdatedAt": "v2"})
+    clock.now += cache.CACHE_TTL + 1
+    assert cache.get_recipe("1")["Title"] == "Stew"
+    assert len(reads) == 4 and "ProjectionExpression" not in reads[3]
+
+def test_missing_recipe_is_cached_briefly(recipes, clock):
+    _, reads = recipes
+    assert cache.get_recipe("404") is None
+    assert cache.get_recipe("404") is None
+    assert len(reads) == 1
+    clock.now += cache.NEGATIVE_TTL + 1
+    assert cache.get_recipe("404") is None
+    assert len(reads) == 2
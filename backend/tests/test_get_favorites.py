@@ -0,0 +1,30 @@
+import json
+import pytest
+import get_favorites
+from cookify import cache
+
+@pytest.fixture
+def favorites(create_table):
+    recipes = create_table("Recipes", "Id")
+    for rid in ("1", "2"):
+        recipes.put_item(Item={"Id": rid, "Title": f"Recipe {rid}", "Snippet": "old",
+                               "UpdatedAt": "2025-01-01T00:00:00Z"})
+    create_table("Favorites", "UserID").put_item(Item={"UserID": "u1", "RecipeIDs": {"1", "2"}})
+    return recipes
+
+def get(etag=None, **qs):
+    event = {"requestContext": {"authorizer": {"claims": {"sub": "u1"}}},
+             "queryStringParameters": qs, "headers": {"If-None-Match": etag} if etag else {}}
+    return get_favorites.lambda_handler(event, None)
+
+def test_edited_recipe_changes_the_etag(favorites):
+    first = get(fields="card")
+    etag  = first["headers"]["ETag"]
+    assert get(etag, fields="card")["statusCode"] == 304
+
+    favorites.update_item(Key={"Id": "2"}, UpdateExpression="SET Snippet = :s, UpdatedAt = :u",
+                          ExpressionAttributeValues={":s": "new", ":u": "2025-06-01T00:00:00Z"})
+    cache.recipes.clear()                 # as after the cache TTL
+    resp = get(etag, fields="card")
+    assert resp["statusCode"] == 200 and resp["headers"]["ETag"] != etag
+    assert [r["Snippet"] for r in json.loads(resp["body"])] == ["old", "new"]
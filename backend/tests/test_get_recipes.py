@@ -0,0 +1,46 @@
+import json
+import pytest
+import get_recipes
+from cookify import aws, decode_key
+
+@pytest.fixture
+def catalog(create_table):
+    table = create_table("Recipes", "Id")
+    with table.batch_writer() as batch:
+        for i in range(25):
+            batch.put_item(Item={"Id": str(i), "Title": f"R{i}", "InstructionsText": "<p>long</p>"})
+
+def get(**qs):
+    return get_recipes.lambda_handler({"queryStringParameters": qs}, None)
+
+def test_default_get_is_one_bounded_page(catalog):
+    seen, last_key = [], None
+    while True:
+        resp = get(pageSize="10", **({"lastKey": last_key} if last_key else {}))
+        body = json.loads(resp["body"])
+        assert resp["statusCode"] == 200 and len(body["items"]) <= 10
+        seen += [r["Id"] for r in body["items"]]
+        last_key = body["lastKey"]
+        if not last_key:
+            break
+    assert sorted(seen, key=int) == [str(i) for i in range(25)]
+
+@pytest.mark.parametrize("page_size", ["lots", "1.5"])
+def test_bad_page_size_is_a_400(catalog, page_size):
+    assert get(pageSize=page_size)["statusCode"] == 400
+
+def test_ndjson_page_carries_its_cursor_in_a_header(catalog):
+    resp  = get(format="ndjson", pageSize="5", fields="card")
+    lines = resp["body"].splitlines()
+    assert resp["headers"]["Content-Type"] == "application/x-ndjson"
+    assert len(lines) == 5 and "InstructionsText" not in json.loads(lines[0])
+    assert decode_key(resp["headers"]["X-Last-Key"])
+
+def test_export_streams_the_whole_catalog_to_s3(catalog, monkeypatch):
+    aws.client("s3").create_bucket(Bucket="exports")
+    monkeypatch.setattr(get_recipes, "EXPORT_BUCKET", "exports")
+    body = json.loads(get(export="s3")["body"])
+    assert body["count"] == 25
+    data = aws.client("s3").get_object(Bucket="exports", Key=body["key"])["Body"].read()
+    assert sorted(json.loads(line)["Id"] for line in data.decode().splitlines()) == \
+        sorted(str(i) for i in range(25))
@@ -0,0 +1,44 @@
+import json
+import pytest
+import get_reciews
+
+@pytest.fixture
+def reviews(create_table):
+    table = create_table("Reviews", "RecipeId", "CreatedAt")
+    for i in range(5):
+        table.put_item(Item={"RecipeId": "1", "CreatedAt": f"2025-02-01T00:00:0{i}Z",
+                             "UserId": f"u{i}", "ReviewText": "ok"})
+    return table
+
+def get(**qs):
+    resp = get_reciews.lambda_handler({"pathParameters": {"recipeId": "1"},
+                                       "queryStringParameters": qs}, None)
+    return resp["statusCode"], json.loads(resp["body"])
+
+@pytest.mark.parametrize("page_size", ["many", "3.0"])
+def test_bad_page_size_is_a_400(reviews, page_size):
+    assert get(pageSize=page_size)[0] == 400
+
+def test_pages_and_since(reviews):
+    status, body = get(pageSize="0")
+    assert status == 200 and len(body["items"]) == 1 and body["lastKey"]
+    _, body = get(since="2025-02-01T00:00:02Z")
+    assert [r["UserId"] for r in body["items"]] == ["u4", "u3"]
+
+def test_etag_revalidation(reviews):
+    def fetch(headers=None):
+        return get_reciews.lambda_handler({"pathParameters": {"recipeId": "1"},
+                                           "queryStringParameters": {"pageSize": "3"},
+                                           "headers": headers or {}}, None)
+    first = fetch()
+    etag = first["headers"]["ETag"]
+    assert first["statusCode"] == 200 and first["headers"]["Cache-Control"]
+
+    unchanged = fetch({"If-None-Match": etag})
+    assert unchanged["statusCode"] == 304 and unchanged["body"] == ""
+
+    reviews.put_item(Item={"RecipeId": "1", "CreatedAt": "2025-02-02T00:00:00Z",
+                           "UserId": "u9", "ReviewText": "new"})
+    changed = fetch({"If-None-Match": etag})
+    assert changed["statusCode"] == 200 and changed["headers"]["ETag"] != etag
+    assert json.loads(changed["body"])["items"][0]["UserId"] == "u9"
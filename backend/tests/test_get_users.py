@@ -0,0 +1,36 @@
+import json
+import pytest
+import get_users
+
+ADMIN = {"sub": "admin", "cognito:groups": "Admin"}
+
+@pytest.fixture
+def users(create_table, monkeypatch):
+    table = create_table("Users", "UserID")
+    with table.batch_writer() as batch:
+        for i in range(130):
+            batch.put_item(Item={"UserID": f"u{i:03}", "email": f"user{i}@example.com",
+                                 "user_name": f"user{i}", "password_hint": "x"})
+    return table
+
+def get(claims=ADMIN, **qs):
+    resp = get_users.lambda_handler({"requestContext": {"authorizer": {"claims": claims}},
+                                     "queryStringParameters": qs}, None)
+    return resp["statusCode"], json.loads(resp["body"])
+
+def test_default_listing_is_one_page(users):
+    status, body = get()
+    assert status == 200
+    assert len(body["items"]) == get_users.DEFAULT_PAGE_SIZE and body["lastKey"]
+    assert set(body["items"][0]) == set(get_users.USER_FIELDS)
+
+    _, rest = get(lastKey=body["lastKey"])
+    ids = {u["UserID"] for u in body["items"] + rest["items"]}
+    assert len(ids) == 130 and rest["lastKey"] is None
+
+@pytest.mark.parametrize("page_size", ["all", "2.5"])
+def test_bad_page_size_is_a_400(users, page_size):
+    assert get(pageSize=page_size)[0] == 400
+
+def test_admins_only(users):
+    assert get(claims={"sub": "u001"})[0] == 403
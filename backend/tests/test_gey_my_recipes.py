@@ -0,0 +1,31 @@
+import json
+import pytest
+import gey_my_recipes
+from cookify import recipes
+
+@pytest.fixture
+def mine(create_table):
+    table = create_table("Recipes", "Id",
+                         indexes={recipes.MY_RECIPES_INDEX: ("CreatedByUserId", "CreatedAt")})
+    for i in range(5):
+        table.put_item(Item={"Id": str(i), "CreatedByUserId": "u1" if i != 2 else "u2",
+                             "CreatedAt": f"2025-02-01T00:00:0{i}Z", "Title": f"R{i}"})
+
+def get(**qs):
+    resp = gey_my_recipes.lambda_handler({"pathParameters": {"user-id": "u1"},
+                                          "queryStringParameters": qs}, None)
+    return resp["statusCode"], json.loads(resp["body"])
+
+def test_all_recipes_newest_first(mine):
+    status, body = get()
+    assert status == 200 and [r["Id"] for r in body] == ["4", "3", "1", "0"]
+
+def test_pages(mine):
+    _, first = get(pageSize="3")
+    _, rest = get(pageSize="3", lastKey=first["lastKey"])
+    assert [r["Id"] for r in first["items"] + rest["items"]] == ["4", "3", "1", "0"]
+    assert rest["lastKey"] is None
+
+@pytest.mark.parametrize("page_size", ["ten", "2.5"])
+def test_bad_page_size_is_a_400(mine, page_size):
+    assert get(pageSize=page_size)[0] == 400
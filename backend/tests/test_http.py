@@ -0,0 +1,85 @@
+import time
+import socket
+import threading
+import http.client
+import pytest
+from cookify.http import HttpClient, CircuitBreaker, Deadline, DeadlineExceeded
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """
+    One-shot plain-HTTP server on localhost; `serve(chunks)` sends each
+    (delay, bytes) in turn on the next connection and returns an HttpClient.
+    """
+    monkeypatch.setattr(http.client, "HTTPSConnection", http.client.HTTPConnection)
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(4)
+    threads = []
+
+    def serve(chunks, breaker=None):
+        def run():
+            conn, _ = listener.accept()
+            with conn:
+                conn.recv(65536)
+                try:
+                    for delay, data in chunks:
+                        time.sleep(delay)
+                        conn.sendall(data)
+                    # EOF before close: an unread request body would turn the close into a reset
+                    conn.shutdown(socket.SHUT_WR)
+                except OSError:
+                    return                  # the client gave up on us
+                time.sleep(0.5)
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        threads.append(thread)
+        host = "127.0.0.1:%d" % listener.getsockname()[1]
+        return HttpClient(host, max_attempts=1, breaker=breaker or CircuitBreaker())
+
+    yield serve
+    for thread in threads:
+        thread.join(2)
+    listener.close()
+
+def headers(length=None):
+    framing = f"Content-Length: {length}" if length is not None else "Connection: close"
+    return f"HTTP/1.1 200 OK\r\n{framing}\r\n\r\n".encode()
+
+def test_body_is_read_before_success_is_recorded(upstream):
+    client = upstream([(0, headers(5) + b"hello")])
+    client.breaker.failures = 2
+    assert client.request("GET", "/", Deadline(2)) == (200, b"hello")
+    assert client.breaker.failures == 0
+
+def test_stall_after_headers_is_a_timed_out_failure(upstream):
+    client = upstream([(0, headers(10) + b"half"), (1, b"rest!!")])
+    with pytest.raises(DeadlineExceeded):
+        client.request("GET", "/", Deadline(0.3))
+    assert client.breaker.failures == 1
+
+def test_deadline_bounds_the_whole_body_not_each_read(upstream):
+    # every read finishes well inside the deadline; the body as a whole does not
+    client = upstream([(0, headers(20))] + [(0.1, b"xx")] * 10)
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        client.request("GET", "/", Deadline(0.35))
+    assert time.monotonic() - started < 0.6
+    assert client.breaker.failures == 1
+
+def test_stream_failure_mid_body_reaches_the_breaker(upstream):
+    client = upstream([(0, headers() + b"data: 1\n"), (1, b"data: 2\n")])
+    lines = []
+    with pytest.raises(DeadlineExceeded):
+        with client.stream("POST", "/", Deadline(0.3), body=b"{}") as stream:
+            lines.extend(stream)
+    assert lines == [b"data: 1\n"]
+    assert client.breaker.failures == 1
+
+def test_stream_success_is_recorded_at_the_end(upstream):
+    client = upstream([(0, headers() + b"data: 1\ndata: 2\n")])
+    client.breaker.failures = 2
+    with client.stream("POST", "/", Deadline(2), body=b"{}") as stream:
+        assert client.breaker.failures == 2
+        assert list(stream) == [b"data: 1\n", b"data: 2\n"]
+    assert client.breaker.failures == 0
@@ -0,0 +1,70 @@
+import os
+import sys
+import json
+import argparse
+import importlib
+import pytest
+from cookify import aws
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts")
+
+@pytest.fixture
+def importer(create_table, monkeypatch):
+    create_table("Recipes", "Id")
+    create_table("Counters", "Name").put_item(Item={"Name": "RecipeId", "Value": 100})
+    monkeypatch.syspath_prepend(SCRIPTS_DIR)
+    return importlib.import_module("import_recipes")
+
+def write_input(tmp_path, n, bad=()):
+    path = tmp_path / "recipes.ndjson"
+    with open(path, "w") as f:
+        for i in range(n):
+            record = {"Title": f"Recipe {i}", "InstructionsText": "<p>Mix.</p>",
+                      "CreatedByUserId": "u1", "Vegan": "yes" if i % 2 else "no"}
+            if i in bad:
+                del record["Title"]
+            f.write(json.dumps(record) + "\n")
+    return str(path)
+
+def args_for(path, **kw):
+    return argparse.Namespace(input=path, format=None, owner=None, workers=4,
+                              chunk_size=50, checkpoint=path + ".ckpt", **kw)
+
+def stored_ids():
+    items = aws.table("Recipes").scan(ProjectionExpression="Id")["Items"]
+    return sorted(int(i["Id"]) for i in items)
+
+def counter():
+    return int(aws.table("Counters").get_item(Key={"Name": "RecipeId"})["Item"]["Value"])
+
+def test_import_writes_every_valid_record(importer, tmp_path):
+    path = write_input(tmp_path, 230, bad={7, 120})
+    importer.run(args_for(path))
+    assert stored_ids() == list(range(101, 101 + 228))
+    assert counter() == 100 + 228
+    # "yes" in the input is stored as "1" and keys the sparse IsVegan index
+    vegan = aws.table("Recipes").scan(ProjectionExpression="Vegan, IsVegan")["Items"]
+    assert all((r["Vegan"] == "1") == (r.get("IsVegan") == "1") for r in vegan)
+    assert sum(r["Vegan"] == "1" for r in vegan) == 114
+    with open(path + ".rejects.ndjson") as f:
+        assert [json.loads(line)["record"] for line in f] == [8, 121]
+
+def test_interrupted_import_resumes_without_duplicates(importer, tmp_path, monkeypatch):
+    path = write_input(tmp_path, 400)
+    real_build, built = importer.build_item, []
+    def crash_midway(data, new_id, created_at):
+        built.append(new_id)
+        if len(built) == 220:            # a worker dies inside a chunk
+            raise KeyboardInterrupt
+        return real_build(data, new_id, created_at)
+    monkeypatch.setattr(importer, "build_item", crash_midway)
+    with pytest.raises(KeyboardInterrupt):
+        importer.run(args_for(path))
+    partial = stored_ids()
+    assert 0 < len(partial) < 400
+
+    monkeypatch.setattr(importer, "build_item", real_build)
+    importer.run(args_for(path))
+    assert stored_ids() == list(range(101, 501))
+    # no chunk reserved its Ids twice
+    assert counter() == 500
@@ -0,0 +1,44 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import post_recipe
+
+THREADS = 16
+PER_THREAD = 25
+
+@pytest.fixture
+def tables(create_table, monkeypatch):
+    monkeypatch.setattr(post_recipe, "SEARCH_BUCKET", None)
+    monkeypatch.setattr(post_recipe, "_id_block", {"next": 1, "end": 0})
+    create_table("Counters", "Name")
+    return create_table("Recipes", "Id")
+
+def body(n):
+    return {"body": json.dumps({"Title": f"Recipe {n}", "InstructionsText": "<p>Mix.</p>",
+                                "CreatedByUserId": "u1"})}
+
+def test_reserve_ids_from_many_threads_never_overlap(tables):
+    def reserve(n):
+        return [post_recipe.reserve_ids(1 + n % 3) for _ in range(PER_THREAD)]
+    with ThreadPoolExecutor(THREADS) as pool:
+        ranges = [r for rs in pool.map(reserve, range(THREADS)) for r in rs]
+    ids = [i for first, last in ranges for i in range(first, last + 1)]
+    assert len(ids) == len(set(ids))
+    assert sorted(ids) == list(range(1, len(ids) + 1))
+
+@pytest.mark.parametrize("block", [1, 7])
+def test_concurrent_posts_get_unique_ids(tables, monkeypatch, block):
+    monkeypatch.setattr(post_recipe, "ID_BLOCK_SIZE", block)
+    with ThreadPoolExecutor(THREADS) as pool:
+        responses = list(pool.map(lambda n: post_recipe.lambda_handler(body(n), None),
+                                  range(THREADS * PER_THREAD)))
+    assert {r["statusCode"] for r in responses} == {201}
+    ids = [json.loads(r["body"])["Id"] for r in responses]
+    assert len(ids) == len(set(ids))
+    assert tables.scan(Select="COUNT")["Count"] == len(ids)
+
+def test_unseeded_counter_skips_taken_ids(tables):
+    tables.put_item(Item={"Id": "1", "Title": "existing"})
+    resp = post_recipe.lambda_handler(body(0), None)
+    assert resp["statusCode"] == 201
+    assert json.loads(resp["body"])["Id"] == "2"
@@ -0,0 +1,88 @@
+import json
+import pytest
+import recipe_paginate
+from post_recipe import build_item
+
+@pytest.fixture
+def recipes(create_table):
+    indexes = {recipe_paginate.CATEGORY_INDEX: ("CategoryId", None),
+               recipe_paginate.CUISINE_INDEX: ("Couisine", None),
+               **{name: (f"Is{flag}", None) for flag, name in recipe_paginate.DIET_INDEXES.items()}}
+    table = create_table("Recipes", "Id", indexes=indexes)
+    with table.batch_writer() as batch:
+        for i in range(1, 601):
+            batch.put_item(Item=build_item({
+                "Title": f"Recipe {i}", "InstructionsText": "Mix.", "CreatedByUserId": "u1",
+                "CategoryId": f"c{i % 3}",
+                # sparse: one vegan recipe in 25
+                "Vegan": "1" if i % 25 == 0 else "0",
+                "GlutenFree": "true" if i % 2 else "NULL",
+            }, str(i), "2025-01-01T00:00:00Z"))
+    return table
+
+def get(**qs):
+    resp = recipe_paginate.lambda_handler({"queryStringParameters": qs}, None)
+    return resp["statusCode"], json.loads(resp["body"]) if resp["body"] else None
+
+def all_pages(**qs):
+    ids, calls, last = [], 0, None
+    while True:
+        status, body = get(**qs, **({"lastKey": last} if last else {}))
+        assert status == 200
+        calls += 1
+        ids += [r["Id"] for r in body["items"]]
+        last = body["lastKey"]
+        if not last:
+            return ids, calls
+
+def test_diet_only_filter_reads_the_sparse_index(recipes, monkeypatch):
+    reads = []
+    real = recipes.query
+    monkeypatch.setattr(recipes, "query", lambda **kw: reads.append(kw) or real(**kw))
+    monkeypatch.setattr(recipes, "scan", lambda **kw: pytest.fail("diet filter scanned the table"))
+    status, body = get(vegan="1", pageSize="30", fields="card")
+    assert status == 200
+    assert sorted(int(r["Id"]) for r in body["items"]) == list(range(25, 601, 25))
+    assert body["lastKey"] is None
+    assert [kw["IndexName"] for kw in reads] == ["IsVegan-index"]
+
+def test_sparse_filter_is_bounded_and_resumes(recipes, monkeypatch):
+    monkeypatch.setattr(recipe_paginate, "FILTER_READ_AHEAD", 20)
+    monkeypatch.setattr(recipe_paginate, "MAX_READ_ROUNDS", 2)
+    # category c0 holds 200 recipes, 8 of them vegan: at most 2 reads per request,
+    # so pages come back short with a cursor until the category is exhausted
+    ids, calls = all_pages(category="c0", vegan="1", pageSize="10")
+    assert sorted(map(int, ids)) == list(range(75, 601, 75))
+    assert calls >= 200 // (20 * 2)
+
+def test_combined_diet_flags(recipes):
+    ids, _ = all_pages(vegan="1", glutenfree="1", pageSize="5")
+    assert sorted(map(int, ids)) == list(range(25, 601, 50))
+
+@pytest.mark.parametrize("page_size", ["abc", "1.5"])
+def test_bad_page_size_is_a_400(recipes, page_size):
+    assert get(pageSize=page_size)[0] == 400
+
+def test_page_size_is_clamped(recipes):
+    status, body = get(pageSize="0")
+    assert status == 200 and len(body["items"]) == 1
+    status, body = get(pageSize="1000")
+    assert len(body["items"]) == recipe_paginate.MAX_PAGE_SIZE
+
+def test_etag_revalidation(recipes):
+    def fetch(headers=None):
+        return recipe_paginate.lambda_handler({"queryStringParameters": {"category": "c1", "pageSize": "5"},
+                                               "headers": headers or {}}, None)
+    first = fetch()
+    etag = first["headers"]["ETag"]
+    assert first["statusCode"] == 200 and first["headers"]["Cache-Control"]
+
+    unchanged = fetch({"If-None-Match": etag})
+    assert unchanged["statusCode"] == 304 and unchanged["body"] == ""
+    assert fetch({"if-none-match": etag[2:]})["statusCode"] == 304     # strong form, any case
+
+    item = recipes.get_item(Key={"Id": json.loads(first["body"])["items"][0]["Id"]})["Item"]
+    recipes.put_item(Item={**item, "Title": "Renamed"})
+    changed = fetch({"If-None-Match": etag})
+    assert changed["statusCode"] == 200 and changed["headers"]["ETag"] != etag
+    assert "Renamed" in changed["body"]
@@ -0,0 +1,15 @@
+from cookify import recipes
+
+def test_favorite_ids_are_sorted_by_id(create_table):
+    favorites = create_table("Favorites", "UserID")
+    favorites.put_item(Item={"UserID": "u1", "RecipeIDs": {"10", "9", "100", "2", "x1"}})
+    assert recipes.favorite_ids("u1") == ["2", "9", "10", "100", "x1"]
+    assert recipes.favorite_ids("nobody") == []
+
+def test_fetch_recipes_keeps_the_requested_order(create_table):
+    table = create_table("Recipes", "Id")
+    for rid in ("1", "2", "3"):
+        table.put_item(Item={"Id": rid, "Title": f"Recipe {rid}", "InstructionsText": "x"})
+    got = recipes.fetch_recipes(["3", "missing", "1", "2"], "card")
+    assert [r["Id"] for r in got] == ["3", "1", "2"]
+    assert all("InstructionsText" not in r for r in got)
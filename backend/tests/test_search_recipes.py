@@ -0,0 +1,61 @@
+import json
+import pytest
+import search_recipes
+from cookify import aws
+
+BUCKET = "search-test"
+
+def recipe(rid, title):
+    return {"Id": rid, "Title": title, "Summery": "", "InstructionsText": f"<p>{title}</p>"}
+
+def publish_index(tmp_path, recipes):
+    path = str(tmp_path / "build.idx")
+    search_recipes.write_index(((r["Id"], r["Title"], search_recipes.document_terms(r))
+                                for r in recipes), path)
+    aws.client("s3").upload_file(path, BUCKET, search_recipes.SEARCH_INDEX_KEY)
+
+def post_delta(r):
+    aws.client("s3").put_object(Bucket=BUCKET, Body=json.dumps(r),
+                                Key=f"{search_recipes.SEARCH_DELTA_PREFIX}{r['Id']}.json")
+
+def search(q, **qs):
+    resp = search_recipes.lambda_handler({"queryStringParameters": {"q": q, **qs}}, None)
+    return resp["statusCode"], json.loads(resp["body"])
+
+@pytest.fixture
+def bucket(stand_in, tmp_path, monkeypatch):
+    aws.client("s3").create_bucket(Bucket=BUCKET)
+    monkeypatch.setattr(search_recipes, "SEARCH_BUCKET", BUCKET)
+    monkeypatch.setattr(search_recipes, "LOCAL_INDEX_PATH", str(tmp_path / "recipes.idx"))
+    monkeypatch.setattr(search_recipes, "DELTA_REFRESH_SECONDS", 0)
+    monkeypatch.setattr(search_recipes, "_state", {
+        "base": None, "base_ids": set(), "base_etag": None,
+        "delta": search_recipes.DeltaIndex(), "delta_docs": {}, "delta_loaded_at": None,
+    })
+    yield
+    if search_recipes._state["base"] is not None:
+        search_recipes._state["base"].close()
+
+def test_recipes_merged_into_a_rebuilt_index_stay_searchable(bucket, tmp_path):
+    base = [recipe("1", "garlic butter pasta"), recipe("2", "lemon rice")]
+    publish_index(tmp_path, base)
+    post_delta(recipe("3", "garlic prawns"))
+    assert {r["Id"] for r in search("garlic")[1]["items"]} == {"1", "3"}
+
+    # incremental build: new index with the delta in it, then the delta is deleted
+    publish_index(tmp_path, base + [recipe("3", "garlic prawns")])
+    aws.client("s3").delete_object(Bucket=BUCKET,
+                                   Key=f"{search_recipes.SEARCH_DELTA_PREFIX}3.json")
+    assert {r["Id"] for r in search("garlic")[1]["items"]} == {"1", "3"}
+    assert len(search_recipes._state["base"]) == 3
+
+def test_unchanged_index_is_not_downloaded_again(bucket, tmp_path, monkeypatch):
+    publish_index(tmp_path, [recipe("1", "garlic butter pasta")])
+    search("garlic")
+    monkeypatch.setattr(search_recipes, "fetch_base_index",
+                        lambda: pytest.fail("index re-downloaded without a change"))
+    assert search("garlic")[0] == 200
+
+@pytest.mark.parametrize("limit", ["ten", "2.5"])
+def test_bad_limit_is_a_400(bucket, limit):
+    assert search("garlic", limit=limit)[0] == 400
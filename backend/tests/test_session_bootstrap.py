@@ -0,0 +1,48 @@
+import json
+import pytest
+import session_bootstrap
+from cookify import recipes
+
+@pytest.fixture
+def tables(create_table):
+    create_table("Users", "UserID")
+    create_table("Favorites", "UserID").put_item(Item={"UserID": "u1", "RecipeIDs": {"3", "1"}})
+    table = create_table("Recipes", "Id",
+                         indexes={recipes.MY_RECIPES_INDEX: ("CreatedByUserId", "CreatedAt")})
+    for i in range(5):
+        table.put_item(Item={"Id": str(i), "Title": f"R{i}", "InstructionsText": "<p>long</p>",
+                             "CreatedByUserId": "u1", "CreatedAt": f"2025-02-01T00:00:0{i}Z"})
+
+def login(sub="u1", email="u1@example.com", **qs):
+    claims = {"sub": sub, "email": email, "cognito:username": sub}
+    resp = session_bootstrap.lambda_handler(
+        {"requestContext": {"authorizer": {"claims": claims}}, "queryStringParameters": qs}, None)
+    return resp["statusCode"], json.loads(resp["body"])
+
+def test_first_login_creates_the_user(tables):
+    status, body = login()
+    assert status == 200 and body["created"] is True
+    assert body["user"] == {"UserID": "u1", "email": "u1@example.com", "user_name": "u1"}
+
+def test_repeat_login_returns_the_stored_user(tables):
+    login()
+    status, body = login(email="changed@example.com")
+    assert status == 200 and body["created"] is False
+    assert body["user"]["email"] == "u1@example.com"       # from the failed condition, not the claims
+
+def test_payload_carries_favorites_and_a_page_of_my_recipes(tables):
+    _, body = login(pageSize="2")
+    assert body["favorites"]["ids"] == ["1", "3"]
+    assert [r["Id"] for r in body["favorites"]["items"]] == ["1", "3"]
+    assert all("InstructionsText" not in r for r in body["favorites"]["items"])
+
+    mine = body["myRecipes"]
+    assert [r["Id"] for r in mine["items"]] == ["4", "3"] and mine["lastKey"]
+
+    _, full = login(fields="all")
+    assert all(r["InstructionsText"] for r in full["favorites"]["items"])
+
+def test_unauthenticated_and_bad_page_size(tables):
+    resp = session_bootstrap.lambda_handler({"queryStringParameters": {}}, None)
+    assert resp["statusCode"] == 401
+    assert login(pageSize="many")[0] == 400
@@ -0,0 +1,164 @@
+import os
+import sys
+import json
+import importlib
+import pytest
+from cookify import aws, stats
+import post_review
+import get_reciews
+import post_favorites
+import remove_favorite
+import batch_favorites
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts")
+
+@pytest.fixture
+def tables(create_table):
+    create_table("Reviews", "RecipeId", "CreatedAt",
+                 indexes={post_review.USER_INDEX: ("RecipeId", "UserId")})
+    create_table("RecipeStats", "RecipeId")
+    create_table("Favorites", "UserID")
+
+def event(user, body):
+    return {"requestContext": {"authorizer": {"claims": {"sub": user, "cognito:username": user}}},
+            "pathParameters": {"recipeId": "r1"}, "body": json.dumps(body)}
+
+def review(user, text="Great"):
+    resp = post_review.lambda_handler(event(user, {"ReviewText": text}), None)
+    return resp["statusCode"], json.loads(resp["body"])
+
+def favorite(handler, user, rid="r1"):
+    return handler.lambda_handler(event(user, {"RecipeId": rid}), None)["statusCode"]
+
+def counts(rid="r1"):
+    s = stats.fetch_stats([rid])[rid]
+    return s["ReviewCount"], s["FavoriteCount"]
+
+def test_retried_review_post_counts_once(tables):
+    status, first = review("alice")
+    assert status == 201
+    status, again = review("alice")            # client retry: new CreatedAt, same request
+    assert status == 200 and again["CreatedAt"] == first["CreatedAt"]
+    assert review("alice", "Changed my mind")[0] == 409
+    assert counts() == (1, 0)
+    assert review("bob")[0] == 201
+    assert counts() == (2, 0)
+    assert aws.table("Reviews").scan(Select="COUNT")["Count"] == 2
+    # one guard item per reviewer; the per-recipe item does not grow with them
+    guard = aws.table("RecipeStats").get_item(Key={"RecipeId": stats.reviewer_key("r1", "alice")})
+    assert guard["Item"]["CreatedAt"] == first["CreatedAt"]
+    item = aws.table("RecipeStats").get_item(Key={"RecipeId": "r1"})["Item"]
+    assert "Reviewers" not in item
+
+def test_own_review_is_found_past_the_first_page(tables):
+    review("alice", "mine")
+    for i in range(25):
+        review(f"user{i}")
+    resp = get_reciews.lambda_handler({"pathParameters": {"recipeId": "r1"},
+                                       "queryStringParameters": {"userId": "alice"}}, None)
+    body = json.loads(resp["body"])
+    assert [r["ReviewText"] for r in body["items"]] == ["mine"]
+    assert "Cache-Control" not in resp["headers"]
+    assert stats.find_review("r1", "nobody") is None
+
+def test_latest_review_and_snippet(tables):
+    review("alice", "first " * 50)
+    review("bob", "second")
+    latest = stats.fetch_stats(["r1"])["r1"]["LatestReview"]
+    assert latest["Username"] == "bob" and latest["Snippet"] == "second"
+
+def test_favorite_add_and_remove_are_idempotent(tables):
+    for _ in range(2):
+        assert favorite(post_favorites, "alice") == 200
+    assert counts() == (0, 1)
+    for _ in range(2):
+        assert favorite(remove_favorite, "alice") == 200
+    assert counts() == (0, 0)
+
+def batch(user, **body):
+    resp = batch_favorites.lambda_handler(event(user, body), None)
+    return resp["statusCode"], json.loads(resp["body"])
+
+def favorite_counts(*rids):
+    got = stats.fetch_stats(rids)
+    return [got[rid]["FavoriteCount"] for rid in rids]
+
+def test_batch_favorites_move_the_counters(tables):
+    status, body = batch("alice", add=["a", "b", "c"])
+    assert status == 200 and body == {"RecipeIDs": ["a", "b", "c"], "Version": 1}
+    batch("bob", add=["a"])
+    status, body = batch("alice", add=["d"], remove=["a", "zz"], Version=1)
+    assert body == {"RecipeIDs": ["b", "c", "d"], "Version": 2}
+    assert favorite_counts("a", "b", "c", "d", "zz") == [1, 1, 1, 1, 0]
+
+def test_clear_then_add_replaces_the_set(tables):
+    batch("alice", add=["a", "b"])
+    status, body = batch("alice", clear=True, add=["b", "c"])
+    assert status == 200 and body["RecipeIDs"] == ["b", "c"]
+    assert favorite_counts("a", "b", "c") == [0, 1, 1]
+    status, body = batch("alice", clear=True)
+    assert body == {"RecipeIDs": [], "Version": 3}
+    assert favorite_counts("a", "b", "c") == [0, 0, 0]
+
+def test_stale_version_is_a_409_with_the_current_state(tables):
+    batch("alice", add=["a"])
+    batch("alice", add=["b"])
+    status, body = batch("alice", add=["c"], Version=1)
+    assert status == 409
+    assert body["RecipeIDs"] == ["a", "b"] and body["Version"] == 2
+    assert favorite_counts("c") == [0]
+
+def test_stats_dicts_are_not_shared(tables):
+    got = stats.fetch_stats(["a", "b"])
+    assert got["a"] == got["b"] == {"ReviewCount": 0, "FavoriteCount": 0, "LatestReview": None}
+    got["a"]["ReviewCount"] = 5
+    assert got["b"]["ReviewCount"] == 0
+
+def test_unprocessed_stats_keys_raise(tables, monkeypatch):
+    client = aws.client("dynamodb")
+    monkeypatch.setattr(aws.time, "sleep", lambda s: None)
+    monkeypatch.setattr(client, "batch_get_item", lambda RequestItems: {
+        "Responses": {}, "UnprocessedKeys": RequestItems})
+    with pytest.raises(RuntimeError, match="unprocessed"):
+        stats.fetch_stats(["a"])
+
+def _cancelled(code):
+    return aws.client("dynamodb").exceptions.TransactionCanceledException(
+        {"Error": {"Code": "TransactionCanceledException", "Message": code},
+         "CancellationReasons": [{"Code": code}]}, "TransactWriteItems")
+
+def test_contention_is_retried_then_reported(tables, monkeypatch):
+    client = aws.client("dynamodb")
+    real, calls = client.transact_write_items, []
+    def flaky(**kw):
+        calls.append(1)
+        if len(calls) < 3:
+            raise _cancelled("TransactionConflict")
+        return real(**kw)
+    monkeypatch.setattr(stats.time, "sleep", lambda s: None)
+    monkeypatch.setattr(client, "transact_write_items", flaky)
+    assert review("alice")[0] == 201 and len(calls) == 3
+
+    def always(**kw):
+        raise _cancelled("TransactionConflict")
+    monkeypatch.setattr(client, "transact_write_items", always)
+    assert review("bob")[0] == 503
+    assert favorite(post_favorites, "bob") == 503
+    assert counts() == (1, 0)
+
+def test_rebuild_restores_counts_and_the_review_guard(tables, monkeypatch):
+    review("alice")
+    review("bob")
+    favorite(post_favorites, "alice")
+    for item in aws.table("RecipeStats").scan()["Items"]:
+        aws.table("RecipeStats").delete_item(Key={"RecipeId": item["RecipeId"]})
+
+    monkeypatch.syspath_prepend(SCRIPTS_DIR)
+    rebuild = importlib.import_module("rebuild_recipe_stats")
+    monkeypatch.setattr(rebuild, "client", aws.client("dynamodb"))
+    monkeypatch.setattr(rebuild, "dynamodb", aws.resource("dynamodb"))
+    rebuild.main()
+    assert counts() == (2, 1)
+    assert aws.table("RecipeStats").scan(Select="COUNT")["Count"] == 3    # r1 + two guards
+    assert review("alice", "again")[0] == 409
+    assert counts() == (2, 1)
@@ -0,0 +1,82 @@
+import os
+import json
+import importlib
+import pytest
+from cookify import aws, trending
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts")
+
+T0   = 1740787200                          # 2025-03-01
+HL   = trending.HALF_LIFE_SEC
+YEAR = 365 * 86400
+
+@pytest.fixture
+def tables(create_table):
+    create_table("RecipeStats", "RecipeId")
+    create_table("Trending", "Name")
+    create_table("Recipes", "Id")
+    with aws.table("Recipes").batch_writer() as batch:
+        for rid, cat in (("1", "c1"), ("2", "c1"), ("3", "c2")):
+            batch.put_item(Item={"Id": rid, "Title": f"Recipe {rid}", "CategoryId": cat})
+
+def favorites(user, old, new, ts):
+    image = lambda ids: {"UserID": {"S": user}, **({"RecipeIDs": {"SS": ids}} if ids else {})}
+    ddb = {"ApproximateCreationDateTime": ts, "NewImage": image(new)}
+    if old:
+        ddb["OldImage"] = image(old)
+    return {"eventName": "MODIFY" if old else "INSERT", "dynamodb": ddb,
+            "eventSourceARN": "arn:aws:dynamodb:us-east-1:1:table/Favorites/stream/x"}
+
+def review(rid, ts):
+    return {"eventName": "INSERT",
+            "dynamodb": {"ApproximateCreationDateTime": ts,
+                         "NewImage": {"RecipeId": {"S": rid}, "UserId": {"S": "u"}}},
+            "eventSourceARN": "arn:aws:dynamodb:us-east-1:1:table/Reviews/stream/x"}
+
+def stored(rid):
+    item = aws.table("RecipeStats").get_item(Key={"RecipeId": rid})["Item"]
+    return float(item["TrendScore"]), float(item["TrendFavorites"]), float(item["TrendAt"])
+
+def board_scores(now):
+    board, _ = trending.read_board()
+    return {e["Id"]: e["Score"] for e in trending.ranked(board["Global"], 50, board["At"], now)}
+
+def test_scores_stay_small_across_a_long_gap(tables):
+    trending.process_records([favorites("a", [], ["1"], T0), review("1", T0)])
+    assert stored("1") == (5.0, 3.0, T0)
+
+    later = T0 + 10 * YEAR                 # a decade on: the old events are long gone
+    trending.process_records([review("1", later), review("3", later)])
+    assert stored("1") == (2.0, 0.0, later)
+    assert board_scores(later) == {"1": 2.0, "3": 2.0}
+    assert board_scores(later + HL) == {"1": 1.0, "3": 1.0}
+
+def test_remove_after_add_never_goes_negative(tables):
+    trending.process_records([favorites("a", [], ["1", "2"], T0)])
+    # both favorites removed two half-lives later, recipe 1 reviewed meanwhile
+    trending.process_records([review("1", T0 + 2 * HL),
+                              favorites("a", ["1", "2"], [], T0 + 2 * HL)])
+    assert stored("1") == (2.0, 0.0, T0 + 2 * HL)
+    assert stored("2") == (0.0, 0.0, T0 + 2 * HL)
+    assert board_scores(T0 + 2 * HL) == {"1": 2.0}
+
+def test_late_event_is_weighed_as_of_the_stored_trend(tables):
+    trending.process_records([review("1", T0 + HL)])
+    trending.process_records([review("1", T0)])         # delivered out of order
+    assert stored("1") == (3.0, 0.0, T0 + HL)
+
+def test_unprocessed_board_metadata_raises(tables, monkeypatch):
+    client = aws.client("dynamodb")
+    monkeypatch.setattr(aws.time, "sleep", lambda s: None)
+    monkeypatch.setattr(client, "batch_get_item", lambda RequestItems: {
+        "Responses": {}, "UnprocessedKeys": RequestItems})
+    with pytest.raises(RuntimeError, match="unprocessed"):
+        trending.recipe_meta(["1", "2"])
+
+def test_replay_matches_the_recorded_fixture(stand_in, monkeypatch):
+    monkeypatch.syspath_prepend(SCRIPTS_DIR)
+    replay = importlib.import_module("replay_trending_stream")
+    importlib.import_module("get_trending")._board.clear()     # no board from an earlier test
+    with open(replay.DEFAULT_EVENTS) as f:
+        fixture = json.load(f)
+    assert replay.replay(fixture, show=False)
@@ -1,54 +1,318 @@
+import io
 import os
+import re
+import json
+import math
+import time
+import base64
+import hashlib
 import zipfile
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import boto3
 
-LAMBDA_FOLDER = "lambdas"
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LAMBDA_FOLDER = os.path.join(BASE_DIR, "lambdas")
+SHARED_PACKAGE = "cookify"          # shared runtime, shipped as a layer
+LAYER_NAME = "cookify-shared"
 ROLE_ARN = "arn:aws:iam::<YOUR_ACCOUNT_ID>:role/LabRole"  # 🔁 Replace with your actual role
 RUNTIME = "python3.11"
 REGION = "us-east-1"  # change if needed
+DEPLOY_WORKERS = 6
+MANIFEST = os.path.join(BASE_DIR, "functions.json")
+LIVE_ALIAS = "live"                 # alias that carries provisioned concurrency
+
+# us-east-1 on-demand prices, per GB-second
+GB_SECOND_PRICE = {"x86_64": 0.0000166667, "arm64": 0.0000133334}
+TUNE_MEMORY_SIZES = [128, 256, 512, 1024, 1769, 3008]
+TUNE_WARMUP = 3     # invokes discarded after each memory change (cold start, lazy clients)
 
 lambda_client = boto3.client("lambda", region_name=REGION)
 
-def zip_lambda(file_path, function_name):
-    zip_name = f"{function_name}.zip"
-    with zipfile.ZipFile(zip_name, "w", zipfile.ZIP_DEFLATED) as zipf:
-        zipf.write(file_path, arcname="handler.py")  # rename to handler.py inside zip
-    return zip_name
+# Fixed metadata so an unchanged source always produces byte-identical zips;
+# that is what lets us compare against the CodeSha256 Lambda reports.
+ZIP_DATE = (1980, 1, 1, 0, 0, 0)
+
+def build_zip(files):
+    """files: list of (arcname, source path). Returns deterministic zip bytes."""
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zipf:
+        for arcname, path in sorted(files):
+            info = zipfile.ZipInfo(arcname, date_time=ZIP_DATE)
+            info.external_attr = 0o644 << 16
+            info.compress_type = zipfile.ZIP_DEFLATED
+            with open(path, "rb") as f:
+                zipf.writestr(info, f.read())
+    return buf.getvalue()
+
+def code_sha256(zip_bytes):
+    """Same encoding as Lambda's CodeSha256 (base64 of the raw digest)."""
+    return base64.b64encode(hashlib.sha256(zip_bytes).digest()).decode()
+
+def zip_lambda(file_path):
+    return build_zip([("handler.py", file_path)])  # rename to handler.py inside zip
+
+def zip_layer():
+    """Zip the shared package under python/ so Lambda puts it on sys.path (/opt/python)."""
+    files = []
+    for root, _, names in os.walk(os.path.join(BASE_DIR, SHARED_PACKAGE)):
+        for name in names:
+            if name.endswith(".py"):
+                path = os.path.join(root, name)
+                files.append((os.path.join("python", os.path.relpath(path, BASE_DIR)), path))
+    return build_zip(files)
+
+def ensure_layer():
+    """Publish a new layer version only when the shared package changed."""
+    zip_bytes = zip_layer()
+    versions = lambda_client.list_layer_versions(LayerName=LAYER_NAME).get("LayerVersions", [])
+    if versions:
+        latest = lambda_client.get_layer_version(
+            LayerName=LAYER_NAME, VersionNumber=versions[0]["Version"]
+        )
+        if latest["Content"]["CodeSha256"] == code_sha256(zip_bytes):
+            print(f"⏭️ Layer unchanged: {latest['LayerVersionArn']}")
+            return latest["LayerVersionArn"]
+
+    resp = lambda_client.publish_layer_version(
+        LayerName=LAYER_NAME,
+        Content={"ZipFile": zip_bytes},
+        CompatibleRuntimes=[RUNTIME],
+        CompatibleArchitectures=["x86_64", "arm64"],
+    )
+    print(f"🧩 Published layer: {resp['LayerVersionArn']}")
+    return resp["LayerVersionArn"]
 
-def upload_lambda(function_name, zip_path):
-    with open(zip_path, "rb") as f:
-        zip_bytes = f.read()
+# ---------- manifest -----------------------------------------------------------
+def load_manifest(path=MANIFEST):
+    with open(path) as f:
+        return json.load(f)
 
+def function_spec(manifest, function_name):
+    """Defaults overlaid with the function's own entry (environment is merged too)."""
+    spec = dict(manifest["defaults"])
+    own  = manifest["functions"].get(function_name, {})
+    spec.update(own)
+    spec["environment"] = {**manifest["defaults"].get("environment", {}),
+                           **own.get("environment", {})}
+    return spec
+
+def resolve_environment(wanted, deployed):
+    """Expand ${NAME} from the local environment; keep the deployed value if unset."""
+    resolved = {}
+    for key, value in wanted.items():
+        match = re.fullmatch(r"\$\{(\w+)\}", value)
+        if match:
+            value = os.environ.get(match.group(1), deployed.get(key))
+            if value is None:
+                continue
+        resolved[key] = value
+    return resolved
+
+def wait_updated(function_name):
+    lambda_client.get_waiter("function_updated").wait(FunctionName=function_name)
+
+# ---------- reconcile one function --------------------------------------------
+def reconcile_concurrency(function_name, spec, version):
+    reserved = spec.get("reserved_concurrency")
+    current  = lambda_client.get_function_concurrency(FunctionName=function_name)
+    if current.get("ReservedConcurrentExecutions") != reserved:
+        if reserved is None:
+            lambda_client.delete_function_concurrency(FunctionName=function_name)
+        else:
+            lambda_client.put_function_concurrency(
+                FunctionName=function_name, ReservedConcurrentExecutions=reserved
+            )
+
+    provisioned = spec.get("provisioned_concurrency") or 0
+    if not provisioned:
+        return
+    # provisioned concurrency needs a qualifier: keep the alias on the newest version
     try:
-        lambda_client.update_function_code(
-            FunctionName=function_name,
-            ZipFile=zip_bytes,
-            Publish=True
+        alias = lambda_client.get_alias(FunctionName=function_name, Name=LIVE_ALIAS)
+        if version and alias["FunctionVersion"] != version:
+            lambda_client.update_alias(FunctionName=function_name, Name=LIVE_ALIAS,
+                                       FunctionVersion=version)
+    except lambda_client.exceptions.ResourceNotFoundException:
+        if not version:
+            version = lambda_client.publish_version(FunctionName=function_name)["Version"]
+        lambda_client.create_alias(FunctionName=function_name, Name=LIVE_ALIAS,
+                                   FunctionVersion=version)
+    try:
+        current = lambda_client.get_provisioned_concurrency_config(
+            FunctionName=function_name, Qualifier=LIVE_ALIAS
+        ).get("RequestedProvisionedConcurrentExecutions")
+    except lambda_client.exceptions.ProvisionedConcurrencyConfigNotFoundException:
+        current = None
+    if current != provisioned:
+        lambda_client.put_provisioned_concurrency_config(
+            FunctionName=function_name, Qualifier=LIVE_ALIAS,
+            ProvisionedConcurrentExecutions=provisioned
         )
-        print(f"✅ Updated Lambda: {function_name}")
+
+def upload_lambda(function_name, zip_bytes, layer_arn, spec, force=False):
+    """Create, update or skip one function; returns a one-line status."""
+    try:
+        current = lambda_client.get_function_configuration(FunctionName=function_name)
     except lambda_client.exceptions.ResourceNotFoundException:
-        lambda_client.create_function(
+        resp = lambda_client.create_function(
             FunctionName=function_name,
             Runtime=RUNTIME,
             Role=ROLE_ARN,
             Handler="handler.lambda_handler",  # assumes main entry point is `lambda_handler`
             Code={"ZipFile": zip_bytes},
-            Timeout=10,
-            MemorySize=128,
+            Timeout=spec["timeout"],
+            MemorySize=spec["memory"],
+            Architectures=[spec["architecture"]],
+            Environment={"Variables": resolve_environment(spec["environment"], {})},
+            Layers=[layer_arn],
             Publish=True
         )
-        print(f"🚀 Created Lambda: {function_name}")
-    os.remove(zip_path)
+        wait_updated(function_name)
+        reconcile_concurrency(function_name, spec, resp.get("Version"))
+        return f"🚀 Created Lambda: {function_name}"
+
+    deployed_env = current.get("Environment", {}).get("Variables", {})
+    wanted = {
+        "MemorySize": spec["memory"],
+        "Timeout": spec["timeout"],
+        "Environment": {"Variables": resolve_environment(spec["environment"], deployed_env)},
+        "Layers": [layer_arn],
+    }
+    have = {
+        "MemorySize": current.get("MemorySize"),
+        "Timeout": current.get("Timeout"),
+        "Environment": {"Variables": deployed_env},
+        "Layers": [l["Arn"] for l in current.get("Layers", [])],
+    }
+    config_diff  = {k: v for k, v in wanted.items() if have[k] != v}
+    arch_changed = current.get("Architectures", ["x86_64"]) != [spec["architecture"]]
+    code_changed = force or arch_changed or current.get("CodeSha256") != code_sha256(zip_bytes)
+
+    version = None
+    if config_diff or code_changed:
+        # configuration first, so the version published below already uses it
+        if config_diff:
+            lambda_client.update_function_configuration(FunctionName=function_name, **config_diff)
+            wait_updated(function_name)
+        if code_changed:
+            resp = lambda_client.update_function_code(
+                FunctionName=function_name,
+                ZipFile=zip_bytes,
+                Architectures=[spec["architecture"]],
+                Publish=True
+            )
+        else:
+            resp = lambda_client.publish_version(FunctionName=function_name)
+        version = resp.get("Version")
+        wait_updated(function_name)
+
+    reconcile_concurrency(function_name, spec, version)
+    if version is None:
+        return f"⏭️ Unchanged: {function_name}"
+    changed = sorted(config_diff) + (["Code"] if code_changed else [])
+    return f"✅ Updated Lambda: {function_name} ({', '.join(changed)})"
+
+# ---------- power tuning -----------------------------------------------------------
+def billed_ms(log_result):
+    """Billed Duration from the REPORT line of an invoke's tail log."""
+    log = base64.b64decode(log_result).decode(errors="replace")
+    match = re.search(r"Billed Duration: (\d+) ms", log)
+    return int(match.group(1)) if match else None
+
+def power_tune(function_name, spec, invocations):
+    """
+    Invoke the deployed function at each memory size with the manifest's sample
+    event and report the cheapest size whose warm p95 billed duration meets the
+    target. A memory change starts new containers, so the first TUNE_WARMUP
+    invokes after it are only reported as "cold", not sampled.
+    Run it against a dev stage whose tables hold representative data; the
+    original memory size is restored afterwards.
+    """
+    tune = spec.get("tune")
+    if not tune:
+        return f"⏭️ No tune entry for {function_name}"
+    price    = GB_SECOND_PRICE[spec["architecture"]]
+    target   = tune["latency_target_ms"]
+    original = lambda_client.get_function_configuration(FunctionName=function_name)["MemorySize"]
+    payload  = json.dumps(tune["event"]).encode()
+
+    rows = []
+    try:
+        for memory in TUNE_MEMORY_SIZES:
+            lambda_client.update_function_configuration(FunctionName=function_name, MemorySize=memory)
+            wait_updated(function_name)
+            warmup, durations = [], []
+            for n in range(TUNE_WARMUP + invocations):
+                resp = lambda_client.invoke(FunctionName=function_name, Payload=payload,
+                                            LogType="Tail")
+                duration = billed_ms(resp.get("LogResult", ""))
+                if duration is not None:
+                    (warmup if n < TUNE_WARMUP else durations).append(duration)
+            if not durations:
+                continue
+            durations.sort()
+            # nearest-rank p95: with 20 samples that is the 19th, not the maximum
+            p95  = durations[math.ceil(0.95 * len(durations)) - 1]
+            cost = price * memory / 1024 * (sum(durations) / len(durations)) / 1000
+            rows.append((memory, p95, cost, warmup[0] if warmup else None))
+            time.sleep(1)
+    finally:
+        lambda_client.update_function_configuration(FunctionName=function_name, MemorySize=original)
+
+    lines = [f"🔬 {function_name} (target warm p95 ≤ {target} ms)"]
+    for memory, p95, cost, cold in rows:
+        cold_ms = f"{cold:6d}" if cold is not None else "     ?"
+        lines.append(f"   {memory:5d} MB  p95 {p95:6d} ms  cold {cold_ms} ms  "
+                     f"${cost * 1e6:8.3f} per 1M invocations")
+    meeting = [r for r in rows if r[1] <= target]
+    if meeting:
+        best = min(meeting, key=lambda r: r[2])
+        lines.append(f"   👉 cheapest meeting target: {best[0]} MB (set \"memory\" in functions.json)")
+    else:
+        lines.append("   ⚠️ no memory size met the target")
+    return "\n".join(lines)
 
 def main():
-    for file in os.listdir(LAMBDA_FOLDER):
-        if file.endswith(".py"):
-            file_path = os.path.join(LAMBDA_FOLDER, file)
-            function_name = file.replace(".py", "")
-            print(f"📦 Deploying Lambda: {function_name}")
-            zip_file = zip_lambda(file_path, function_name)
-            upload_lambda(function_name, zip_file)
+    parser = argparse.ArgumentParser(description="Deploy changed Lambda functions")
+    parser.add_argument("--force", action="store_true", help="upload code even if unchanged")
+    parser.add_argument("--workers", type=int, default=DEPLOY_WORKERS)
+    parser.add_argument("--tune", nargs="*", metavar="FUNCTION",
+                        help="power-tune the given functions (all with a tune entry if none given) "
+                             "instead of deploying")
+    parser.add_argument("--invocations", type=int, default=50,
+                        help="warm invokes sampled per memory size")
+    args = parser.parse_args()
+
+    manifest = load_manifest()
+    names = sorted(file[:-len(".py")] for file in os.listdir(LAMBDA_FOLDER) if file.endswith(".py"))
+
+    if args.tune is not None:
+        targets = args.tune or [n for n in names if function_spec(manifest, n).get("tune")]
+        for name in targets:
+            print(power_tune(name, function_spec(manifest, name), args.invocations))
+        return
+
+    layer_arn = ensure_layer()
+    bundles = {name: zip_lambda(os.path.join(LAMBDA_FOLDER, f"{name}.py")) for name in names}
+    print(f"📦 Checking {len(bundles)} Lambdas")
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        futures = {
+            pool.submit(upload_lambda, name, zip_bytes, layer_arn,
+                        function_spec(manifest, name), args.force): name
+            for name, zip_bytes in bundles.items()
+        }
+        for future in as_completed(futures):
+            try:
+                print(future.result())
+            except Exception as e:
+                failed.append(futures[future])
+                print(f"❌ {futures[future]}: {e}")
+    if failed:
+        raise SystemExit(f"Failed to deploy: {', '.join(sorted(failed))}")
 
 if __name__ == "__main__":
     main()
-# This script is used to deploy AWS Lambda functions from Python files in the specified folder.
\ No newline at end of file
+# This script is used to deploy AWS Lambda functions from Python files in the specified folder.
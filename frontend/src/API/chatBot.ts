@@ -15,3 +15,62 @@ export async function askChefBot(message: string): Promise<string> {
   const data = await res.json();
   return data.reply || "Sorry, no reply.";
 }
+
+/**
+ * Streams a reply as Server-Sent Events, calling `onDelta` with each text
+ * fragment as soon as it is read off the wire. Resolves with the full reply.
+ */
+export async function streamChefBot(
+  message: string,
+  onDelta: (fragment: string) => void
+): Promise<string> {
+  const res = await fetch(CHATBOT_API_URL, {
+    method: "POST",
+    headers: { "Content-Type": "application/json", Accept: "text/event-stream" },
+    body: JSON.stringify({ message }),
+  });
+
+  if (!res.ok || !res.body) {
+    console.error("ChefBot API error:", res.status);
+    return "Sorry, something went wrong.";
+  }
+
+  // older deployments answer with plain JSON
+  if (!res.headers.get("Content-Type")?.includes("text/event-stream")) {
+    const data = await res.json();
+    const reply = data.reply || "Sorry, no reply.";
+    onDelta(reply);
+    return reply;
+  }
+
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  let reply = "";
+
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    // events are separated by a blank line
+    let end: number;
+    while ((end = buffer.indexOf("\n\n")) !== -1) {
+      const raw = buffer.slice(0, end);
+      buffer = buffer.slice(end + 2);
+
+      const event = raw.match(/^event: (.*)$/m)?.[1] ?? "message";
+      const data = raw.match(/^data: (.*)$/m)?.[1];
+      if (!data) continue;
+      const payload = JSON.parse(data);
+
+      if (event === "error") return payload.error || "Sorry, something went wrong.";
+      if (event === "done") return payload.reply || reply || "Sorry, no reply.";
+      if (payload.delta) {
+        reply += payload.delta;
+        onDelta(payload.delta);
+      }
+    }
+  }
+  return reply || "Sorry, no reply.";
+}
@@ -24,7 +24,8 @@ export async function getFavoriteRecipes(idToken: string): Promise<Recipe[]> {
   }
   
   const res = await fetch(
-    "https://6atvdcxzgf.execute-api.us-east-1.amazonaws.com/dev/Users/Favorites",
+    // cards only: no InstructionsText HTML (RecipeCard loads it for Details)
+    "https://6atvdcxzgf.execute-api.us-east-1.amazonaws.com/dev/Users/Favorites?fields=card",
     {
       method:  "GET",
       headers: { Authorization: `Bearer ${idToken}` }
@@ -109,3 +110,53 @@ export async function removeFavorite(recipeId: string, idToken: string) {
     throw new Error(err.message || "Failed to unfavorite recipe");
   }
 }
+
+export interface FavoritesState {
+  RecipeIDs: string[];
+  Version: number;
+}
+
+export interface FavoritesBatch {
+  add?: string[];
+  remove?: string[];
+  clear?: boolean;
+  /* Version the client last saw; omit to apply on top of whatever is stored */
+  Version?: number;
+}
+
+export class FavoritesConflictError extends Error {
+  constructor(public current: FavoritesState) {
+    super("Favorites changed on another device");
+  }
+}
+
+/* Apply many additions/removals in one request; resolves to the stored set */
+export async function updateFavoritesBatch(
+  batch: FavoritesBatch,
+  idToken: string
+): Promise<FavoritesState> {
+  if (!idToken) {
+    throw new Error("No authentication token provided");
+  }
+
+  const res = await fetch(
+    "https://6atvdcxzgf.execute-api.us-east-1.amazonaws.com/dev/Users/Favorites/batch",
+    {
+      method: "POST",
+      headers: {
+        "Content-Type": "application/json",
+        "Authorization": `Bearer ${idToken}`
+      },
+      body: JSON.stringify(batch)
+    }
+  );
+
+  const data = await res.json();
+  if (res.status === 409) {
+    throw new FavoritesConflictError({ RecipeIDs: data.RecipeIDs, Version: data.Version });
+  }
+  if (!res.ok) {
+    throw new Error(data.error || "Failed to update favorites");
+  }
+  return data as FavoritesState;
+}
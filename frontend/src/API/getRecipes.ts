@@ -6,11 +6,30 @@ export interface PaginatedRecipes {
   lastKey?: string;
 }
 
-export async function getRecipes(lastKey?: string): Promise<PaginatedRecipes> {
+/* Server-side filters understood by GET /Recipes */
+export interface RecipeFilters {
+  category?: string;
+  cuisine?: string;
+  vegan?: boolean;
+  vegetarian?: boolean;
+  glutenfree?: boolean;
+}
+
+export async function getRecipes(
+  lastKey?: string,
+  filters: RecipeFilters = {}
+): Promise<PaginatedRecipes> {
   const url = new URL(
     "https://6atvdcxzgf.execute-api.us-east-1.amazonaws.com/dev/Recipes"
   );
+  // cards only: no InstructionsText HTML (RecipeCard loads it for Details)
+  url.searchParams.append("fields", "card");
   if (lastKey) url.searchParams.append("lastKey", lastKey);
+  if (filters.category) url.searchParams.append("category", filters.category);
+  if (filters.cuisine) url.searchParams.append("cuisine", filters.cuisine);
+  if (filters.vegan) url.searchParams.append("vegan", "1");
+  if (filters.vegetarian) url.searchParams.append("vegetarian", "1");
+  if (filters.glutenfree) url.searchParams.append("glutenfree", "1");
 
   const response = await fetch(url.toString());
   if (!response.ok) {
@@ -21,6 +40,21 @@ export async function getRecipes(lastKey?: string): Promise<PaginatedRecipes> {
   return data;
 }
 
+/* One recipe by Id (GET /Recipes/{recipeId}); null when it does not exist */
+export async function getRecipeById(recipeId: string): Promise<Recipe | null> {
+  const response = await fetch(
+    `https://6atvdcxzgf.execute-api.us-east-1.amazonaws.com/dev/Recipes/${encodeURIComponent(recipeId)}`
+  );
+  if (response.status === 404) {
+    return null;
+  }
+  if (!response.ok) {
+    throw new Error("Failed to fetch recipe");
+  }
+
+  return await response.json() as Recipe;
+}
+
 export async function createRecipe(recipeData: any, idToken: string): Promise<Recipe> {
   const response = await fetch(
     "https://6atvdcxzgf.execute-api.us-east-1.amazonaws.com/dev/Recipes",
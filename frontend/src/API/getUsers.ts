@@ -13,39 +13,43 @@ export interface DatabaseUser {
   favoritesCount?: number;
 }
 
+const USERS_PAGE_SIZE = 500;
+
 export async function getUsersFromDatabase(idToken: string): Promise<DatabaseUser[]> {
   if (!idToken) {
     throw new Error("Authentication token required");
   }
 
-  console.log("Fetching users from database with token:", idToken ? "Token exists" : "No token");
-  console.log("Token length:", idToken?.length);
-  console.log("Token starts with:", idToken?.substring(0, 20) + "...");
-  console.log("Full Authorization header:", `Bearer ${idToken}`);
-
-  const response = await fetch(
-    "https://6atvdcxzgf.execute-api.us-east-1.amazonaws.com/dev/Users",
-    {
-      method: "GET",
-      headers: {
-        "Authorization": `Bearer ${idToken}`,
-        "Content-Type": "application/json",
-      },
-    }
-  );
+  // Page through the listing so no single response approaches the 6 MB cap
+  const users: DatabaseUser[] = [];
+  let lastKey: string | null = null;
+  do {
+    const params = new URLSearchParams({ pageSize: String(USERS_PAGE_SIZE) });
+    if (lastKey) params.set("lastKey", lastKey);
 
-  console.log("Database users response status:", response.status);
+    const response = await fetch(
+      `https://6atvdcxzgf.execute-api.us-east-1.amazonaws.com/dev/Users?${params}`,
+      {
+        method: "GET",
+        headers: {
+          "Authorization": `Bearer ${idToken}`,
+          "Content-Type": "application/json",
+        },
+      }
+    );
 
-  if (!response.ok) {
-    const errorText = await response.text();
-    console.error("Failed to fetch users from database:", errorText);
-    throw new Error(`Failed to fetch users: ${response.status} - ${errorText}`);
-  }
+    if (!response.ok) {
+      const errorText = await response.text();
+      console.error("Failed to fetch users from database:", errorText);
+      throw new Error(`Failed to fetch users: ${response.status} - ${errorText}`);
+    }
+
+    const page: { items: DatabaseUser[]; lastKey: string | null } = await response.json();
+    users.push(...page.items);
+    lastKey = page.lastKey;
+  } while (lastKey);
 
-  const data = await response.json();
-  console.log("Database users data:", data);
-  
-  return data as DatabaseUser[];
+  return users;
 }
 
 // Hook to use the database users API
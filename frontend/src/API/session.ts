@@ -0,0 +1,26 @@
+// src/API/session.ts
+import { Recipe } from "./types";
+
+export interface SessionBootstrap {
+  user: { UserID: string; email: string; user_name: string };
+  created: boolean;
+  /* null when that section failed server-side; fall back to its own endpoint */
+  favorites: { ids: string[]; items: Recipe[] } | null;
+  myRecipes: { items: Recipe[]; lastKey: string | null } | null;
+}
+
+/* Registers the user (first login) and loads favorites + my recipes in one call.
+   Card fields only: RecipeCard loads the instructions when Details is opened. */
+export async function bootstrapSession(idToken: string): Promise<SessionBootstrap> {
+  const response = await fetch(
+    "https://6atvdcxzgf.execute-api.us-east-1.amazonaws.com/dev/Session",
+    {
+      method: "POST",
+      headers: { Authorization: `Bearer ${idToken}` },
+    }
+  );
+  if (!response.ok) {
+    throw new Error(`Session bootstrap failed: ${response.status}`);
+  }
+  return await response.json() as SessionBootstrap;
+}
@@ -2,8 +2,9 @@
 export interface Recipe {
     Id: string;
     Title: string;
-    Summery: string;
-    InstructionsText: string;
+    Summery?: string;           // not in fields=card
+    Snippet?: string;   // plain-text summary (fields=card)
+    InstructionsText?: string;  // not in fields=card
     SourceUrl: string;
     ImageUrl: string;
     Publisher: string;
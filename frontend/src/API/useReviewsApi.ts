@@ -8,10 +8,40 @@ export interface Review {
   CreatedAt: string;
 }
 
+export interface ReviewsPage {
+  items: Review[];
+  lastKey: string | null;
+}
+
+const REVIEWS_URL = "https://6atvdcxzgf.execute-api.us-east-1.amazonaws.com/dev/Recipes";
+const PAGE_SIZE = 20;
+
+/* Reviews already loaded this session, per recipe (newest first). Reopening
+   the modal then only asks for what was posted since `syncedAt`: the newest
+   CreatedAt the server has sent. It is not the head of `items`, because a
+   review this client just wrote goes there and can be newer than reviews
+   others posted in the meantime. */
+interface CachedReviews extends ReviewsPage {
+  syncedAt: string | null;
+}
+const reviewCache = new Map<string, CachedReviews>();
+
 function authHeaders(idToken?: string): HeadersInit {
   return idToken ? { Authorization: `Bearer ${idToken}` } : {};
 }
 
+function newestCreatedAt(items: Review[], current: string | null): string | null {
+  return items.reduce<string | null>(
+    (newest, r) => (newest === null || r.CreatedAt > newest ? r.CreatedAt : newest),
+    current
+  );
+}
+
+function mergeNewest(newer: Review[], older: Review[]): Review[] {
+  const seen = new Set(newer.map((r) => `${r.UserId}-${r.CreatedAt}`));
+  return [...newer, ...older.filter((r) => !seen.has(`${r.UserId}-${r.CreatedAt}`))];
+}
+
 /**
  *  Hook that exposes review-related API calls
  */
@@ -19,19 +49,93 @@ export function useReviewsApi() {
   const { user } = useAuth();
   const idToken = user?.idToken;
 
-  /** GET /Recipes/{id}/Review  – public or authenticated */
-  async function getReviews(recipeId: string): Promise<Review[]> {
-    const res = await fetch(
-      `https://6atvdcxzgf.execute-api.us-east-1.amazonaws.com/dev/Recipes/${recipeId}/Review`,
-      { headers: authHeaders(idToken) }
-    );
+  /** GET /Recipes/{id}/Review?pageSize=&lastKey=&since=  – public or authenticated */
+  async function fetchPage(
+    recipeId: string,
+    params: { lastKey?: string | null; since?: string }
+  ): Promise<ReviewsPage> {
+    const qs = new URLSearchParams({ pageSize: String(PAGE_SIZE) });
+    if (params.lastKey) qs.set("lastKey", params.lastKey);
+    if (params.since) qs.set("since", params.since);
 
+    const res = await fetch(`${REVIEWS_URL}/${recipeId}/Review?${qs}`, {
+      headers: authHeaders(idToken),
+    });
     if (!res.ok) throw new Error("Failed to load reviews");
     return res.json();
   }
 
-  /** POST new review */
-  async function createReview(recipeId: string, text: string): Promise<void> {
+  /** First page, or — when cached — the cached list plus anything newer */
+  async function getReviews(recipeId: string): Promise<ReviewsPage> {
+    const cached = reviewCache.get(recipeId);
+    if (!cached || cached.syncedAt === null) {
+      const page = await fetchPage(recipeId, {});
+      const entry = {
+        items: mergeNewest(page.items, cached?.items ?? []),
+        lastKey: page.lastKey,
+        syncedAt: newestCreatedAt(page.items, null),
+      };
+      reviewCache.set(recipeId, entry);
+      return { items: entry.items, lastKey: entry.lastKey };
+    }
+
+    let fresh: Review[] = [];
+    let lastKey: string | null = null;
+    do {
+      const page = await fetchPage(recipeId, { since: cached.syncedAt, lastKey });
+      fresh = fresh.concat(page.items);
+      lastKey = page.lastKey;
+    } while (lastKey);
+
+    const merged = {
+      ...cached,
+      items: mergeNewest(fresh, cached.items),
+      syncedAt: newestCreatedAt(fresh, cached.syncedAt),
+    };
+    reviewCache.set(recipeId, merged);
+    return { items: merged.items, lastKey: merged.lastKey };
+  }
+
+  /** Next (older) page after the cursor returned by getReviews / getMoreReviews */
+  async function getMoreReviews(recipeId: string, lastKey: string): Promise<ReviewsPage> {
+    const page = await fetchPage(recipeId, { lastKey });
+    const cached = reviewCache.get(recipeId);
+    reviewCache.set(recipeId, {
+      items: mergeNewest(cached?.items ?? [], page.items),
+      lastKey: page.lastKey,
+      syncedAt: cached ? cached.syncedAt : newestCreatedAt(page.items, null),
+    });
+    return page;
+  }
+
+  /** The signed-in user's own review of the recipe, however old; null when there is none */
+  async function getMyReview(recipeId: string): Promise<Review | null> {
+    if (!user?.sub) return null;
+    const qs = new URLSearchParams({ userId: user.sub });
+    const res = await fetch(`${REVIEWS_URL}/${recipeId}/Review?${qs}`, {
+      headers: authHeaders(idToken),
+    });
+    if (!res.ok) throw new Error("Failed to load your review");
+    const page: ReviewsPage = await res.json();
+    return page.items[0] ?? null;
+  }
+
+  /** Keep the cache in step with a review written by this client (syncedAt stays put) */
+  function rememberReview(recipeId: string, review: Review) {
+    const cached = reviewCache.get(recipeId);
+    if (!cached) return;
+    const others = cached.items.filter((r) => r.UserId !== review.UserId);
+    const isNew = others.length === cached.items.length;
+    reviewCache.set(recipeId, {
+      ...cached,
+      items: isNew
+        ? [review, ...others]
+        : cached.items.map((r) => (r.UserId === review.UserId ? review : r)),
+    });
+  }
+
+  /** POST new review; resolves with the stored review (server CreatedAt) */
+  async function createReview(recipeId: string, text: string): Promise<Review> {
     if (!idToken) throw new Error("Not authenticated");
     
     console.log("Creating review with token:", idToken ? "Token exists" : "No token");
@@ -53,22 +157,28 @@ export function useReviewsApi() {
       console.error("Create review failed:", errorText);
       throw new Error(`Create review failed: ${response.status} - ${errorText}`);
     }
+    const review: Review = await response.json();
+    rememberReview(recipeId, review);
+    return review;
   }
 
-  /** PUT edit review (only current user) */
-  async function updateReview(recipeId: string, text: string): Promise<void> {
+  /** PUT edit review (only current user); resolves with the updated review */
+  async function updateReview(recipeId: string, text: string): Promise<Review> {
     if (!idToken) throw new Error("Not authenticated");
-    await fetch(`https://6atvdcxzgf.execute-api.us-east-1.amazonaws.com/dev/Recipes/${recipeId}/Review`, {
+    return fetch(`https://6atvdcxzgf.execute-api.us-east-1.amazonaws.com/dev/Recipes/${recipeId}/Review`, {
       method: "PUT",
       headers: {
         "Content-Type": "application/json",
         ...authHeaders(idToken),
       },
       body: JSON.stringify({ ReviewText: text }),
-    }).then((r) => {
+    }).then(async (r) => {
       if (!r.ok) throw new Error("Update review failed");
+      const review: Review = await r.json();
+      rememberReview(recipeId, review);
+      return review;
     });
   }
 
-  return { getReviews, createReview, updateReview };
+  return { getReviews, getMoreReviews, getMyReview, createReview, updateReview };
 }
@@ -2,7 +2,7 @@ import React, { useState, useRef, useEffect } from "react";
 import ReactMarkdown from "react-markdown";
 import chefIcon from "../assets/chef.png";
 import { useAuth } from "../context/AuthContext";
-import { askChefBot } from "../API/chatBot";
+import { streamChefBot } from "../API/chatBot";
 
 /**
  * CenteredChatbot – now renders bot replies as Markdown so recipes, lists,
@@ -35,12 +35,32 @@ export default function CenteredChatbot() {
     setDraft("");
     setIsTyping(true);
 
+    // the bot bubble is created on the first fragment and grows as more arrive
+    let started = false;
+    const setBotText = (update: (text: string) => string) =>
+      setMessages((prev) => {
+        const last = prev[prev.length - 1];
+        return [...prev.slice(0, -1), { ...last, text: update(last.text) }];
+      });
+
     try {
-      const botReply = await askChefBot(userMsg.text);
-      setMessages((prev) => [
-        ...prev,
-        { role: "bot", name: "ChefBot", text: botReply || "(no reply)" },
-      ]);
+      const botReply = await streamChefBot(userMsg.text, (fragment) => {
+        if (!started) {
+          started = true;
+          setIsTyping(false);
+          setMessages((prev) => [...prev, { role: "bot", name: "ChefBot", text: fragment }]);
+        } else {
+          setBotText((text) => text + fragment);
+        }
+      });
+      if (started) {
+        setBotText(() => botReply || "(no reply)");
+      } else {
+        setMessages((prev) => [
+          ...prev,
+          { role: "bot", name: "ChefBot", text: botReply || "(no reply)" },
+        ]);
+      }
     } catch (err) {
       setMessages((prev) => [
         ...prev,
@@ -12,7 +12,8 @@ import {
   DialogContent,
   DialogActions,
   Button,
-  Box
+  Box,
+  CircularProgress
 } from "@mui/material";
 import FavoriteIcon from "@mui/icons-material/Favorite";
 import FavoriteBorderIcon from "@mui/icons-material/FavoriteBorder";
@@ -23,6 +24,7 @@ import { styled } from "@mui/material/styles";
 import { useAuth } from "../context/AuthContext";
 import { Recipe } from "../API/types";
 import { addToFavorites, removeFavorite } from "../API/favorites";
+import { getRecipeById } from "../API/getRecipes";
 import ReviewsModal from "./ReviewsModal";
 
 /* ───────────── props ───────────── */
@@ -65,6 +67,9 @@ export const RecipeCard: React.FC<RecipeCardProps> = ({
   const [syncingFav, setSyncingFav] = useState(false);
   const [showDetails, setShowDetails] = useState(false);
   const [showReviews, setShowReviews] = useState(false);
+  const [instructions, setInstructions] = useState<string | null>(
+    recipe.InstructionsText ?? null
+  );
 
   console.log(`RecipeCard ${recipe.Id} - isFav prop: ${isFav}, isFavorite state: ${isFavorite}`);
 
@@ -98,6 +103,19 @@ export const RecipeCard: React.FC<RecipeCardProps> = ({
     }
   };
 
+  /* ---------- details ---------- */
+  /* list views load card fields only; the instructions come with the full recipe */
+  const openDetails = () => {
+    setShowDetails(true);
+    if (instructions !== null) return;
+    getRecipeById(String(recipe.Id))
+      .then((full) => setInstructions(full?.InstructionsText ?? ""))
+      .catch((err) => {
+        console.error(err);
+        setInstructions("");
+      });
+  };
+
   /* ---------- render ---------- */
   return (
     <>
@@ -136,7 +154,7 @@ export const RecipeCard: React.FC<RecipeCardProps> = ({
               overflow: "hidden",
             }}
           >
-            {stripHtml(recipe.Summery)}
+            {recipe.Snippet ?? stripHtml(recipe.Summery ?? "")}
           </Typography>
         </CardContent>
 
@@ -163,7 +181,7 @@ export const RecipeCard: React.FC<RecipeCardProps> = ({
 
           <Button
             size="small"
-            onClick={() => setShowDetails(true)}
+            onClick={openDetails}
             sx={{ textTransform: "none" }}
             endIcon={<ExpandMoreIcon />}
           >
@@ -184,7 +202,11 @@ export const RecipeCard: React.FC<RecipeCardProps> = ({
           <Typography variant="h6" gutterBottom>
             Description
           </Typography>
-          <Typography paragraph>{stripHtml(recipe.InstructionsText)}</Typography>
+          {instructions === null ? (
+            <CircularProgress size={24} />
+          ) : (
+            <Typography paragraph>{stripHtml(instructions)}</Typography>
+          )}
         </DialogContent>
         <DialogActions>
           <Button onClick={() => setShowDetails(false)}>Close</Button>
@@ -18,9 +18,10 @@ interface Props {
 
 export default function ReviewsModal({ open, onClose, recipeId }: Props) {
   const { user } = useAuth();
-  const { getReviews, createReview, updateReview } = useReviewsApi();
+  const { getReviews, getMoreReviews, getMyReview, createReview, updateReview } = useReviewsApi();
 
   const [reviews, setReviews] = useState<Review[]>([]);
+  const [lastKey, setLastKey] = useState<string | null>(null);
   const [myReview, setMyReview] = useState<Review | null>(null);
   const [text, setText] = useState("");
 
@@ -29,20 +30,37 @@ export default function ReviewsModal({ open, onClose, recipeId }: Props) {
     if (!open) return;
 
     getReviews(recipeId)
-      .then((data) => {
+      .then(({ items: data, lastKey }) => {
         setReviews(data);
-        if (user) {
-          const mine = data.find((r) => r.UserId === user.sub) ?? null;
-          setMyReview(mine);
-          // Only set text if user doesn't have any text typed yet
-          if (!text.trim()) {
-            setText(mine?.ReviewText ?? "");
-          }
+        setLastKey(lastKey);
+      })
+      .catch((err) => console.error(err));
+
+    // asked for directly: the user's review may be older than the first page
+    if (!user) return;
+    getMyReview(recipeId)
+      .then((mine) => {
+        setMyReview(mine);
+        // Only set text if user doesn't have any text typed yet
+        if (!text.trim()) {
+          setText(mine?.ReviewText ?? "");
         }
       })
       .catch((err) => console.error(err));
   }, [open, recipeId, user?.sub]); // Removed getReviews and user, only depend on user.sub
 
+  /* ─── older reviews ─── */
+  async function loadMore() {
+    if (!lastKey) return;
+    try {
+      const page = await getMoreReviews(recipeId, lastKey);
+      setReviews((prev) => [...prev, ...page.items]);
+      setLastKey(page.lastKey);
+    } catch (e) {
+      console.error(e);
+    }
+  }
+
   /* ─── submit ─── */
   async function handleSubmit() {
     if (!text.trim()) return;
@@ -54,25 +72,20 @@ export default function ReviewsModal({ open, onClose, recipeId }: Props) {
     console.log("Is edit:", !!myReview);
 
     try {
+      let updated: Review;
       if (myReview) {
         console.log("Updating existing review...");
-        await updateReview(recipeId, text.trim());
+        updated = await updateReview(recipeId, text.trim());
       } else {
         console.log("Creating new review...");
-        await createReview(recipeId, text.trim());
+        updated = await createReview(recipeId, text.trim());
       }
 
-      const updated: Review = {
-        UserId: user!.sub,
-        Username: user!.username,
-        ReviewText: text.trim(),
-        CreatedAt: new Date().toISOString(),
-      };
-
+      // the stored review (server CreatedAt) keeps later `since` fetches exact
       setReviews((prev) =>
         myReview
           ? prev.map((r) => (r.UserId === user!.sub ? updated : r))
-          : [...prev, updated]
+          : [updated, ...prev]
       );
       setMyReview(updated);
       setText("");
@@ -136,6 +149,12 @@ export default function ReviewsModal({ open, onClose, recipeId }: Props) {
           ))
         )}
 
+        {lastKey && (
+          <Button size="small" onClick={loadMore} sx={{ alignSelf: "center" }}>
+            Load older reviews
+          </Button>
+        )}
+
         {user && (
           <Box sx={{ mt: 3 }}>
             <TextField
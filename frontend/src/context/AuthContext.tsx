@@ -8,6 +8,7 @@ import React, {
 } from "react";
 import { jwtDecode } from "jwt-decode";
 import cognitoConfig from "./CognitoConfig";
+import { bootstrapSession, type SessionBootstrap } from "../API/session";
 
 /* ─────────── types ─────────── */
 export interface AuthUser {
@@ -23,6 +24,9 @@ export interface AuthUser {
 interface AuthContextType {
   user: AuthUser | null;
   isLoading: boolean;
+  session: SessionBootstrap | null;   // favorites + my recipes loaded at sign-in
+  sessionLoading: boolean;            // bootstrap in flight: wait before falling back
+  updateSession: (update: (s: SessionBootstrap) => SessionBootstrap) => void;
   login: () => void;
   logout: () => void;
 }
@@ -69,6 +73,21 @@ interface AuthProviderProps {
 export const AuthProvider: React.FC<AuthProviderProps> = ({ children }) => {
   const [user, setUser] = useState<AuthUser | null>(null);
   const [isLoading, setIsLoading] = useState(true);
+  const [session, setSession] = useState<SessionBootstrap | null>(null);
+  const [sessionLoading, setSessionLoading] = useState(false);
+
+  /* one round trip: register the user, load favorites and my recipes */
+  const loadSession = (idToken: string) => {
+    setSessionLoading(true);
+    bootstrapSession(idToken)
+      .then(setSession)
+      .catch((err) => console.error("AuthContext: session bootstrap failed", err))
+      .finally(() => setSessionLoading(false));
+  };
+
+  /* keep the bootstrap result in step with changes made on the pages */
+  const updateSession = (update: (s: SessionBootstrap) => SessionBootstrap) =>
+    setSession((prev) => (prev ? update(prev) : prev));
 
   useEffect(() => {
     /* ------------ bootstrap on first render ------------ */
@@ -78,7 +97,10 @@ export const AuthProvider: React.FC<AuthProviderProps> = ({ children }) => {
       const storedAcc = localStorage.getItem("accessToken");
       if (storedId) {
         const u = buildUser(storedId, storedAcc ?? undefined);
-        if (u) setUser(u);
+        if (u) {
+          setUser(u);
+          loadSession(storedId);
+        }
       }
       
       // Mark loading as complete after initial hydration
@@ -130,18 +152,8 @@ export const AuthProvider: React.FC<AuthProviderProps> = ({ children }) => {
         const fresh = buildUser(data.id_token, data.access_token);
         if (fresh) setUser(fresh);
 
-        /* 6️⃣  (optional) notify your backend */
-        fetch(
-          "https://6atvdcxzgf.execute-api.us-east-1.amazonaws.com/dev/Users",
-          {
-            method: "POST",
-            headers: {
-              "Content-Type": "application/json",
-              Authorization: `Bearer ${data.id_token}`,
-            },
-            body: JSON.stringify({ source: "cognito-login" }),
-          }
-        ).catch(console.error);
+        /* 6️⃣  register with the backend and preload the session */
+        loadSession(data.id_token);
 
         /* 7️⃣  clean the URL */
         window.history.replaceState({}, "", "/");
@@ -170,11 +182,15 @@ export const AuthProvider: React.FC<AuthProviderProps> = ({ children }) => {
     localStorage.removeItem("idToken");
     localStorage.removeItem("accessToken");
     setUser(null);
+    setSession(null);
+    setSessionLoading(false);
     setIsLoading(false);
   };
 
   return (
-    <AuthContext.Provider value={{ user, isLoading, login, logout }}>
+    <AuthContext.Provider
+      value={{ user, isLoading, session, sessionLoading, updateSession, login, logout }}
+    >
       {children}
     </AuthContext.Provider>
   );
@@ -1,5 +1,5 @@
 // src/pages/HomePage.tsx
-import React, { useEffect, useState } from "react";
+import React, { useEffect, useRef, useState } from "react";
 import {
   Box,
   Button,
@@ -8,9 +8,10 @@ import {
   Paper,
   Stack,
   Avatar,
+  Chip,
 } from "@mui/material";
 
-import { getRecipes } from "../API/getRecipes";
+import { getRecipes, type RecipeFilters } from "../API/getRecipes";
 import { getFavoriteRecipes } from "../API/favorites";
 import { getCategories } from "../API/getCategories";
 
@@ -19,9 +20,16 @@ import { RecipeCard } from "../components/RecipeCard";
 import CategorySelectMUI from "../components/CategorySlide";
 import { useAuth } from "../context/AuthContext";
 
+type DietKey = "vegan" | "vegetarian" | "glutenfree";
+const DIETS: [DietKey, string][] = [
+  ["vegan", "Vegan"],
+  ["vegetarian", "Vegetarian"],
+  ["glutenfree", "Gluten-free"],
+];
+
 export default function HomePage() {
   /* ─────────────────── auth ─────────────────── */
-  const { user } = useAuth();
+  const { user, session, sessionLoading, updateSession } = useAuth();
   
   console.log("HomePage - Component render - user:", user);
   console.log("HomePage - Component render - user?.idToken:", user?.idToken);
@@ -32,6 +40,7 @@ export default function HomePage() {
   const [favorites, setFavorites] = useState<Set<string>>(new Set());
   const [categories, setCategories] = useState<any[]>([]);
   const [selectedCategory, setSelect] = useState<string | null>(null);
+  const [diets, setDiets] = useState<Partial<Record<DietKey, boolean>>>({});
 
   const [lastKey, setLastKey] = useState<string | null>(null);
   const [hasMore, setHasMore] = useState(true);
@@ -40,28 +49,37 @@ export default function HomePage() {
   const [error, setError] = useState("");
 
   /* ───────────────── recipes (paged) ─────────── */
-  const loadMore = async () => {
-    if (loading || !hasMore) return;
+  // Filtering happens server-side; a filter change restarts paging from the top
+  const requestId = useRef(0);
+
+  const loadMore = async (reset = false) => {
+    if (!reset && (loading || !hasMore)) return;
+    const id = ++requestId.current;
     setLoading(true);
 
+    const filters: RecipeFilters = { category: selectedCategory ?? undefined, ...diets };
     try {
-      const { items, lastKey: nextKey } = await getRecipes(lastKey ?? undefined);
-      
-      setRecipes(prev => [...prev, ...items]);
+      const { items, lastKey: nextKey } = await getRecipes(
+        reset ? undefined : lastKey ?? undefined,
+        filters
+      );
+      if (id !== requestId.current) return;    // the filters changed meanwhile
+
+      setRecipes(prev => (reset ? items : [...prev, ...items]));
       setLastKey(nextKey || null);
       setHasMore(Boolean(nextKey)); // If nextKey exists, we have more pages
     } catch (err: any) {
-      setError(err.message ?? "Failed to load recipes");
+      if (id === requestId.current) setError(err.message ?? "Failed to load recipes");
     } finally {
-      setLoading(false);
+      if (id === requestId.current) setLoading(false);
     }
   };
 
 
   useEffect(() => {
-    loadMore();          // initial page
+    loadMore(true);      // first page, again whenever a filter changes
     // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, []);
+  }, [selectedCategory, diets]);
 
   /* ───────────────── categories ─────────────── */
   useEffect(() => {
@@ -88,6 +106,14 @@ export default function HomePage() {
       return;
     }
     
+    // Already loaded by the session bootstrap at sign-in; while it is still
+    // in flight, wait for it rather than racing it with a second request
+    if (session?.favorites) {
+      setFavorites(new Set(session.favorites.ids.map(String)));
+      return;
+    }
+    if (sessionLoading) return;
+
     console.log("HomePage - Calling getFavoriteRecipes with token");
     getFavoriteRecipes(user.idToken)
       .then((recipes) => {
@@ -103,13 +129,9 @@ export default function HomePage() {
       console.error("HomePage - Error fetching favorites:", error);
       setFavorites(new Set());
     });
-  }, [user?.idToken]); // Only depend on the token, not the entire user object
+  }, [user?.idToken, session, sessionLoading]); // Only depend on the token, not the entire user object
 
   /* ───────────────── derived data ────────────── */
-  const filteredRecipes = selectedCategory
-    ? recipes.filter(r => r.CategoryId === selectedCategory)
-    : recipes;
-
   const countsByCategory = recipes.reduce<Record<string, number>>((acc, r) => {
     const cat = r.CategoryId || "all";
     acc[cat] = (acc[cat] || 0) + 1;
@@ -246,6 +268,18 @@ export default function HomePage() {
           onSelectCategory={setSelect}
           categoryCounts={countsByCategory}
         />
+        {/* diet filters */}
+        <Stack direction="row" spacing={1} justifyContent="center" mt={2}>
+          {DIETS.map(([key, label]) => (
+            <Chip
+              key={key}
+              label={label}
+              color={diets[key] ? "primary" : "default"}
+              variant={diets[key] ? "filled" : "outlined"}
+              onClick={() => setDiets(prev => ({ ...prev, [key]: !prev[key] }))}
+            />
+          ))}
+        </Stack>
         {/* error banner */}
         {error && (
           <Typography color="error" align="center" mt={2}>
@@ -253,7 +287,7 @@ export default function HomePage() {
           </Typography>
         )}
         {/* cards grid */}
-        {filteredRecipes.length === 0 ? (
+        {recipes.length === 0 ? (
           <Typography align="center" mt={4}>
             {loading ? "Loading…" : "No recipes yet."}
           </Typography>
@@ -265,7 +299,7 @@ export default function HomePage() {
             gap={2}
             mt={3}
           >
-            {filteredRecipes.map(r => {
+            {recipes.map(r => {
               const isFavorite = favorites.has(String(r.Id));
               console.log(`Recipe ${r.Id} (${r.Title}) - isFav: ${isFavorite}, favorites Set size: ${favorites.size}`);
               return (
@@ -279,6 +313,19 @@ export default function HomePage() {
                       nowFav ? next.add(String(id)) : next.delete(String(id));
                       return next;
                     });
+                    // keep the bootstrap copy current, or the next session change reverts this
+                    updateSession(s => {
+                      if (!s.favorites) return s;
+                      const rid = String(id);
+                      const ids = s.favorites.ids.filter(f => String(f) !== rid);
+                      const items = s.favorites.items.filter(f => String(f.Id) !== rid);
+                      return {
+                        ...s,
+                        favorites: nowFav
+                          ? { ids: [...ids, rid], items: [...items, r] }
+                          : { ids, items },
+                      };
+                    });
                   }}
                 />
               );
@@ -286,9 +333,9 @@ export default function HomePage() {
           </Box>
         )}
         {/* load-more button */}
-        {hasMore && !selectedCategory && (
+        {hasMore && (
           <Box textAlign="center" mt={4}>
-            <Button variant="outlined" onClick={loadMore} disabled={loading}>
+            <Button variant="outlined" onClick={() => loadMore()} disabled={loading}>
               {loading ? <CircularProgress size={20} /> : "Load More"}
             </Button>
           </Box>
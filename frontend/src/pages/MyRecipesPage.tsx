@@ -26,7 +26,7 @@ import {
 import { Add as AddIcon, Delete as DeleteIcon } from "@mui/icons-material";
 
 export default function MyRecipesPage() {
-  const { user } = useAuth();
+  const { user, session, sessionLoading, updateSession } = useAuth();
   const [recipes, setRecipes] = useState<Recipe[]>([]);
   const [categories, setCategories] = useState<Category[]>([]);
   const [loading, setLoading] = useState(false);
@@ -56,8 +56,12 @@ export default function MyRecipesPage() {
     const fetchData = async () => {
       setLoading(true);
       
-      // Fetch user's recipes directly from the API
-      if (user?.sub && user?.idToken) {
+      // Already loaded by the session bootstrap when it holds every recipe;
+      // otherwise (more pages, or the section failed) fetch them from the API
+      const mine = session?.myRecipes;
+      if (mine && !mine.lastKey) {
+        setRecipes(mine.items);
+      } else if (user?.sub && user?.idToken) {
         try {
           console.log("Fetching user recipes...");
           const userRecipes = await getUserRecipes(user.sub, user.idToken);
@@ -107,10 +111,12 @@ export default function MyRecipesPage() {
       setLoading(false);
     };
 
-    if (user) {
+    // wait for the bootstrap; later session updates come from this page itself
+    if (user && !sessionLoading) {
       fetchData();
     }
-  }, [user]);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [user, sessionLoading]);
 
   const handleAddRecipe = async () => {
     if (!user) return;
@@ -137,6 +143,9 @@ export default function MyRecipesPage() {
 
       const createdRecipe = await createRecipe(recipeData, user.idToken);
       setRecipes(prev => [createdRecipe, ...prev]);
+      updateSession(s => s.myRecipes
+        ? { ...s, myRecipes: { ...s.myRecipes, items: [createdRecipe, ...s.myRecipes.items] } }
+        : s);
       setOpenAddDialog(false);
       setNewRecipe({
         Title: "",
@@ -177,6 +186,10 @@ export default function MyRecipesPage() {
       await deleteRecipe(recipeToDelete.Id, user.idToken, user.sub);
       // Remove the recipe from the local state
       setRecipes(prev => prev.filter(recipe => recipe.Id !== recipeToDelete.Id));
+      updateSession(s => s.myRecipes
+        ? { ...s, myRecipes: { ...s.myRecipes,
+            items: s.myRecipes.items.filter(recipe => recipe.Id !== recipeToDelete.Id) } }
+        : s);
       setOpenDeleteDialog(false);
       setRecipeToDelete(null);
     } catch (err: any) {